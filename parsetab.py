@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftORELSEleftANDALSOrightNOTleftLTLEEQNEGEGTrightCONSleftINleftPLUSMINUSleftTIMESDIVIDEDIVMODrightPOWERrightUMINUSANDALSO ASSIGN BOOLEAN COMMA CONS DIV DIVIDE ELSE EQ GE GT HASH ID IF IN LBRACE LBRACKET LE LPAREN LT MINUS MOD NE NOT NUMBER ORELSE PLUS POWER PRINT RBRACE RBRACKET RPAREN SEMI STRING TIMES WHILEexpression : NUMBERexpression : BOOLEANexpression : STRING\n    expression : expression PLUS expression\n               | expression MINUS expression\n               | expression TIMES expression\n               | expression DIVIDE expression\n               | expression DIV expression\n               | expression MOD expression\n               | expression POWER expression\n               | expression ANDALSO expression\n               | expression ORELSE expression\n               | expression LT expression\n               | expression LE expression\n               | expression EQ expression\n               | expression NE expression\n               | expression GE expression\n               | expression GT expression\n               | expression CONS expression\n               | expression IN expression\n    expression : LPAREN expression RPARENexpression : NOT expressionexpression : MINUS expression %prec UMINUSexpression : PLUS expressionexpression : LBRACKET RBRACKETexpression : LBRACKET l_items RBRACKETl_items : expressionl_items : l_items COMMA expressionexpression : LPAREN expression COMMA RPARENexpression : LPAREN t_items RPARENt_items : expressiont_items : expression COMMA t_itemsexpression : expression LBRACKET expression RBRACKETexpression : HASH NUMBER LPAREN t_items RPARENexpression : HASH NUMBER LPAREN expression COMMA RPAREN'
+_lr_signature = 'inputleftORELSEleftANDALSOrightNOTleftLTLEEQNEGEGTrightCONSleftINleftPLUSMINUSleftTIMESDIVIDEDIVMODrightPOWERrightUMINUSANDALSO ASSIGN BOOLEAN COMMA CONS DIV DIVIDE ELSE EQ GE GT HASH ID IF IN LBRACE LBRACKET LE LPAREN LT MINUS MOD NE NOT NUMBER ORELSE PLUS POWER PRINT RBRACE RBRACKET RPAREN SEMI STRING TIMES WHILEexpression : NUMBERexpression : BOOLEANexpression : STRING\n    expression : expression PLUS expression\n               | expression MINUS expression\n               | expression TIMES expression\n               | expression DIVIDE expression\n               | expression DIV expression\n               | expression MOD expression\n               | expression POWER expression\n               | expression ANDALSO expression\n               | expression ORELSE expression\n               | expression LT expression\n               | expression LE expression\n               | expression EQ expression\n               | expression NE expression\n               | expression GE expression\n               | expression GT expression\n               | expression CONS expression\n               | expression IN expression\n    expression : LPAREN expression RPARENexpression : NOT expressionexpression : MINUS expression %prec UMINUSexpression : PLUS expressionexpression : LBRACKET RBRACKETexpression : LBRACKET l_items RBRACKETl_items : expressionl_items : l_items COMMA expressionexpression : LPAREN expression COMMA RPARENexpression : LPAREN t_items RPARENt_items : expressiont_items : expression COMMA t_itemsexpression : expression LBRACKET expression RBRACKETexpression : HASH NUMBER LPAREN t_items RPARENexpression : HASH NUMBER LPAREN expression COMMA RPARENexpression : IDinput : expressioninput : blockblock : LBRACE statements RBRACEblock : LBRACE RBRACEstatements : statementstatements : statements statementstatement : blockstatement : SEMIstatement : PRINT LPAREN expression RPAREN SEMIstatement : ID ASSIGN expression SEMIstatement : expression LBRACKET expression RBRACKET ASSIGN expression SEMIstatement : IF LPAREN expression RPAREN blockstatement : IF LPAREN expression RPAREN block ELSE blockstatement : WHILE LPAREN expression RPAREN blockstatement : error SEMI'
     
-_lr_action_items = {'NUMBER':([0,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[2,2,2,2,2,2,37,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,]),'BOOLEAN':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,]),'STRING':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,]),'LPAREN':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,37,57,60,61,69,71,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,61,7,7,7,7,7,]),'NOT':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'MINUS':([0,1,2,3,4,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,68,69,70,71,72,],[6,12,-1,-2,-3,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,-24,-23,12,12,-25,12,-4,-5,-6,-7,-8,-9,-10,12,12,12,12,12,12,12,12,12,12,12,-21,6,-30,-26,6,6,-33,12,-29,12,12,6,-34,6,-35,]),'PLUS':([0,1,2,3,4,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,68,69,70,71,72,],[5,11,-1,-2,-3,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,-24,-23,11,11,-25,11,-4,-5,-6,-7,-8,-9,-10,11,11,11,11,11,11,11,11,11,11,11,-21,5,-30,-26,5,5,-33,11,-29,11,11,5,-34,5,-35,]),'LBRACKET':([0,1,2,3,4,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,68,69,70,71,72,],[9,28,-1,-2,-3,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,-24,-23,28,-22,-25,28,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,28,-21,9,-30,-26,9,9,-33,28,-29,28,28,9,-34,9,-35,]),'HASH':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'$end':([1,2,3,4,29,30,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,56,58,59,62,64,70,72,],[0,-1,-2,-3,-24,-23,-22,-25,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-30,-26,-33,-29,-34,-35,]),'TIMES':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[13,-1,-2,-3,13,-23,13,13,-25,13,13,13,-6,-7,-8,-9,-10,13,13,13,13,13,13,13,13,13,13,13,-21,-30,-26,-33,13,-29,13,13,-34,-35,]),'DIVIDE':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[14,-1,-2,-3,14,-23,14,14,-25,14,14,14,-6,-7,-8,-9,-10,14,14,14,14,14,14,14,14,14,14,14,-21,-30,-26,-33,14,-29,14,14,-34,-35,]),'DIV':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[15,-1,-2,-3,15,-23,15,15,-25,15,15,15,-6,-7,-8,-9,-10,15,15,15,15,15,15,15,15,15,15,15,-21,-30,-26,-33,15,-29,15,15,-34,-35,]),'MOD':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[16,-1,-2,-3,16,-23,16,16,-25,16,16,16,-6,-7,-8,-9,-10,16,16,16,16,16,16,16,16,16,16,16,-21,-30,-26,-33,16,-29,16,16,-34,-35,]),'POWER':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[17,-1,-2,-3,17,-23,17,17,-25,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-21,-30,-26,-33,17,-29,17,17,-34,-35,]),'ANDALSO':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[18,-1,-2,-3,-24,-23,18,-22,-25,18,-4,-5,-6,-7,-8,-9,-10,-11,18,-13,-14,-15,-16,-17,-18,-19,-20,18,-21,-30,-26,-33,18,-29,18,18,-34,-35,]),'ORELSE':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[19,-1,-2,-3,-24,-23,19,-22,-25,19,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,19,-21,-30,-26,-33,19,-29,19,19,-34,-35,]),'LT':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[20,-1,-2,-3,-24,-23,20,20,-25,20,-4,-5,-6,-7,-8,-9,-10,20,20,-13,-14,-15,-16,-17,-18,-19,-20,20,-21,-30,-26,-33,20,-29,20,20,-34,-35,]),'LE':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[21,-1,-2,-3,-24,-23,21,21,-25,21,-4,-5,-6,-7,-8,-9,-10,21,21,-13,-14,-15,-16,-17,-18,-19,-20,21,-21,-30,-26,-33,21,-29,21,21,-34,-35,]),'EQ':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[22,-1,-2,-3,-24,-23,22,22,-25,22,-4,-5,-6,-7,-8,-9,-10,22,22,-13,-14,-15,-16,-17,-18,-19,-20,22,-21,-30,-26,-33,22,-29,22,22,-34,-35,]),'NE':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[23,-1,-2,-3,-24,-23,23,23,-25,23,-4,-5,-6,-7,-8,-9,-10,23,23,-13,-14,-15,-16,-17,-18,-19,-20,23,-21,-30,-26,-33,23,-29,23,23,-34,-35,]),'GE':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[24,-1,-2,-3,-24,-23,24,24,-25,24,-4,-5,-6,-7,-8,-9,-10,24,24,-13,-14,-15,-16,-17,-18,-19,-20,24,-21,-30,-26,-33,24,-29,24,24,-34,-35,]),'GT':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[25,-1,-2,-3,-24,-23,25,25,-25,25,-4,-5,-6,-7,-8,-9,-10,25,25,-13,-14,-15,-16,-17,-18,-19,-20,25,-21,-30,-26,-33,25,-29,25,25,-34,-35,]),'CONS':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[26,-1,-2,-3,-24,-23,26,26,-25,26,-4,-5,-6,-7,-8,-9,-10,26,26,26,26,26,26,26,26,26,-20,26,-21,-30,-26,-33,26,-29,26,26,-34,-35,]),'IN':([1,2,3,4,29,30,31,33,34,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,63,64,66,68,70,72,],[27,-1,-2,-3,-24,-23,27,27,-25,27,-4,-5,-6,-7,-8,-9,-10,27,27,27,27,27,27,27,27,27,-20,27,-21,-30,-26,-33,27,-29,27,27,-34,-35,]),'RPAREN':([2,3,4,29,30,31,32,33,34,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,56,57,58,59,62,63,64,65,67,68,70,71,72,],[-1,-2,-3,-24,-23,56,58,-22,-25,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,64,-30,-26,-33,-31,-29,-32,70,-31,-34,72,-35,]),'COMMA':([2,3,4,29,30,31,33,34,35,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,56,58,59,62,63,64,66,68,70,72,],[-1,-2,-3,-24,-23,57,-22,-25,60,-27,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-30,-26,-33,69,-29,-28,71,-34,-35,]),'RBRACKET':([2,3,4,9,29,30,33,34,35,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,58,59,62,64,66,70,72,],[-1,-2,-3,34,-24,-23,-22,-25,59,-27,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,62,-21,-30,-26,-33,-29,-28,-34,-35,]),}
+_lr_action_items = {'NUMBER':([0,7,8,9,10,11,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[4,4,4,4,4,4,41,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,4,-40,-41,-43,-44,4,4,4,-39,-42,4,4,4,4,4,-51,4,4,-46,-45,4,-48,-50,-47,-49,]),'BOOLEAN':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,-40,-41,-43,-44,5,5,5,-39,-42,5,5,5,5,5,-51,5,5,-46,-45,5,-48,-50,-47,-49,]),'STRING':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,-40,-41,-43,-44,6,6,6,-39,-42,6,6,6,6,6,-51,6,6,-46,-45,6,-48,-50,-47,-49,]),'LPAREN':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,41,42,43,44,45,46,47,50,51,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,76,9,-40,-41,-43,-44,79,82,83,9,9,9,-39,-42,9,9,9,9,9,-51,9,9,-46,-45,9,-48,-50,-47,-49,]),'NOT':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,-40,-41,-43,-44,10,10,10,-39,-42,10,10,10,10,10,-51,10,10,-46,-45,10,-48,-50,-47,-49,]),'MINUS':([0,2,4,5,6,7,8,9,10,11,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,37,38,40,42,43,44,45,46,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,91,92,93,94,95,96,97,98,99,101,102,105,106,107,108,109,110,112,113,],[8,16,-1,-2,-3,8,8,8,8,8,-36,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,-24,-23,16,16,-25,16,8,-40,-41,-43,-44,16,-36,-4,-5,-6,-7,-8,-9,-10,16,16,16,16,16,16,16,16,16,16,16,-21,8,-30,-26,8,8,-39,-42,8,8,8,8,8,-51,-33,16,-29,16,16,16,16,16,16,16,8,-34,8,-33,-46,-35,-45,8,-48,-50,16,-47,-49,]),'PLUS':([0,2,4,5,6,7,8,9,10,11,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,37,38,40,42,43,44,45,46,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,91,92,93,94,95,96,97,98,99,101,102,105,106,107,108,109,110,112,113,],[7,15,-1,-2,-3,7,7,7,7,7,-36,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,-24,-23,15,15,-25,15,7,-40,-41,-43,-44,15,-36,-4,-5,-6,-7,-8,-9,-10,15,15,15,15,15,15,15,15,15,15,15,-21,7,-30,-26,7,7,-39,-42,7,7,7,7,7,-51,-33,15,-29,15,15,15,15,15,15,15,7,-34,7,-33,-46,-35,-45,7,-48,-50,15,-47,-49,]),'LBRACKET':([0,2,4,5,6,7,8,9,10,11,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,37,38,40,42,43,44,45,46,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,91,92,93,94,95,96,97,98,99,101,102,105,106,107,108,109,110,112,113,],[11,32,-1,-2,-3,11,11,11,11,11,-36,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,-24,-23,32,-22,-25,32,11,-40,-41,-43,-44,80,-36,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,32,-21,11,-30,-26,11,11,-39,-42,11,11,11,11,11,-51,-33,32,-29,32,32,32,32,32,32,32,11,-34,11,-33,-46,-35,-45,11,-48,-50,32,-47,-49,]),'HASH':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,-40,-41,-43,-44,12,12,12,-39,-42,12,12,12,12,12,-51,12,12,-46,-45,12,-48,-50,-47,-49,]),'ID':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,43,44,45,46,72,75,76,77,78,79,80,81,82,83,84,97,99,102,106,107,108,109,112,113,],[13,13,13,13,13,13,49,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,49,-40,-41,-43,-44,13,13,13,-39,-42,13,13,13,13,13,-51,13,13,-46,-45,13,-48,-50,-47,-49,]),'LBRACE':([0,14,42,43,44,45,46,77,78,84,102,103,104,106,108,109,111,112,113,],[14,14,14,-40,-41,-43,-44,-39,-42,-51,-46,14,14,-45,-48,-50,14,-47,-49,]),'$end':([1,2,3,4,5,6,13,33,34,37,38,43,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,73,74,77,85,87,98,105,],[0,-37,-38,-1,-2,-3,-36,-24,-23,-22,-25,-40,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-30,-26,-39,-33,-29,-34,-35,]),'TIMES':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[17,-1,-2,-3,-36,17,-23,17,17,-25,17,17,-36,17,17,-6,-7,-8,-9,-10,17,17,17,17,17,17,17,17,17,17,17,-21,-30,-26,-33,17,-29,17,17,17,17,17,17,17,-34,-33,-35,17,]),'DIVIDE':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[18,-1,-2,-3,-36,18,-23,18,18,-25,18,18,-36,18,18,-6,-7,-8,-9,-10,18,18,18,18,18,18,18,18,18,18,18,-21,-30,-26,-33,18,-29,18,18,18,18,18,18,18,-34,-33,-35,18,]),'DIV':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[19,-1,-2,-3,-36,19,-23,19,19,-25,19,19,-36,19,19,-6,-7,-8,-9,-10,19,19,19,19,19,19,19,19,19,19,19,-21,-30,-26,-33,19,-29,19,19,19,19,19,19,19,-34,-33,-35,19,]),'MOD':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[20,-1,-2,-3,-36,20,-23,20,20,-25,20,20,-36,20,20,-6,-7,-8,-9,-10,20,20,20,20,20,20,20,20,20,20,20,-21,-30,-26,-33,20,-29,20,20,20,20,20,20,20,-34,-33,-35,20,]),'POWER':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[21,-1,-2,-3,-36,21,-23,21,21,-25,21,21,-36,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,-21,-30,-26,-33,21,-29,21,21,21,21,21,21,21,-34,-33,-35,21,]),'ANDALSO':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[22,-1,-2,-3,-36,-24,-23,22,-22,-25,22,22,-36,-4,-5,-6,-7,-8,-9,-10,-11,22,-13,-14,-15,-16,-17,-18,-19,-20,22,-21,-30,-26,-33,22,-29,22,22,22,22,22,22,22,-34,-33,-35,22,]),'ORELSE':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[23,-1,-2,-3,-36,-24,-23,23,-22,-25,23,23,-36,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,23,-21,-30,-26,-33,23,-29,23,23,23,23,23,23,23,-34,-33,-35,23,]),'LT':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[24,-1,-2,-3,-36,-24,-23,24,24,-25,24,24,-36,-4,-5,-6,-7,-8,-9,-10,24,24,-13,-14,-15,-16,-17,-18,-19,-20,24,-21,-30,-26,-33,24,-29,24,24,24,24,24,24,24,-34,-33,-35,24,]),'LE':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[25,-1,-2,-3,-36,-24,-23,25,25,-25,25,25,-36,-4,-5,-6,-7,-8,-9,-10,25,25,-13,-14,-15,-16,-17,-18,-19,-20,25,-21,-30,-26,-33,25,-29,25,25,25,25,25,25,25,-34,-33,-35,25,]),'EQ':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[26,-1,-2,-3,-36,-24,-23,26,26,-25,26,26,-36,-4,-5,-6,-7,-8,-9,-10,26,26,-13,-14,-15,-16,-17,-18,-19,-20,26,-21,-30,-26,-33,26,-29,26,26,26,26,26,26,26,-34,-33,-35,26,]),'NE':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[27,-1,-2,-3,-36,-24,-23,27,27,-25,27,27,-36,-4,-5,-6,-7,-8,-9,-10,27,27,-13,-14,-15,-16,-17,-18,-19,-20,27,-21,-30,-26,-33,27,-29,27,27,27,27,27,27,27,-34,-33,-35,27,]),'GE':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[28,-1,-2,-3,-36,-24,-23,28,28,-25,28,28,-36,-4,-5,-6,-7,-8,-9,-10,28,28,-13,-14,-15,-16,-17,-18,-19,-20,28,-21,-30,-26,-33,28,-29,28,28,28,28,28,28,28,-34,-33,-35,28,]),'GT':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[29,-1,-2,-3,-36,-24,-23,29,29,-25,29,29,-36,-4,-5,-6,-7,-8,-9,-10,29,29,-13,-14,-15,-16,-17,-18,-19,-20,29,-21,-30,-26,-33,29,-29,29,29,29,29,29,29,29,-34,-33,-35,29,]),'CONS':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[30,-1,-2,-3,-36,-24,-23,30,30,-25,30,30,-36,-4,-5,-6,-7,-8,-9,-10,30,30,30,30,30,30,30,30,30,-20,30,-21,-30,-26,-33,30,-29,30,30,30,30,30,30,30,-34,-33,-35,30,]),'IN':([2,4,5,6,13,33,34,35,37,38,40,48,49,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,86,87,89,91,92,93,94,95,96,98,101,105,110,],[31,-1,-2,-3,-36,-24,-23,31,31,-25,31,31,-36,-4,-5,-6,-7,-8,-9,-10,31,31,31,31,31,31,31,31,31,-20,31,-21,-30,-26,-33,31,-29,31,31,31,31,31,31,31,-34,-33,-35,31,]),'RPAREN':([4,5,6,13,33,34,35,36,37,38,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,85,86,87,88,90,91,92,95,96,98,99,105,],[-1,-2,-3,-36,-24,-23,71,73,-22,-25,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,87,-30,-26,-33,-31,-29,-32,98,-31,100,103,104,-34,105,-35,]),'COMMA':([4,5,6,13,33,34,35,37,38,39,40,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,73,74,85,86,87,89,91,98,105,],[-1,-2,-3,-36,-24,-23,72,-22,-25,75,-27,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-30,-26,-33,97,-29,-28,99,-34,-35,]),'RBRACKET':([4,5,6,11,13,33,34,37,38,39,40,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,74,85,87,89,93,98,105,],[-1,-2,-3,38,-36,-24,-23,-22,-25,74,-27,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,85,-21,-30,-26,-33,-29,-28,101,-34,-35,]),'SEMI':([4,5,6,13,14,33,34,37,38,42,43,44,45,46,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,73,74,77,78,84,85,87,94,98,100,102,105,106,108,109,110,112,113,],[-1,-2,-3,-36,46,-24,-23,-22,-25,46,-40,-41,-43,-44,84,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-30,-26,-39,-42,-51,-33,-29,102,-34,106,-46,-35,-45,-48,-50,112,-47,-49,]),'RBRACE':([14,42,43,44,45,46,77,78,84,102,106,108,109,112,113,],[43,77,-40,-41,-43,-44,-39,-42,-51,-46,-45,-48,-50,-47,-49,]),'PRINT':([14,42,43,44,45,46,77,78,84,102,106,108,109,112,113,],[47,47,-40,-41,-43,-44,-39,-42,-51,-46,-45,-48,-50,-47,-49,]),'IF':([14,42,43,44,45,46,77,78,84,102,106,108,109,112,113,],[50,50,-40,-41,-43,-44,-39,-42,-51,-46,-45,-48,-50,-47,-49,]),'WHILE':([14,42,43,44,45,46,77,78,84,102,106,108,109,112,113,],[51,51,-40,-41,-43,-44,-39,-42,-51,-46,-45,-48,-50,-47,-49,]),'error':([14,42,43,44,45,46,77,78,84,102,106,108,109,112,113,],[52,52,-40,-41,-43,-44,-39,-42,-51,-46,-45,-48,-50,-47,-49,]),'ELSE':([43,77,108,],[-40,-39,111,]),'ASSIGN':([49,101,],[81,107,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'expression':([0,5,6,7,8,9,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,57,60,61,69,71,],[1,29,30,31,33,36,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,63,66,68,63,63,]),'t_items':([7,57,61,69,71,],[32,65,67,65,65,]),'l_items':([9,],[35,]),}
+_lr_goto_items = {'input':([0,],[1,]),'expression':([0,7,8,9,10,11,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,42,72,75,76,79,80,81,82,83,97,99,107,],[2,33,34,35,37,40,48,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,48,86,89,91,92,93,94,95,96,86,86,110,]),'block':([0,14,42,103,104,111,],[3,45,45,108,109,113,]),'t_items':([9,72,76,97,99,],[36,88,90,88,88,]),'l_items':([11,],[39,]),'statements':([14,],[42,]),'statement':([14,42,],[44,78,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -26,40 +26,56 @@ for _k, _v in _lr_goto_items.items():
        _lr_goto[_x][_k] = _y
 del _lr_goto_items
 _lr_productions = [
-  ("S' -> expression","S'",1,None,None,None),
-  ('expression -> NUMBER','expression',1,'p_expression_number','sbml_parser.py',130),
-  ('expression -> BOOLEAN','expression',1,'p_expression_boolean','sbml_parser.py',134),
-  ('expression -> STRING','expression',1,'p_expression_string','sbml_parser.py',138),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','sbml_parser.py',143),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','sbml_parser.py',144),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','sbml_parser.py',145),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','sbml_parser.py',146),
-  ('expression -> expression DIV expression','expression',3,'p_expression_binop','sbml_parser.py',147),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binop','sbml_parser.py',148),
-  ('expression -> expression POWER expression','expression',3,'p_expression_binop','sbml_parser.py',149),
-  ('expression -> expression ANDALSO expression','expression',3,'p_expression_binop','sbml_parser.py',150),
-  ('expression -> expression ORELSE expression','expression',3,'p_expression_binop','sbml_parser.py',151),
-  ('expression -> expression LT expression','expression',3,'p_expression_binop','sbml_parser.py',152),
-  ('expression -> expression LE expression','expression',3,'p_expression_binop','sbml_parser.py',153),
-  ('expression -> expression EQ expression','expression',3,'p_expression_binop','sbml_parser.py',154),
-  ('expression -> expression NE expression','expression',3,'p_expression_binop','sbml_parser.py',155),
-  ('expression -> expression GE expression','expression',3,'p_expression_binop','sbml_parser.py',156),
-  ('expression -> expression GT expression','expression',3,'p_expression_binop','sbml_parser.py',157),
-  ('expression -> expression CONS expression','expression',3,'p_expression_binop','sbml_parser.py',158),
-  ('expression -> expression IN expression','expression',3,'p_expression_binop','sbml_parser.py',159),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','sbml_parser.py',165),
-  ('expression -> NOT expression','expression',2,'p_expression_not','sbml_parser.py',176),
-  ('expression -> MINUS expression','expression',2,'p_expression_uminus','sbml_parser.py',180),
-  ('expression -> PLUS expression','expression',2,'p_expression_uplus','sbml_parser.py',184),
-  ('expression -> LBRACKET RBRACKET','expression',2,'p_expression_list_empty','sbml_parser.py',192),
-  ('expression -> LBRACKET l_items RBRACKET','expression',3,'p_expression_list_nonempty','sbml_parser.py',196),
-  ('l_items -> expression','l_items',1,'p_l_items_single','sbml_parser.py',200),
-  ('l_items -> l_items COMMA expression','l_items',3,'p_l_items_more','sbml_parser.py',203),
-  ('expression -> LPAREN expression COMMA RPAREN','expression',4,'p_expression_tuple_single','sbml_parser.py',208),
-  ('expression -> LPAREN t_items RPAREN','expression',3,'p_expression_tuple_multi','sbml_parser.py',212),
-  ('t_items -> expression','t_items',1,'p_t_items_one','sbml_parser.py',216),
-  ('t_items -> expression COMMA t_items','t_items',3,'p_t_items_more','sbml_parser.py',220),
-  ('expression -> expression LBRACKET expression RBRACKET','expression',4,'p_expression_list_index','sbml_parser.py',225),
-  ('expression -> HASH NUMBER LPAREN t_items RPAREN','expression',5,'p_expression_tuple_index_multi','sbml_parser.py',230),
-  ('expression -> HASH NUMBER LPAREN expression COMMA RPAREN','expression',6,'p_expression_tuple_index_single','sbml_parser.py',236),
+  ("S' -> input","S'",1,None,None,None),
+  ('expression -> NUMBER','expression',1,'p_expression_number','sbml_parser.py',117),
+  ('expression -> BOOLEAN','expression',1,'p_expression_boolean','sbml_parser.py',121),
+  ('expression -> STRING','expression',1,'p_expression_string','sbml_parser.py',125),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','sbml_parser.py',130),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','sbml_parser.py',131),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','sbml_parser.py',132),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','sbml_parser.py',133),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','sbml_parser.py',134),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','sbml_parser.py',135),
+  ('expression -> expression POWER expression','expression',3,'p_expression_binop','sbml_parser.py',136),
+  ('expression -> expression ANDALSO expression','expression',3,'p_expression_binop','sbml_parser.py',137),
+  ('expression -> expression ORELSE expression','expression',3,'p_expression_binop','sbml_parser.py',138),
+  ('expression -> expression LT expression','expression',3,'p_expression_binop','sbml_parser.py',139),
+  ('expression -> expression LE expression','expression',3,'p_expression_binop','sbml_parser.py',140),
+  ('expression -> expression EQ expression','expression',3,'p_expression_binop','sbml_parser.py',141),
+  ('expression -> expression NE expression','expression',3,'p_expression_binop','sbml_parser.py',142),
+  ('expression -> expression GE expression','expression',3,'p_expression_binop','sbml_parser.py',143),
+  ('expression -> expression GT expression','expression',3,'p_expression_binop','sbml_parser.py',144),
+  ('expression -> expression CONS expression','expression',3,'p_expression_binop','sbml_parser.py',145),
+  ('expression -> expression IN expression','expression',3,'p_expression_binop','sbml_parser.py',146),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','sbml_parser.py',152),
+  ('expression -> NOT expression','expression',2,'p_expression_not','sbml_parser.py',165),
+  ('expression -> MINUS expression','expression',2,'p_expression_uminus','sbml_parser.py',169),
+  ('expression -> PLUS expression','expression',2,'p_expression_uplus','sbml_parser.py',173),
+  ('expression -> LBRACKET RBRACKET','expression',2,'p_expression_list_empty','sbml_parser.py',181),
+  ('expression -> LBRACKET l_items RBRACKET','expression',3,'p_expression_list_nonempty','sbml_parser.py',185),
+  ('l_items -> expression','l_items',1,'p_l_items_single','sbml_parser.py',189),
+  ('l_items -> l_items COMMA expression','l_items',3,'p_l_items_more','sbml_parser.py',192),
+  ('expression -> LPAREN expression COMMA RPAREN','expression',4,'p_expression_tuple_single','sbml_parser.py',198),
+  ('expression -> LPAREN t_items RPAREN','expression',3,'p_expression_tuple_multi','sbml_parser.py',202),
+  ('t_items -> expression','t_items',1,'p_t_items_one','sbml_parser.py',207),
+  ('t_items -> expression COMMA t_items','t_items',3,'p_t_items_more','sbml_parser.py',213),
+  ('expression -> expression LBRACKET expression RBRACKET','expression',4,'p_expression_list_index','sbml_parser.py',219),
+  ('expression -> HASH NUMBER LPAREN t_items RPAREN','expression',5,'p_expression_tuple_index_multi','sbml_parser.py',224),
+  ('expression -> HASH NUMBER LPAREN expression COMMA RPAREN','expression',6,'p_expression_tuple_index_single','sbml_parser.py',231),
+  ('expression -> ID','expression',1,'p_expression_variable','sbml_parser.py',246),
+  ('input -> expression','input',1,'p_input_expression','sbml_parser.py',251),
+  ('input -> block','input',1,'p_input_program','sbml_parser.py',255),
+  ('block -> LBRACE statements RBRACE','block',3,'p_block','sbml_parser.py',259),
+  ('block -> LBRACE RBRACE','block',2,'p_block_empty','sbml_parser.py',263),
+  ('statements -> statement','statements',1,'p_statements_one','sbml_parser.py',267),
+  ('statements -> statements statement','statements',2,'p_statements_more','sbml_parser.py',271),
+  ('statement -> block','statement',1,'p_statement_block','sbml_parser.py',277),
+  ('statement -> SEMI','statement',1,'p_statement_empty','sbml_parser.py',281),
+  ('statement -> PRINT LPAREN expression RPAREN SEMI','statement',5,'p_statement_print','sbml_parser.py',285),
+  ('statement -> ID ASSIGN expression SEMI','statement',4,'p_statement_assign','sbml_parser.py',289),
+  ('statement -> expression LBRACKET expression RBRACKET ASSIGN expression SEMI','statement',7,'p_statement_index_assign','sbml_parser.py',293),
+  ('statement -> IF LPAREN expression RPAREN block','statement',5,'p_statement_if','sbml_parser.py',297),
+  ('statement -> IF LPAREN expression RPAREN block ELSE block','statement',7,'p_statement_if_else','sbml_parser.py',301),
+  ('statement -> WHILE LPAREN expression RPAREN block','statement',5,'p_statement_while','sbml_parser.py',305),
+  ('statement -> error SEMI','statement',2,'p_statement_error','sbml_parser.py',309),
 ]
@@ -4,56 +4,74 @@
 from dataclasses import dataclass
 from typing import Union, List, Any
 
+from sbml_values import SbmlList, Rope, STRINGS, join_strings, join_string_chain, concat_chain, make_list
+
 class SemanticError(Exception):
     pass
 
-@dataclass
-class NumberNode:
+# Every node is a slotted dataclass derived from Node, so a node carries no
+# per-instance __dict__.
+class Node:
+    __slots__ = ()
+
+def child_nodes(node):
+    # Direct child nodes in field order, looking inside list fields.
+    for name in node.__slots__:
+        val = getattr(node, name)
+        if isinstance(val, list):
+            for elem in val:
+                if isinstance(elem, Node):
+                    yield elem
+        elif isinstance(val, Node):
+            yield val
+
+@dataclass(slots=True)
+class NumberNode(Node):
     value: Union[int, float]
 
-    def eval(self):
+    def eval(self, env=None):
         return self.value
 
     def __str__(self):
         return f"NumberNode({self.value})"
 
-@dataclass
-class BooleanNode:
+@dataclass(slots=True)
+class BooleanNode(Node):
     value: bool
 
-    def eval(self):
+    def eval(self, env=None):
         return self.value
 
     def __str__(self):
         return f"BooleanNode({self.value})"
 
-@dataclass
-class StringNode:
+@dataclass(slots=True)
+class StringNode(Node):
     value: str
 
-    def eval(self):
+    def eval(self, env=None):
         return self.value
 
     def __str__(self):
         return f"StringNode({self.value!r})"
 
-@dataclass
-class ListNode:
+@dataclass(slots=True)
+class ListNode(Node):
     elements: List[Any]
 
-    def eval(self):
-        return [elem.eval() for elem in self.elements]
+    def eval(self, env=None):
+        return make_list([elem.eval(env) for elem in self.elements])
 
     def __str__(self):
         inner = ", ".join(str(e) for e in self.elements)
         return f"ListNode([{inner}])"
 
-@dataclass
-class TupleNode:
+@dataclass(slots=True)
+class TupleNode(Node):
     elements: List[Any]
 
-    def eval(self):
-        return tuple(elem.eval() if hasattr(elem, 'eval') else elem for elem in self.elements)
+    def eval(self, env=None):
+        return tuple(elem.eval(env) if hasattr(elem, 'eval') else elem for elem in self.elements)
 
     def __str__(self):
         inner = ", ".join(str(e) for e in self.elements)
@@ -62,48 +80,48 @@ class TupleNode:
 def is_num(x):
     return isinstance(x, (int, float))
 
-@dataclass
-class BinaryOpNode:
+@dataclass(slots=True)
+class BinaryOpNode(Node):
     op: str
     left: Any
     right: Any
 
 
-    def eval(self):
+    def eval(self, env=None):
         op = '!=' if self.op in ('<>', '!=') else self.op
 
         if op == 'andalso':
-            left_val = self.left.eval()
+            left_val = self.left.eval(env)
             if not isinstance(left_val, bool):
                 raise SyntaxError("Operands or andalso must be booleans")
             if not left_val:
                 return False
-            right_val = self.right.eval()
+            right_val = self.right.eval(env)
             if not isinstance(right_val, bool):
                 raise SyntaxError("Operands or andalso must be booleans")
             return left_val and right_val
 
         if op == 'orelse':
-            left_val = self.left.eval()
+            left_val = self.left.eval(env)
             if not isinstance(left_val, bool):
                 raise SyntaxError("Operands or orelse must be booleans")
             if not left_val:
                 return False
-            right_val = self.right.eval()
+            right_val = self.right.eval(env)
             if not isinstance(right_val, bool):
                 raise SyntaxError("Operands or orelse must be booleans")
             return left_val or right_val
 
-        left_val = self.left.eval()
-        right_val = self.right.eval()
+        left_val = self.left.eval(env)
+        right_val = self.right.eval(env)
 
         if op == '+':
             if is_num(left_val) and is_num(right_val):
                 return left_val + right_val
-            if isinstance(left_val, str) and isinstance(right_val, str):
-                return left_val + right_val
-            if isinstance(left_val, list) and isinstance(right_val, list):
-                return left_val + right_val
+            if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+                return join_strings(left_val, right_val)
+            if isinstance(left_val, SbmlList) and isinstance(right_val, SbmlList):
+                return left_val.concat(right_val)
             raise SyntaxError("Operands of + must both be numbers")
 
         elif op == '-':
@@ -148,7 +166,7 @@ class BinaryOpNode:
                 elif op == '!=': return left_val != right_val
                 elif op == '>=': return left_val >= right_val
                 elif op == '>': return left_val > right_val
-            if isinstance(left_val, str) and isinstance(right_val, str):
+            if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
                 if op == '<': return left_val < right_val
                 elif op == '<=': return left_val <= right_val
                 elif op == '==': return left_val == right_val
@@ -158,13 +176,15 @@ class BinaryOpNode:
             raise SemanticError("Invalid Types for comparison.")
 
         elif op == '::':
-            if not isinstance(right_val, list):
+            if not isinstance(right_val, SbmlList):
                 raise TypeError("Right side of :: must be a list.")
-            return [left_val] + right_val
+            return right_val.cons(left_val)
 
         elif op == 'in':
-            if not isinstance(right_val, (list, str)):
+            if not isinstance(right_val, (SbmlList, str, Rope)):
                 raise TypeError("Right side of in must be a list or str")
+            if type(left_val) is Rope:
+                left_val = str(left_val)
             return left_val in right_val
 
         else:
@@ -173,15 +193,87 @@ class BinaryOpNode:
     def __str__(self):
         return f"BinaryOpNode({self.left} {self.op} {self.right})"
 
+# The chain nodes never come from the parser. sbml_flatten makes them out
+# of left-nested chains of one operator for evaluation only; -P and -J
+# always print the parsed BinaryOpNodes.
+
+def add_chain(values):
+    # values[0] + values[1] + ... as the nested + nodes give it, taking the
+    # values from an iterable in order. Numbers are added pairwise from the
+    # left, so int/float promotion happens where it did; strings and lists
+    # are joined in one step.
+    values = iter(values)
+    total = next(values)
+    if is_num(total):
+        for value in values:
+            if not is_num(value):
+                raise SyntaxError("Operands of + must both be numbers")
+            total = total + value
+        return total
+    if isinstance(total, STRINGS):
+        parts = [total]
+        for value in values:
+            if not isinstance(value, STRINGS):
+                raise SyntaxError("Operands of + must both be numbers")
+            parts.append(value)
+        return join_string_chain(parts)
+    if isinstance(total, SbmlList):
+        parts = [total]
+        for value in values:
+            if not isinstance(value, SbmlList):
+                raise SyntaxError("Operands of + must both be numbers")
+            parts.append(value)
+        return concat_chain(parts)
+    raise SyntaxError("Operands of + must both be numbers")
+
+@dataclass(slots=True)
+class SumNode(Node):
+    operands: List[Any]
+
+    def eval(self, env=None):
+        return add_chain(operand.eval(env) for operand in self.operands)
+
+    def __str__(self):
+        inner = " + ".join(str(operand) for operand in self.operands)
+        return f"SumNode({inner})"
+
+@dataclass(slots=True)
+class LogicChainNode(Node):
+    # a andalso b andalso ... stops at the first False. orelse, as
+    # BinaryOpNode has it, is False when its left side is False and True
+    # otherwise, so an orelse chain only stops on its first operand.
+    op: str
+    operands: List[Any]
+
+    def eval(self, env=None):
+        message = f"Operands or {self.op} must be booleans"
+        operands = iter(self.operands)
+        for operand in operands:
+            value = operand.eval(env)
+            if not isinstance(value, bool):
+                raise SyntaxError(message)
+            if not value:
+                return False
+            if self.op == 'orelse':
+                break
+        for operand in operands:
+            if not isinstance(operand.eval(env), bool):
+                raise SyntaxError(message)
+        return True
+
+    def __str__(self):
+        inner = f" {self.op} ".join(str(operand) for operand in self.operands)
+        return f"LogicChainNode({inner})"
 
 
-@dataclass
-class UnaryOpNode:
+
+@dataclass(slots=True)
+class UnaryOpNode(Node):
     op: str
     expr: Any
 
-    def eval(self):
-        value = self.expr.eval()
+    def eval(self, env=None):
+        value = self.expr.eval(env)
 
         if self.op == '-':
             return -value
@@ -198,26 +290,26 @@ class UnaryOpNode:
     def __str__(self):
         return f"UnaryOpNode({self.op} {self.expr})"
 
-@dataclass
-class IndexNode:
+@dataclass(slots=True)
+class IndexNode(Node):
     collection: Any
     index: Any
 
-    def eval(self):
-        collection_value = self.collection.eval()
-        index_value = self.index.eval()
+    def eval(self, env=None):
+        collection_value = self.collection.eval(env)
+        index_value = self.index.eval(env)
 
         if not isinstance(index_value, int):
             raise TypeError("Index must be an integer.")
 
-        if not isinstance(collection_value, (list, str)):
+        if not isinstance(collection_value, (SbmlList, str, Rope)):
             raise TypeError("Can only index lists or strings.")
 
         if index_value < 0 or index_value >= len(collection_value):
             raise IndexError("Index out of bounds")
 
         result = collection_value[index_value]
-        if isinstance(collection_value, str):
+        if isinstance(collection_value, STRINGS):
             return str(result)
         return result
 
@@ -225,14 +317,14 @@ class IndexNode:
         return f"IndexNode({self.collection}[{self.index}])"
 
 
-@dataclass
-class TupleIndexNode:
+@dataclass(slots=True)
+class TupleIndexNode(Node):
     index: Any
     tuple_expr: Any
 
-    def eval(self):
-        index_val = self.index.eval()
-        tuple_val = self.tuple_expr.eval()
+    def eval(self, env=None):
+        index_val = self.index.eval(env)
+        tuple_val = self.tuple_expr.eval(env)
 
         if not isinstance(index_val, int):
             raise TypeError("Tuple index must be an integer")
@@ -250,18 +342,155 @@ class TupleIndexNode:
 
 GLOBAL_ENV = {}
 
+#------------ Variables Section------------
+
+# Value of a slot that has not been assigned yet.
+UNSET = object()
+
+class Environment:
+    # One program run: a value for every variable slot the parser handed
+    # out, and the text printed so far.
+    __slots__ = ('slots', 'out')
+
+    def __init__(self, size=0):
+        self.slots = [UNSET] * size
+        self.out = []
+
+@dataclass(slots=True)
+class VariableNode(Node):
+    name: str
+    slot: int
+
+    def eval(self, env=None):
+        if env is None or self.slot >= len(env.slots):
+            raise NameError(f"Variable '{self.name}' is not defined")
+        value = env.slots[self.slot]
+        if value is UNSET:
+            raise NameError(f"Variable '{self.name}' is not defined")
+        return value
+
+    def __str__(self):
+        return f"VariableNode({self.name})"
+
+def format_value(value):
+    # The text -E prints for a value, and print() writes.
+    if isinstance(value, STRINGS):
+        return f"'{value}'"
+    try:
+        return str(value)
+    except RecursionError:
+        from sbml_iterative import value_str
+        return value_str(value)
+
 def evaluate_any(node, env):
     if node is None:
         return None
     if hasattr(node, "evaluate"):
         return node.evaluate(env)
     if hasattr(node, "eval"):
-        return node.eval()
+        return node.eval(env)
     return None
 
-@dataclass
-class ProgramNode:
+#------------ Statements Section------------
+
+def check_condition(value, keyword):
+    if not isinstance(value, bool):
+        raise TypeError(f"Condition of {keyword} must be a boolean")
+    return value
+
+@dataclass(slots=True)
+class BlockNode(Node):
+    statements: List[Any]
+
+    def evaluate(self, env):
+        for statement in self.statements:
+            statement.evaluate(env)
+
+    def __str__(self):
+        inner = "; ".join(str(s) for s in self.statements)
+        return f"BlockNode({{{inner}}})"
+
+@dataclass(slots=True)
+class PrintNode(Node):
+    expr: Any
+
+    def evaluate(self, env):
+        env.out.append(format_value(self.expr.eval(env)) + "\n")
 
     def __str__(self):
-        return "ProgramNode()"
+        return f"PrintNode({self.expr})"
 
+@dataclass(slots=True)
+class AssignNode(Node):
+    name: str
+    slot: int
+    expr: Any
+
+    def evaluate(self, env):
+        env.slots[self.slot] = self.expr.eval(env)
+
+    def __str__(self):
+        return f"AssignNode({self.name} = {self.expr})"
+
+@dataclass(slots=True)
+class IndexAssignNode(Node):
+    collection: Any
+    index: Any
+    expr: Any
+
+    def evaluate(self, env):
+        collection_value = self.collection.eval(env)
+        index_value = self.index.eval(env)
+        value = self.expr.eval(env)
+
+        if not isinstance(index_value, int):
+            raise TypeError("Index must be an integer.")
+        if not isinstance(collection_value, SbmlList):
+            raise TypeError("Can only assign into lists.")
+        if index_value < 0 or index_value >= len(collection_value):
+            raise IndexError("Index out of bounds")
+        collection_value[index_value] = value
+
+    def __str__(self):
+        return f"IndexAssignNode({self.collection}[{self.index}] = {self.expr})"
+
+@dataclass(slots=True)
+class IfNode(Node):
+    cond: Any
+    then_block: Any
+    else_block: Any = None
+
+    def evaluate(self, env):
+        if check_condition(self.cond.eval(env), "if"):
+            self.then_block.evaluate(env)
+        elif self.else_block is not None:
+            self.else_block.evaluate(env)
+
+    def __str__(self):
+        if self.else_block is None:
+            return f"IfNode({self.cond} {self.then_block})"
+        return f"IfNode({self.cond} {self.then_block} else {self.else_block})"
+
+@dataclass(slots=True)
+class WhileNode(Node):
+    cond: Any
+    body: Any
+
+    def evaluate(self, env):
+        while check_condition(self.cond.eval(env), "while"):
+            self.body.evaluate(env)
+
+    def __str__(self):
+        return f"WhileNode({self.cond} {self.body})"
+
+@dataclass(slots=True)
+class ProgramNode(Node):
+    block: Any
+    # Variable names in slot order.
+    names: List[str]
+
+    def evaluate(self, env):
+        self.block.evaluate(env)
+
+    def __str__(self):
+        return f"ProgramNode({self.block})"
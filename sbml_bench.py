@@ -0,0 +1,772 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Benchmarks for the SBML interpreter.
+# Usage: python sbml_bench.py [benchmark ...]   (runs all when none are named)
+#        python sbml_bench.py suite [--scale X] [--save FILE] [--compare FILE] [--threshold T]
+#
+# The suite times every stage on generated workloads. --save stores the times
+# as a baseline and --compare flags any stage that got slower than the
+# baseline by more than the threshold (a fraction, 0.25 by default).
+
+import json
+import random
+import sys
+import time
+
+from sbml_ast import NumberNode, ListNode, BinaryOpNode
+
+
+def best_time(fn, repeat=3):
+    # Returns the best wall time of fn() in seconds, or the name of the
+    # exception it raised.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            return type(e).__name__
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def show(label, result):
+    if isinstance(result, float):
+        print(f"  {label:<28} {result * 1000:10.2f} ms")
+    else:
+        print(f"  {label:<28} {result:>13}")
+
+#------------ Tree Builders------------
+
+def deep_cons_tree(depth):
+    # 1 :: 1 :: ... :: [] nested depth levels to the right.
+    node = ListNode([])
+    for _ in range(depth):
+        node = BinaryOpNode('::', NumberNode(1), node)
+    return node
+
+
+def deep_plus_tree(depth):
+    # 1 + 1 + ... + 1 nested depth levels to the left.
+    node = NumberNode(1)
+    for _ in range(depth):
+        node = BinaryOpNode('+', node, NumberNode(1))
+    return node
+
+
+def wide_list_tree(width):
+    return ListNode([BinaryOpNode('*', NumberNode(i), NumberNode(2)) for i in range(width)])
+
+#------------ Benchmarks------------
+
+def bench_iterative():
+    from sbml_compile import compile_node
+    from sbml_emit import ast_json, ast_text
+    from sbml_iterative import eval_iterative, node_str, ast_lines
+
+    shapes = [
+        ("deep :: 500", deep_cons_tree(500)),
+        ("deep :: 200000", deep_cons_tree(200000)),
+        ("deep + 500", deep_plus_tree(500)),
+        ("deep + 200000", deep_plus_tree(200000)),
+        ("wide list 100000", wide_list_tree(100000)),
+    ]
+    for label, tree in shapes:
+        print(label)
+        show("recursive eval()", best_time(tree.eval))
+        try:
+            compiled = compile_node(tree)
+            show("compiled closures (run)", best_time(compiled))
+        except RecursionError:
+            show("compiled closures (run)", "RecursionError")
+        show("iterative eval", best_time(lambda: eval_iterative(tree)))
+        show("recursive __str__", best_time(lambda: str(tree)))
+        show("iterative node_str", best_time(lambda: node_str(tree)))
+        if label.startswith("deep") and not label.endswith(" 500"):
+            # -P output of a deep tree grows with the square of its depth.
+            continue
+        show("iterative ast_lines", best_time(lambda: "\n".join(ast_lines(tree))))
+        show("emitter ast_text (-P)", best_time(lambda: ast_text(tree)))
+        show("emitter ast_json (-J)", best_time(lambda: ast_json(tree)))
+
+
+def count_nodes(tree):
+    from sbml_ast import child_nodes
+
+    count = 0
+    stack = [tree]
+    while stack:
+        count += 1
+        stack.extend(child_nodes(stack.pop()))
+    return count
+
+
+def bench_compact():
+    import gc
+    import tracemalloc
+    from sbml_parser import parser, lexer
+
+    print("instance size")
+    show("NumberNode (bytes)", str(sys.getsizeof(NumberNode(1))))
+    show("BinaryOpNode (bytes)", str(sys.getsizeof(BinaryOpNode('+', None, None))))
+
+    items = ", ".join(str(i) for i in range(100000))
+    literals = [
+        ("list literal 100000", f"[{items}]"),
+        ("tuple literal 100000", f"({items})"),
+        ("arithmetic line", "1 + 2 * 3 - 4 div 5 < 6 andalso not False"),
+    ]
+    for label, text in literals:
+        print(label)
+        show("parse", best_time(lambda: parser.parse(text, lexer=lexer)))
+        gc.collect()
+        tracemalloc.start()
+        tree = parser.parse(text, lexer=lexer)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        show("retained bytes per node", f"{retained / count_nodes(tree):.1f}")
+
+
+def bench_lexer():
+    from sbml_lexer import FastLexer, fuzz_inputs
+    from sbml_parser import lexer as ply_lexer
+
+    with open("test.txt") as file:
+        lines = [line.strip() for line in file if line.strip()] * 200
+    lines.extend(fuzz_inputs(10000, seed=1))
+
+    def tokenize(lexer):
+        for line in lines:
+            lexer.input(line)
+            try:
+                while lexer.token():
+                    pass
+            except SyntaxError:
+                pass
+
+    print(f"{len(lines)} lines")
+    show("PLY lexer", best_time(lambda: tokenize(ply_lexer)))
+    show("FastLexer", best_time(lambda: tokenize(FastLexer())))
+
+
+def bench_startup():
+    import os
+    import subprocess
+    import tempfile
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def run(*args):
+        return lambda: subprocess.run([sys.executable, *args], cwd=here, check=True,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def timed(setup, stmt):
+        # Best in-process time of stmt in a fresh interpreter, so imports
+        # and tables are cold every time.
+        code = (f"import time; {setup}; start = time.perf_counter(); {stmt}; "
+                f"print(time.perf_counter() - start)")
+        best = None
+        for _ in range(5):
+            out = subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                                 capture_output=True, text=True).stdout
+            best = float(out) if best is None else min(best, float(out))
+        return best
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "one.txt")
+        with open(path, "w") as file:
+            file.write("1 + 2\n")
+
+        print("cold start (whole process)")
+        show("python -c pass", best_time(run("-c", "pass"), repeat=5))
+        show("import sbml_ast", best_time(run("-c", "import sbml_ast"), repeat=5))
+        show("sbml_main.py -E one line", best_time(run("sbml_main.py", "-E", path), repeat=5))
+        show("sbml_main.py -P one line", best_time(run("sbml_main.py", "-P", path), repeat=5))
+
+        print("parser construction (in process)")
+        show("prebuilt tables", timed("import sbml_parser", "sbml_parser.make_parser()"))
+        show("yacc.yacc() check", timed("import sbml_parser, ply.yacc as yacc",
+                                        "yacc.yacc(module=sbml_parser, debug=False, write_tables=False)"))
+        show("PLY lexer", timed("import sbml_parser", "sbml_parser.get_lexer()"))
+
+
+def bench_threads():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from sbml_main import Interpreter, thread_interpreter
+
+    with open("test.txt") as file:
+        lines = [line.strip() for line in file if line.strip()] * 100
+    expected = list(Interpreter().run(lines))
+    batches = [lines[i:i + 50] for i in range(0, len(lines), 50)]
+
+    shared = Interpreter()
+    lock = threading.Lock()
+
+    def locked_batch(batch):
+        with lock:
+            return [shared.evaluate(line) for line in batch]
+
+    def session_batch(batch):
+        session = thread_interpreter()
+        return [session.evaluate(line) for line in batch]
+
+    print(f"{len(lines)} lines in batches of 50")
+    show("Interpreter()", best_time(lambda: [Interpreter() for _ in range(1000)]) / 1000)
+    for threads in (1, 4, 16, 64):
+        print(f"{threads} threads")
+        for label, work in (("shared session + lock", locked_batch), ("session per thread", session_batch)):
+            with ThreadPoolExecutor(threads) as pool:
+                results = []
+                elapsed = best_time(lambda: results.append(list(pool.map(work, batches))))
+            ok = all(sum(result, []) == expected for result in results)
+            show(label, elapsed if ok else "WRONG OUTPUT")
+
+    # Switch threads as often as possible to shake out shared state.
+    print("16 threads, switching every microsecond")
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(16) as pool:
+            ok = sum(pool.map(session_batch, batches), []) == expected
+        show("session per thread", "ok" if ok else "WRONG OUTPUT")
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def bench_statements():
+    from sbml_ast import Environment
+    from sbml_compile import compile_node
+    from sbml_lexer import FastLexer
+    from sbml_parser import make_parser
+
+    programs = [
+        ("while, 1000000 iterations",
+         "{ i = 0; s = 0; while (i < 1000000) { s = s + i; i = i + 1; } print(s); }"),
+        ("nested if, 200000 iterations",
+         "{ i = 0; n = 0; while (i < 200000) { if (i mod 3 == 0) { n = n + 1; } else { n = n - 1; } "
+         "i = i + 1; } print(n); }"),
+        ("list updates, 200000 iterations",
+         "{ a = [0, 0, 0, 0]; i = 0; while (i < 200000) { a[i mod 4] = a[i mod 4] + i; i = i + 1; } print(a); }"),
+    ]
+    parser = make_parser()
+    for label, text in programs:
+        tree = parser.parse(text, lexer=FastLexer())
+        size = len(tree.names)
+        print(label)
+
+        def walk():
+            tree.evaluate(Environment(size))
+
+        def compiled():
+            compile_node(tree, Environment(size))()
+
+        show("tree-walking evaluate()", best_time(walk))
+        show("compiled, slot variables", best_time(compiled))
+
+
+def bench_types():
+    from sbml_ast import Environment
+    from sbml_compile import compile_node
+    from sbml_lexer import FastLexer
+    from sbml_parser import make_parser
+    from sbml_types import infer_types
+
+    programs = [
+        ("arithmetic loop, 500000 iterations",
+         "{ i = 0; s = 0.0; while (i < 500000) { s = s + i * 2.5 - i div 3; i = i + 1; } print(s); }"),
+        ("string and boolean loop, 300000 iterations",
+         "{ i = 0; n = 0; w = \"ab\"; while (i < 300000 andalso not (w == \"\")) { "
+         "if (w[i mod 2] < \"b\" orelse i mod 7 == 0) { n = n + 1; } i = i + 1; } print(n); }"),
+    ]
+    parser = make_parser()
+    for label, text in programs:
+        tree = parser.parse(text, lexer=FastLexer())
+        size = len(tree.names)
+        print(label)
+
+        def checked():
+            compile_node(tree, Environment(size))()
+
+        def proven():
+            compile_node(tree, Environment(size), infer_types(tree))()
+
+        show("compiled, type checks", best_time(checked))
+        show("compiled, proven types", best_time(proven))
+
+    line = " + ".join(f"({k} * 3 - {k} div 2) * 1.5" for k in range(200))
+    tree = parser.parse(line, lexer=FastLexer())
+    print("200-term literal expression")
+    show("compiled, type checks", best_time(compile_node(tree)))
+    show("compiled, proven types", best_time(compile_node(tree, None, infer_types(tree))))
+    show("inference pass", best_time(lambda: infer_types(tree)))
+
+
+def bench_limits():
+    import sbml_limits
+    from sbml_main import Interpreter
+
+    loop = "{ i = 0; s = 0; while (i < 300000) { s = s + i * i; i = i + 1; } print(s); }"
+    for label, limits in (("limits off", None), ("limits on", sbml_limits.Limits())):
+        sbml_limits.use_limits(limits)
+        print(label)
+        show("while, 300000 iterations", best_time(lambda: Interpreter().execute(loop), repeat=1))
+        show("2 ** 10 ** 6", best_time(lambda: Interpreter().execute("2 ** 10 ** 6")))
+    sbml_limits.use_limits(None)
+
+
+def bench_lists():
+    from sbml_main import Interpreter
+    from sbml_values import SbmlList
+
+    def build_python(count):
+        items = []
+        for i in range(count):
+            items = [i] + items
+        return items
+
+    def build_sbml(count):
+        items = SbmlList()
+        for i in range(count):
+            items = items.cons(i)
+        return items
+
+    print("value level, repeated cons")
+    show("python [x] + l, 20000", best_time(lambda: build_python(20000)))
+    show("SbmlList.cons, 20000", best_time(lambda: build_sbml(20000)))
+    show("SbmlList.cons, 1000000", best_time(lambda: build_sbml(1000000)))
+
+    programs = [
+        ("i :: l", "l = i :: l;"),
+        ("l + [i]", "l = l + [i];"),
+        ("[i] + l", "l = [i] + l;"),
+    ]
+    print("program, 1000000 iterations")
+    for label, step in programs:
+        text = ("{ l = []; i = 0; while (i < 1000000) { " + step +
+                " i = i + 1; } print(l[0]); print(l[999999]); print(500000 in l); }")
+        show(label, best_time(lambda: Interpreter().execute(text), repeat=1))
+
+
+def bench_membership():
+    import sbml_values
+    from sbml_main import Interpreter
+    from sbml_values import SbmlList
+
+    literal = "[" + ", ".join(str(3 * i) for i in range(10000)) + "]"
+    text = ("{ i = 0; c = 0; while (i < 20000) { if (i * 1.5 in " + literal +
+            ") { c = c + 1; } i = i + 1; } print(c); }")
+    saved = sbml_values.INDEX_MIN
+    for label, index_min in (("scans", 10 ** 12), ("indexed", saved)):
+        sbml_values.INDEX_MIN = index_min
+        print(label)
+        for size in (10000, 1000000):
+            items = SbmlList(range(size))
+            probes = [float(size - 1 - k) for k in range(0, 200, 2)] + [-1] * 100
+            show(f"200 probes, {size} ints", best_time(lambda: [p in items for p in probes], repeat=1))
+        show("20000 probes of a 10000 literal", best_time(lambda: Interpreter().execute(text), repeat=1))
+    sbml_values.INDEX_MIN = saved
+
+
+def bench_strings():
+    import sbml_values
+    from sbml_iterative import eval_iterative
+    from sbml_lexer import FastLexer
+    from sbml_main import Interpreter
+    from sbml_parser import make_parser
+
+    chain = " + ".join(['"ab"'] * 20000)
+    loop = ('{ s = ""; i = 0; while (i < 200000) { s = s + "ab"; i = i + 1; } '
+            'print(s[77777]); print(s[399999]); }')
+    parser = make_parser()
+    tree = parser.parse(f"({chain})[39999]", lexer=FastLexer())
+    saved = sbml_values.ROPE_MIN
+    for label, rope_min in (("python strings", 10 ** 12), ("ropes", saved)):
+        sbml_values.ROPE_MIN = rope_min
+        print(label)
+        show("20000-term chain, index", best_time(lambda: eval_iterative(tree)))
+        show("200000 appends in a loop", best_time(lambda: Interpreter().execute(loop), repeat=1))
+    sbml_values.ROPE_MIN = saved
+
+
+def bench_chains():
+    from sbml_compile import compile_node
+    from sbml_flatten import flatten_chains
+    from sbml_iterative import eval_iterative
+    from sbml_lexer import FastLexer
+    from sbml_main import Interpreter
+    from sbml_parser import make_parser
+    from sbml_types import infer_types
+
+    parser = make_parser()
+    lines = [
+        ("sum, 200 terms", " + ".join(str(i) for i in range(200))),
+        ("strings, 200 terms", " + ".join(['"ab"'] * 200)),
+        ("lists, 200 terms", " + ".join(['[1, 2]'] * 200)),
+        ("andalso, 200 terms", " andalso ".join(['True'] * 200)),
+    ]
+    print("compiled, nested vs flattened")
+    for label, line in lines:
+        tree = parser.parse(line, lexer=FastLexer())
+        flat = flatten_chains(tree)
+        show(label + ", nested", best_time(compile_node(tree, None, infer_types(tree))))
+        show(label + ", flat", best_time(compile_node(flat, None, infer_types(flat))))
+
+    tree = parser.parse(" + ".join(str(i % 10) for i in range(20000)), lexer=FastLexer())
+    flat = flatten_chains(tree)
+    print("20000-term sum")
+    show("explicit-stack evaluator", best_time(lambda: eval_iterative(tree)))
+    show("flattened, compiled", best_time(compile_node(flat, None, infer_types(flat))))
+
+    loop = ('{ s = 0; l = []; i = 0; while (i < 100000) { s = s + i + i + 1; '
+            'l = l + [i] + [s]; i = i + 1; } print(s); print(l[199999]); }')
+    show("loop with chains, 100000 passes", best_time(lambda: Interpreter().execute(loop), repeat=1))
+
+
+def bench_numpy():
+    import sbml_values
+    from sbml_compile import compile_node
+    from sbml_lexer import FastLexer
+    from sbml_main import evaluate_line
+    from sbml_parser import make_parser
+
+    if not sbml_values.use_numpy():
+        print("  NumPy is not installed")
+        return
+    sbml_values.use_numpy(False)
+
+    ints = "[" + ", ".join(str(i) for i in range(100000)) + "]"
+    floats = "[" + ", ".join(f"{i}.5" for i in range(100000)) + "]"
+    lines = [
+        ("int list + int list", f"{ints} + {ints}"),
+        ("float list + float list", f"{floats} + {floats}"),
+        ("in, last element", f"99999 in {ints}"),
+        ("in, missing float", f"0.25 in {floats}"),
+        ("index", f"{ints}[77777]"),
+    ]
+    parser = make_parser()
+    for label, text in lines:
+        tree = parser.parse(text, lexer=FastLexer())
+        print(label)
+        for arrays in (False, True):
+            sbml_values.use_numpy(arrays)
+            name = "numpy" if arrays else "python"
+            run = compile_node(tree)
+            show(f"{name}, compiled run", best_time(run))
+            show(f"{name}, whole line", best_time(lambda: evaluate_line(text), repeat=1))
+    sbml_values.use_numpy(False)
+
+
+def bench_serialize():
+    import os
+    import random
+    import tempfile
+    from sbml_main import Interpreter, compile_lines
+    from sbml_serialize import AstFile
+
+    rng = random.Random(0)
+    with open("test.txt") as file:
+        lines = [line.strip() for line in file if line.strip()]
+    lines = [rng.choice(lines) for _ in range(200000)]
+    session = Interpreter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lines.sbmlc")
+        print(f"{len(lines)} lines")
+        show("parse every line", best_time(lambda: [session.parse(line) for line in lines], repeat=1))
+        show("compile to file", best_time(lambda: compile_lines(lines, path), repeat=1))
+        show("file size (bytes)", str(os.path.getsize(path)))
+
+        def load_all():
+            with AstFile(path) as loaded:
+                for _ in loaded:
+                    pass
+
+        def load_last():
+            with AstFile(path) as loaded:
+                return loaded[len(loaded) - 1]
+
+        show("load every line", best_time(load_all, repeat=1))
+        show("open and load last line", best_time(load_last))
+
+
+def bench_errors():
+    from sbml_main import Interpreter
+    from sbml_parser import ErrorCollector
+
+    rng = random.Random(0)
+    bad = gen_syntax_errors(1, rng)
+    good = gen_short_lines(0.4, rng)
+    print(f"{len(bad)} mostly bad lines, {len(good)} clean lines")
+    for label, session in (("raising", Interpreter()), ("quiet", Interpreter(errors=ErrorCollector()))):
+        show(f"{label}, mostly bad", best_time(lambda: list(session.run(bad))))
+        show(f"{label}, clean", best_time(lambda: list(session.run(good))))
+
+
+def bench_watch():
+    from sbml_watch import IncrementalRunner
+
+    rng = random.Random(0)
+    lines = gen_short_lines(4, rng)
+    lines[1000:1000] = ["{ x = 1; }", "{ x = x + 1; print(x); }"]
+    runner = IncrementalRunner()
+    print(f"{len(lines)} lines")
+    show("first run", best_time(lambda: runner.update(list(lines)), repeat=1))
+
+    def edit(at, text):
+        def run():
+            changed = list(lines)
+            changed[at] = text
+            runner.update(changed)
+        return run
+
+    show("edit one expression line", best_time(edit(len(lines) // 2, "12345 * 6789")))
+    show("edit one block line", best_time(edit(1001, "{ x = x + 2; print(x); }")))
+
+
+def bench_server():
+    import asyncio
+    import os
+    import subprocess
+    import tempfile
+    from sbml_server import bench_client
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open("test.txt") as file:
+        sample = [line.strip() for line in file if line.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "one.txt")
+        with open(path, "w") as file:
+            file.write(sample[0] + "\n")
+        print("one process per request")
+        show("sbml_main.py -E one line", best_time(lambda: subprocess.run(
+            [sys.executable, "sbml_main.py", "-E", path], cwd=here, check=True,
+            stdout=subprocess.DEVNULL), repeat=5))
+
+        sock = os.path.join(tmp, "sbml.sock")
+        for workers in ("0", str(os.cpu_count())):
+            server = subprocess.Popen([sys.executable, "sbml_server.py", "serve", "--unix", sock,
+                                       "--workers", workers], cwd=here)
+            try:
+                while not os.path.exists(sock):
+                    time.sleep(0.05)
+                print(f"server, {workers} workers")
+                asyncio.run(bench_client(sample * 20, 1, 1, unix=sock))
+                asyncio.run(bench_client(sample * 500, 8, 128, unix=sock))
+            finally:
+                server.terminate()
+                server.wait()
+                if os.path.exists(sock):
+                    os.unlink(sock)
+
+
+#------------ Workload Generators------------
+
+# Each generator returns the lines of one input file. size scales the work.
+
+def gen_deep_cons(size, rng):
+    depth = int(300 * size)
+    return [" :: ".join(str(rng.randrange(100)) for _ in range(depth)) + " :: []"
+            for _ in range(20)]
+
+
+def gen_wide_arithmetic(size, rng):
+    ops = ["+", "-", "*", "div", "mod"]
+    lines = []
+    for _ in range(int(500 * size)):
+        terms = [str(rng.randrange(1, 100)) for _ in range(40)]
+        line = terms[0]
+        for term in terms[1:]:
+            line += f" {rng.choice(ops)} {term}"
+        lines.append(line)
+    return lines
+
+
+def gen_huge_list(size, rng):
+    items = ", ".join(str(rng.randrange(1000)) for _ in range(int(50000 * size)))
+    return [f"[{items}]", f"[{items}][7]"]
+
+
+def gen_huge_tuple(size, rng):
+    items = ", ".join(f'"s{rng.randrange(1000)}"' for _ in range(int(50000 * size)))
+    return [f"({items})", f"#3(({items}))"]
+
+
+def gen_long_strings(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz "
+    lines = []
+    for _ in range(20):
+        text = "".join(rng.choice(letters) for _ in range(int(20000 * size)))
+        lines.append(f'"{text}" + "{text[::-1]}"')
+        lines.append(f'"q" in "{text}"')
+    return lines
+
+
+def gen_short_lines(size, rng):
+    shapes = ["{a} + {b}", "{a} * {b} - {c}", "[{a}, {b}][1]", "{a} < {b} andalso True",
+              "#{n}(({a}, {b}))", '"x" in ["x", "{a}"]', "{a} :: [{b}]", "not {a} == {b}"]
+    return [rng.choice(shapes).format(a=rng.randrange(100), b=rng.randrange(100),
+                                      c=rng.randrange(100), n=rng.randrange(1, 3))
+            for _ in range(int(50000 * size))]
+
+
+def gen_syntax_errors(size, rng):
+    broken = ["1 +", "(1, 2", "[1, 2,, 3]", "1 $ 2", "#(1, 2)", "not", "1 2 3",
+              "'unterminated", "[1, 2] [", "1 ** ** 2", ")(", "1 :: :: []"]
+    good = ["1 + 2", "[1, 2, 3]", "(1, 2)"]
+    return [rng.choice(broken) if rng.random() < 0.8 else rng.choice(good)
+            for _ in range(int(20000 * size))]
+
+
+WORKLOADS = {
+    'deep_cons': gen_deep_cons,
+    'wide_arithmetic': gen_wide_arithmetic,
+    'huge_list': gen_huge_list,
+    'huge_tuple': gen_huge_tuple,
+    'long_strings': gen_long_strings,
+    'short_lines': gen_short_lines,
+    'syntax_errors': gen_syntax_errors,
+}
+
+#------------ Suite------------
+
+def time_workload(lines, path):
+    # Times each stage on its own: tokenizing, parsing, evaluating and
+    # printing the already parsed trees, then the whole CLI on the file.
+    import os
+    import subprocess
+    from sbml_lexer import FastLexer
+    from sbml_main import run_tree, Interpreter
+
+    session = Interpreter()
+    trees = [tree for tree, _ in map(session.parse, lines) if tree is not None]
+
+    def tokenize():
+        lexer = FastLexer()
+        for line in lines:
+            lexer.input(line)
+            try:
+                while lexer.token():
+                    pass
+            except SyntaxError:
+                pass
+
+    def end_to_end():
+        subprocess.run([sys.executable, "sbml_main.py", "-E", path],
+                       cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+                       stdout=subprocess.DEVNULL)
+
+    return {
+        'lex': best_time(tokenize),
+        'parse': best_time(lambda: [session.parse(line) for line in lines]),
+        'eval': best_time(lambda: [run_tree(tree, "-E") for tree in trees]),
+        'print_ast': best_time(lambda: [run_tree(tree, "-P") for tree in trees]),
+        'end_to_end': best_time(end_to_end),
+    }
+
+
+def run_suite(scale=1.0, names=None):
+    # Returns {"workload/stage": seconds}.
+    import os
+    import tempfile
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names or WORKLOADS:
+            lines = WORKLOADS[name](scale, random.Random(name))
+            path = os.path.join(tmp, name + ".txt")
+            with open(path, "w") as file:
+                file.write("\n".join(lines) + "\n")
+            print(f"{name}: {len(lines)} lines, {os.path.getsize(path)} bytes")
+            for stage, result in time_workload(lines, path).items():
+                show(stage, result)
+                results[f"{name}/{stage}"] = result
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Prints every stage slower than baseline by more than threshold and
+    # returns how many there were.
+    regressions = 0
+    for key, old in baseline.items():
+        new = results.get(key)
+        if not isinstance(old, float) or not isinstance(new, float):
+            continue
+        if new > old * (1 + threshold):
+            regressions += 1
+            print(f"  REGRESSION {key}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                  f"(+{(new / old - 1) * 100:.0f}%)")
+    print(f"{regressions} regressions above {threshold * 100:.0f}%")
+    return regressions
+
+
+def suite_main(args):
+    options = {'--scale': "1", '--save': None, '--compare': None, '--threshold': "0.25"}
+    names = []
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in options:
+            if not args:
+                print(f"Error {arg} needs a value")
+                return 1
+            options[arg] = args.pop(0)
+        elif arg in WORKLOADS:
+            names.append(arg)
+        else:
+            print(f"Unknown workload '{arg}'. Choose from: {', '.join(WORKLOADS)}")
+            return 1
+
+    results = run_suite(float(options['--scale']), names)
+    if options['--save'] is not None:
+        with open(options['--save'], "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline saved to {options['--save']}")
+    if options['--compare'] is not None:
+        with open(options['--compare']) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, float(options['--threshold'])):
+            return 1
+    return 0
+
+
+BENCHMARKS = {
+    'iterative': bench_iterative,
+    'compact': bench_compact,
+    'lexer': bench_lexer,
+    'startup': bench_startup,
+    'threads': bench_threads,
+    'statements': bench_statements,
+    'types': bench_types,
+    'limits': bench_limits,
+    'lists': bench_lists,
+    'numpy': bench_numpy,
+    'membership': bench_membership,
+    'strings': bench_strings,
+    'chains': bench_chains,
+    'serialize': bench_serialize,
+    'errors': bench_errors,
+    'watch': bench_watch,
+    'server': bench_server,
+}
+
+
+def main(argv):
+    if argv[1:2] == ["suite"]:
+        return suite_main(argv[2:])
+    names = argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            return 1
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
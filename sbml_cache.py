@@ -0,0 +1,150 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Opt-in parse cache for sbml_main.py. Lines are keyed on their normalized
+# source text and evicted least-recently-used once either the entry count or
+# the approximate byte budget is exceeded.
+
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sbml_ast import (
+    child_nodes,
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    UnaryOpNode, IndexNode, TupleIndexNode
+)
+
+# Rough size of one node and its share of the parser's lists.
+NODE_BYTES = 100
+# A tree never has more nodes than its source has characters, and a typical
+# line has about one node for every four characters.
+CHARS_PER_NODE = 4
+
+# Node types whose value depends only on the literals below them.
+CONSTANT_NODES = frozenset((
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    UnaryOpNode, IndexNode, TupleIndexNode
+))
+
+_LEAVES = frozenset((NumberNode, BooleanNode, StringNode))
+
+_BLANKS = re.compile(r'[ \t]+')
+
+
+def normalize(text):
+    text = text.strip()
+    if '"' in text or "'" in text:
+        return text
+    return _BLANKS.sub(' ', text)
+
+
+def is_constant(node):
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        current = pop()
+        kind = type(current)
+        if kind in _LEAVES:
+            continue
+        if kind not in CONSTANT_NODES:
+            return False
+        stack.extend(child_nodes(current))
+    return True
+
+
+@dataclass
+class CacheEntry:
+    tree: Any
+    error: Optional[str]
+    size: int
+    constant: Optional[bool] = None
+    compiled: Any = None
+    outputs: dict = field(default_factory=dict)
+
+
+class ParseCache:
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, cache_results=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_results = cache_results
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.result_hits = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, tree, error=None):
+        size = sys.getsizeof(key)
+        if tree is not None:
+            size += (len(key) // CHARS_PER_NODE + 1) * NODE_BYTES
+        else:
+            size += sys.getsizeof(error)
+
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        entry = CacheEntry(tree, error, size)
+        self.entries[key] = entry
+        self.bytes += size
+        self._evict()
+        return entry
+
+    def remember_output(self, entry, mode, text):
+        # Only pure constant trees may reuse an earlier result.
+        if not self.cache_results:
+            return
+        if entry.constant is None:
+            entry.constant = is_constant(entry.tree)
+        if not entry.constant:
+            return
+        entry.outputs[mode] = text
+        added = sys.getsizeof(text)
+        entry.size += added
+        self.bytes += added
+        self._evict()
+
+    def cached_output(self, entry, mode):
+        if not self.cache_results:
+            return None
+        text = entry.outputs.get(mode)
+        if text is not None:
+            self.result_hits += 1
+        return text
+
+    def _evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, entry = self.entries.popitem(last=False)
+            self.bytes -= entry.size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'result_hits': self.result_hits,
+            'evictions': self.evictions,
+        }
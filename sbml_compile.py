@@ -0,0 +1,519 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Compiles a parsed SBML tree into nested Python closures. Every operator and
+# its type-check path is picked once here, so running the result skips the
+# per-node dispatch that eval() repeats on every call. The closures raise the
+# same exceptions as eval() for every case. Where the types of a node's
+# operands are proven, its closure skips the type checks altogether.
+
+from functools import partial
+
+import sbml_limits
+from sbml_values import SbmlList, Rope, STRINGS, join_strings, join_string_chain, concat_chain, ListStorage, ArrayList, ArrayStorage, make_list, to_array
+from sbml_types import BOOL, LIST, STRING, TUPLE, NUMBERS, INTEGERS, unchecked_op
+from sbml_ast import (
+    SemanticError, UNSET, format_value, add_chain,
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    SumNode, LogicChainNode, UnaryOpNode, IndexNode, TupleIndexNode,
+    VariableNode, ProgramNode, BlockNode, PrintNode,
+    AssignNode, IndexAssignNode, IfNode, WhileNode
+)
+
+#------------ Operator Section------------
+
+NUM = (int, float)
+
+def op_add(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val + right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return join_strings(left_val, right_val)
+    if isinstance(left_val, SbmlList) and isinstance(right_val, SbmlList):
+        return left_val.concat(right_val)
+    raise SyntaxError("Operands of + must both be numbers")
+
+def op_sub(left_val, right_val):
+    if not (isinstance(left_val, NUM) and isinstance(right_val, NUM)):
+        raise TypeError("Operands of '-' must be numbers.")
+    return left_val - right_val
+
+def op_mul(left_val, right_val):
+    if not (isinstance(left_val, NUM) and isinstance(right_val, NUM)):
+        raise TypeError("Operands of '*' must be numbers.")
+    return left_val * right_val
+
+def op_truediv(left_val, right_val):
+    if not (isinstance(left_val, NUM) and isinstance(right_val, NUM)):
+        raise TypeError("Operands of '/' must be numbers.")
+    if right_val == 0:
+        raise ZeroDivisionError("Division by zero in SBML expression.")
+    return left_val / right_val
+
+def op_div(left_val, right_val):
+    if not (isinstance(left_val, int) and isinstance(right_val, int)):
+        raise TypeError("Operands of 'div' must be integers.")
+    if right_val == 0:
+        raise ZeroDivisionError("Division by zero in SBML expression.")
+    return left_val // right_val
+
+def op_mod(left_val, right_val):
+    if not (isinstance(left_val, int) and isinstance(right_val, int)):
+        raise TypeError("Operands of 'mod' must be numbers.")
+    return left_val % right_val
+
+def op_pow(left_val, right_val):
+    if not (isinstance(left_val, NUM) and isinstance(right_val, NUM)):
+        raise TypeError("Operands of '**' must be numbers.")
+    return left_val ** right_val
+
+def op_lt(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val < right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val < right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_le(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val <= right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val <= right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_eq(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val == right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val == right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_ne(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val != right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val != right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_ge(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val >= right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val >= right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_gt(left_val, right_val):
+    if isinstance(left_val, NUM) and isinstance(right_val, NUM):
+        return left_val > right_val
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        return left_val > right_val
+    raise SemanticError("Invalid Types for comparison.")
+
+def op_cons(left_val, right_val):
+    if not isinstance(right_val, SbmlList):
+        raise TypeError("Right side of :: must be a list.")
+    return right_val.cons(left_val)
+
+def op_in(left_val, right_val):
+    if not isinstance(right_val, (SbmlList, str, Rope)):
+        raise TypeError("Right side of in must be a list or str")
+    if type(left_val) is Rope:
+        left_val = str(left_val)
+    return left_val in right_val
+
+BINARY_OPS = {
+    '+': op_add, '-': op_sub, '*': op_mul, '/': op_truediv,
+    'div': op_div, 'mod': op_mod, '**': op_pow,
+    '<': op_lt, '<=': op_le, '==': op_eq, '!=': op_ne, '<>': op_ne,
+    '>=': op_ge, '>': op_gt,
+    '::': op_cons, 'in': op_in,
+}
+
+#------------ Compiler Section------------
+
+def _proven(types, node):
+    return None if types is None else types.get(node)
+
+def compile_node(node, env=None, types=None):
+    # env is the Environment the closures read variables from and print to.
+    # types is the TypeInfo from sbml_types.infer_types for the tree, if any;
+    # nodes whose operand types it proves get closures without type checks.
+    compiler = _COMPILERS.get(type(node))
+    if compiler is None:
+        return partial(node.eval, env)
+    return compiler(node, env, types)
+
+def _compile_literal(node, env, types):
+    value = node.value
+    return lambda: value
+
+def _compile_list(node, env, types):
+    if all(type(elem) in _LITERALS for elem in node.elements):
+        # Every run gets the same window on one storage marked shared, so a
+        # write copies first and the literal itself never changes.
+        values = [elem.value for elem in node.elements]
+        size = len(values)
+        array = to_array(values)
+        if array is not None:
+            array_store = ArrayStorage(array, True)
+            return lambda: ArrayList.view(array_store, 0, size)
+        store = ListStorage([], values, True)
+        return lambda: SbmlList.view(store, 0, size)
+    items = [compile_node(elem, env, types) for elem in node.elements]
+    return lambda: make_list([item() for item in items])
+
+def _compile_tuple(node, env, types):
+    if all(type(elem) in _LITERALS for elem in node.elements):
+        values = tuple(elem.value for elem in node.elements)
+        return lambda: values
+    items = []
+    for elem in node.elements:
+        if hasattr(elem, 'eval'):
+            items.append(compile_node(elem, env, types))
+        else:
+            items.append(lambda elem=elem: elem)
+    return lambda: tuple([item() for item in items])
+
+def _compile_andalso(left, right):
+    def run():
+        left_val = left()
+        if not isinstance(left_val, bool):
+            raise SyntaxError("Operands or andalso must be booleans")
+        if not left_val:
+            return False
+        right_val = right()
+        if not isinstance(right_val, bool):
+            raise SyntaxError("Operands or andalso must be booleans")
+        return right_val
+    return run
+
+def _compile_orelse(left, right):
+    def run():
+        left_val = left()
+        if not isinstance(left_val, bool):
+            raise SyntaxError("Operands or orelse must be booleans")
+        if not left_val:
+            return False
+        right_val = right()
+        if not isinstance(right_val, bool):
+            raise SyntaxError("Operands or orelse must be booleans")
+        return True
+    return run
+
+def _compile_binop(node, env, types):
+    left = compile_node(node.left, env, types)
+    right = compile_node(node.right, env, types)
+    op = '!=' if node.op in ('<>', '!=') else node.op
+
+    left_type = _proven(types, node.left)
+    right_type = _proven(types, node.right)
+
+    if op in ('andalso', 'orelse') and left_type == right_type == BOOL:
+        if op == 'andalso':
+            return lambda: left() and right()
+        def run():
+            if left():
+                right()
+                return True
+            return False
+        return run
+    if op == 'andalso':
+        return _compile_andalso(left, right)
+    if op == 'orelse':
+        return _compile_orelse(left, right)
+
+    op_fn = unchecked_op(op, left_type, right_type) or BINARY_OPS.get(op)
+    if op_fn is not None:
+        op_fn = sbml_limits.wrap_op(op, op_fn)
+    if op_fn is None:
+        def unknown():
+            left()
+            right()
+            raise ValueError(f"Unknown operator: {op}")
+        return unknown
+
+    if type(node.right) in _LITERALS:
+        right_val = node.right.value
+        return lambda: op_fn(left(), right_val)
+    if type(node.left) in _LITERALS:
+        left_val = node.left.value
+        return lambda: op_fn(left_val, right())
+    return lambda: op_fn(left(), right())
+
+def _compile_sum(node, env, types):
+    items = [compile_node(operand, env, types) for operand in node.operands]
+    first, rest = items[0], items[1:]
+    kinds = {_proven(types, operand) for operand in node.operands}
+
+    if sbml_limits.active is not None:
+        # One + at a time, so each result is checked as the nested nodes'.
+        add = sbml_limits.wrap_op('+', op_add)
+        def limited():
+            total = first()
+            for item in rest:
+                total = add(total, item())
+            return total
+        return limited
+    if kinds <= set(NUMBERS):
+        def numbers():
+            total = first()
+            for item in rest:
+                total = total + item()
+            return total
+        return numbers
+    if kinds == {STRING}:
+        return lambda: join_string_chain([item() for item in items])
+    if kinds == {LIST}:
+        return lambda: concat_chain([item() for item in items])
+    return lambda: add_chain(item() for item in items)
+
+def _compile_logic_chain(node, env, types):
+    items = [compile_node(operand, env, types) for operand in node.operands]
+    first, rest = items[0], items[1:]
+    proven = all(_proven(types, operand) == BOOL for operand in node.operands)
+
+    if node.op == 'andalso' and proven:
+        def all_true():
+            for item in items:
+                if not item():
+                    return False
+            return True
+        return all_true
+    if proven:
+        def first_true():
+            if not first():
+                return False
+            for item in rest:
+                item()
+            return True
+        return first_true
+    return partial(_run_logic_chain, node.op, first, rest)
+
+def _run_logic_chain(op, first, rest):
+    # LogicChainNode.eval over compiled operands.
+    message = f"Operands or {op} must be booleans"
+    value = first()
+    if not isinstance(value, bool):
+        raise SyntaxError(message)
+    if not value:
+        return False
+    for item in rest:
+        value = item()
+        if not isinstance(value, bool):
+            raise SyntaxError(message)
+        if not value and op == 'andalso':
+            return False
+    return True
+
+def _compile_unary(node, env, types):
+    expr = compile_node(node.expr, env, types)
+    op = node.op
+
+    if op == '-':
+        return lambda: -expr()
+    if op == '+':
+        return lambda: +expr()
+    if op == 'not' and _proven(types, node.expr) == BOOL:
+        return lambda: not expr()
+    if op == 'not':
+        def run():
+            value = expr()
+            if not isinstance(value, bool):
+                raise TypeError("Operand of 'not' must be boolean")
+            return not value
+        return run
+
+    def unknown():
+        expr()
+        raise ValueError(f"Unknown unary op: {op}")
+    return unknown
+
+def _compile_index(node, env, types):
+    collection = compile_node(node.collection, env, types)
+    index = compile_node(node.index, env, types)
+
+    if _proven(types, node.collection) in (LIST, STRING) and _proven(types, node.index) in INTEGERS:
+        def checked_bounds():
+            collection_value = collection()
+            index_value = index()
+            if index_value < 0 or index_value >= len(collection_value):
+                raise IndexError("Index out of bounds")
+            return collection_value[index_value]
+        return checked_bounds
+
+    def run():
+        collection_value = collection()
+        index_value = index()
+
+        if not isinstance(index_value, int):
+            raise TypeError("Index must be an integer.")
+        if not isinstance(collection_value, (SbmlList, str, Rope)):
+            raise TypeError("Can only index lists or strings.")
+        if index_value < 0 or index_value >= len(collection_value):
+            raise IndexError("Index out of bounds")
+        return collection_value[index_value]
+    return run
+
+def _compile_tuple_index(node, env, types):
+    index = compile_node(node.index, env, types)
+    tuple_expr = compile_node(node.tuple_expr, env, types)
+
+    if _proven(types, node.tuple_expr) == TUPLE and _proven(types, node.index) in INTEGERS:
+        def checked_bounds():
+            index_val = index()
+            tuple_val = tuple_expr()
+            if index_val < 1 or index_val > len(tuple_val):
+                raise IndexError("Tuple index out of bounds")
+            return tuple_val[index_val - 1]
+        return checked_bounds
+
+    def run():
+        index_val = index()
+        tuple_val = tuple_expr()
+
+        if not isinstance(index_val, int):
+            raise TypeError("Tuple index must be an integer")
+        if not isinstance(tuple_val, tuple):
+            raise TypeError("Operand being indexed must be a tuple")
+        if index_val < 1 or index_val > len(tuple_val):
+            raise IndexError("Tuple index out of bounds")
+        return tuple_val[index_val - 1]
+    return run
+
+#------------ Statement Section------------
+
+# Statements compile against one Environment: variables become reads and
+# writes of a fixed index in env.slots, and print appends to env.out.
+
+def _compile_variable(node, env, types):
+    if env is None:
+        return partial(node.eval, env)
+    slots = env.slots
+    slot = node.slot
+    name = node.name
+
+    def run():
+        value = slots[slot]
+        if value is UNSET:
+            raise NameError(f"Variable '{name}' is not defined")
+        return value
+    return run
+
+def _compile_program(node, env, types):
+    return compile_node(node.block, env, types)
+
+def _compile_block(node, env, types):
+    statements = [compile_node(statement, env, types) for statement in node.statements]
+    if len(statements) == 1:
+        return statements[0]
+
+    def run():
+        for statement in statements:
+            statement()
+    return run
+
+def _compile_print(node, env, types):
+    expr = compile_node(node.expr, env, types)
+    write = env.out.append
+    return lambda: write(format_value(expr()) + "\n")
+
+def _compile_assign(node, env, types):
+    expr = compile_node(node.expr, env, types)
+    slots = env.slots
+    slot = node.slot
+
+    def run():
+        slots[slot] = expr()
+    return run
+
+def _compile_index_assign(node, env, types):
+    collection = compile_node(node.collection, env, types)
+    index = compile_node(node.index, env, types)
+    expr = compile_node(node.expr, env, types)
+
+    if _proven(types, node.collection) == LIST and _proven(types, node.index) in INTEGERS:
+        def checked_bounds():
+            collection_value = collection()
+            index_value = index()
+            value = expr()
+            if index_value < 0 or index_value >= len(collection_value):
+                raise IndexError("Index out of bounds")
+            collection_value[index_value] = value
+        return checked_bounds
+
+    def run():
+        collection_value = collection()
+        index_value = index()
+        value = expr()
+
+        if not isinstance(index_value, int):
+            raise TypeError("Index must be an integer.")
+        if not isinstance(collection_value, SbmlList):
+            raise TypeError("Can only assign into lists.")
+        if index_value < 0 or index_value >= len(collection_value):
+            raise IndexError("Index out of bounds")
+        collection_value[index_value] = value
+    return run
+
+def _compile_if(node, env, types):
+    cond = compile_node(node.cond, env, types)
+    then_block = compile_node(node.then_block, env, types)
+    else_block = None if node.else_block is None else compile_node(node.else_block, env, types)
+
+    def run():
+        test = cond()
+        if test is True:
+            then_block()
+        elif test is not False:
+            raise TypeError("Condition of if must be a boolean")
+        elif else_block is not None:
+            else_block()
+    return run
+
+def _compile_while(node, env, types):
+    cond = compile_node(node.cond, env, types)
+    body = compile_node(node.body, env, types)
+    if sbml_limits.active is not None:
+        # Every pass is charged the nodes it could evaluate.
+        cond = sbml_limits.active.charged(cond, sbml_limits.tree_size(node))
+
+    if _proven(types, node.cond) == BOOL:
+        def proven():
+            while cond():
+                body()
+        return proven
+
+    def run():
+        while True:
+            test = cond()
+            if test is not True:
+                if test is False:
+                    return
+                raise TypeError("Condition of while must be a boolean")
+            body()
+    return run
+
+_LITERALS = (NumberNode, BooleanNode, StringNode)
+
+_COMPILERS = {
+    NumberNode: _compile_literal,
+    BooleanNode: _compile_literal,
+    StringNode: _compile_literal,
+    ListNode: _compile_list,
+    TupleNode: _compile_tuple,
+    BinaryOpNode: _compile_binop,
+    SumNode: _compile_sum,
+    LogicChainNode: _compile_logic_chain,
+    UnaryOpNode: _compile_unary,
+    IndexNode: _compile_index,
+    TupleIndexNode: _compile_tuple_index,
+    VariableNode: _compile_variable,
+    ProgramNode: _compile_program,
+    BlockNode: _compile_block,
+    PrintNode: _compile_print,
+    AssignNode: _compile_assign,
+    IndexAssignNode: _compile_index_assign,
+    IfNode: _compile_if,
+    WhileNode: _compile_while,
+}
@@ -0,0 +1,252 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# AST output. ast_text() gives exactly the -P text of print_ast, and
+# ast_json() gives the same tree as one line of JSON for -J:
+#
+#   {"type":"BinaryOpNode","op":"+","children":[{"type":"NumberNode","value":1},...]}
+#
+# Leaves have no "children" key. Nodes with a name (variables and
+# assignments) carry it as "name"; syntax errors come out as {"error": text}.
+# JSON has no infinities or NaN, so a float value like 1e999 comes out as
+# {"float":"inf"} ("-inf", "nan"), which strict readers accept.
+#
+# Both work from a layout per node class, made once from its dataclass
+# fields: the header line, whether it shows a value or operator, and which
+# fields can hold child nodes. Emitting a node is then a dict lookup and a
+# few appends to one buffer, which is joined once per tree. Both use an
+# explicit stack, so trees of any depth print.
+
+import json
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, List
+
+from sbml_ast import Node
+
+# json.dumps of a str, without json.dumps' per-call setup.
+_encode_string = json.encoder.encode_basestring_ascii
+
+# Indents cached for the usual depths; deeper lines build their own.
+_PADS = ["  " * depth for depth in range(64)]
+
+
+class _Layout:
+    __slots__ = ('header', 'value', 'op', 'name', 'children', 'json_head')
+
+    def __init__(self, cls):
+        names = [field.name for field in fields(cls)]
+        self.header = f"Node Type: {cls.__name__}\n"
+        self.value = 'value' in names
+        self.op = 'op' in names
+        self.name = 'name' in names
+        self.json_head = '{"type":' + json.dumps(cls.__name__)
+        self.children = _reversed_children(cls)
+
+
+def _reversed_children(cls):
+    # A function giving the values of the fields of cls that can hold nodes,
+    # last field first (the order they go on a stack), or None if there are
+    # none. The values may include None and other non-nodes.
+    single = [field.name for field in fields(cls) if field.type is Any]
+    many = [field.name for field in fields(cls) if field.type == List[Any]]
+    if not single and not many:
+        return None
+    if not many:
+        get = attrgetter(*reversed(single))
+        if len(single) == 1:
+            return lambda node: (get(node),)
+        return get
+    node_fields = [(field.name, field.type == List[Any]) for field in fields(cls)
+                   if field.type in (Any, List[Any])]
+
+    def children(node):
+        found = []
+        for name, is_list in node_fields:
+            value = getattr(node, name)
+            if is_list:
+                found.extend(value)
+            else:
+                found.append(value)
+        found.reverse()
+        return found
+    return children
+
+
+_LAYOUTS = {}
+
+
+def _layout(cls):
+    layout = _LAYOUTS.get(cls)
+    if layout is None:
+        layout = _LAYOUTS[cls] = _Layout(cls)
+    return layout
+
+
+#------------ Text Section------------
+
+def emit_text(node, out, indent=0):
+    # Appends the print_ast lines for node to the list out.
+    append = out.append
+    pads = _PADS
+    stack = [node]
+    depths = [indent]
+    pop, push = stack.pop, stack.append
+    pop_depth, push_depth = depths.pop, depths.append
+    while stack:
+        node = pop()
+        depth = pop_depth()
+        layout = _LAYOUTS.get(type(node)) or _layout(type(node))
+        pad = pads[depth] if depth < 64 else "  " * depth
+        append(pad + layout.header)
+        if layout.value:
+            append(f"{pad}  Value: {node.value}\n")
+        if layout.op:
+            append(f"{pad}  Operator: {node.op}\n")
+        if layout.children is not None:
+            depth += 1
+            for child in layout.children(node):
+                if isinstance(child, Node):
+                    push(child)
+                    push_depth(depth)
+
+
+def ast_text(node, indent=0):
+    # What print_ast(node, indent) prints.
+    out = []
+    emit_text(node, out, indent)
+    return "".join(out)
+
+#------------ JSON Section------------
+
+def _json_value(value):
+    # The value of a literal node as it goes into JSON.
+    if type(value) is float and value - value != 0:
+        return {'float': repr(value)}
+    return value
+
+
+def _json_scalar(value):
+    # json.dumps(_json_value(value)), faster for the usual values.
+    kind = type(value)
+    if kind is str:
+        return _encode_string(value)
+    if kind is bool:
+        return "true" if value else "false"
+    if kind is int or (kind is float and value - value == 0):
+        return repr(value)
+    return json.dumps(_json_value(value), allow_nan=False, separators=(',', ':'))
+
+
+def emit_json(node, out):
+    # Appends node as one JSON object, without a newline, to the list out.
+    # Strings on the stack are closing brackets and commas still to write.
+    append = out.append
+    encode = _encode_string
+    stack = [node]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node = pop()
+        if type(node) is str:
+            append(node)
+            continue
+        layout = _LAYOUTS.get(type(node)) or _layout(type(node))
+        append(layout.json_head)
+        if layout.value:
+            append(',"value":' + _json_scalar(node.value))
+        if layout.op:
+            append(',"op":' + encode(node.op))
+        if layout.name:
+            append(',"name":' + encode(node.name))
+        children = ()
+        if layout.children is not None:
+            children = [child for child in layout.children(node) if isinstance(child, Node)]
+        if not children:
+            append('}')
+            continue
+        append(',"children":[')
+        push(']}')
+        push(children[0])
+        for child in children[1:]:
+            push(',')
+            push(child)
+
+
+def ast_json(node):
+    out = []
+    emit_json(node, out)
+    return "".join(out)
+
+
+def error_json(text):
+    # A syntax error's text as a -J line.
+    return json.dumps({'error': text.rstrip("\n")}) + "\n"
+
+#------------ Check------------
+
+def check(count=20000, seed=0):
+    # Compares ast_text with the old line-by-line printer and ast_json with
+    # a json.dumps of the same tree, over random expressions and programs.
+    import random
+    from sbml_ast import child_nodes
+    from sbml_iterative import ast_lines
+    from sbml_main import Interpreter
+
+    def as_dict(node):
+        layout = _layout(type(node))
+        found = {'type': type(node).__name__}
+        if layout.value:
+            found['value'] = _json_value(node.value)
+        if layout.op:
+            found['op'] = node.op
+        if layout.name:
+            found['name'] = node.name
+        children = [as_dict(child) for child in child_nodes(node)]
+        if children:
+            found['children'] = children
+        return found
+
+    rng = random.Random(seed)
+    session = Interpreter()
+    leaves = ['1', '2.5', 'True', '"a b"', "'q'", '[]', '(1, 2)', 'x', '[1, [2, "c"]]', '1e999']
+    operators = ['+', '-', '*', '/', 'div', 'mod', '**', '<', '==', '<>', '::', 'in',
+                 'andalso', 'orelse']
+
+    def expression(depth):
+        roll = rng.random()
+        if depth == 0 or roll < 0.25:
+            return rng.choice(leaves)
+        if roll < 0.35:
+            return f"{rng.choice(['-', 'not '])}({expression(depth - 1)})"
+        if roll < 0.45:
+            return f"({expression(depth - 1)})[{expression(depth - 1)}]"
+        if roll < 0.5:
+            return f"#1({expression(depth - 1)})"
+        return f"({expression(depth - 1)} {rng.choice(operators)} {expression(depth - 1)})"
+
+    def strict(name):
+        raise ValueError(f"{name} is not JSON")
+
+    mismatches = 0
+    for _ in range(count):
+        if rng.random() < 0.8:
+            line = expression(5)
+        else:
+            line = (f"{{ x = {expression(2)}; if ({expression(1)}) {{ print(x); }} else "
+                    f"{{ x[0] = {expression(1)}; }} while ({expression(1)}) {{ y = x; }} }}")
+        tree, _ = session.parse(line)
+        if tree is None:
+            continue
+        expected = "\n".join(ast_lines(tree)) + "\n"
+        found_json = json.loads(ast_json(tree), parse_constant=strict)
+        if ast_text(tree) != expected or found_json != json.loads(json.dumps(as_dict(tree))):
+            mismatches += 1
+            if mismatches <= 5:
+                print(line)
+    print(f"{count} trees, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,213 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Flattens chains of one associative operator before a tree is compiled.
+# The parser makes + , andalso and orelse left-associative, so
+# a + b + c + d is ((a + b) + c) + d: N levels deep, run with N calls and
+# N - 1 intermediate results. Here it becomes SumNode([a, b, c, d]), and
+# andalso and orelse chains become a LogicChainNode. The flat nodes take
+# their operands left to right and combine them in the nested tree's
+# order, so every result is the same; see add_chain and LogicChainNode.
+#
+# Only left-nested chains are flattened. a + (b + c) keeps the grouping
+# its parentheses gave it, since float addition is not associative.
+#
+# The pass is for evaluation only: -P and -J print the parsed tree. The
+# input tree is never modified; parents of flattened chains are new nodes
+# and everything else is shared. A chain is walked with a loop, so one of
+# any length flattens, and compiles, without deep recursion.
+
+from dataclasses import fields
+from typing import Any, List
+
+from sbml_ast import (
+    Node, NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    SumNode, LogicChainNode, UnaryOpNode,
+    IndexNode, TupleIndexNode, VariableNode
+)
+
+_CHAIN_OPS = ('+', 'andalso', 'orelse')
+
+
+def flatten_chains(node):
+    flattener = _FLATTENERS.get(type(node))
+    if flattener is not None:
+        return flattener(node)
+    names = _CHILD_FIELDS.get(type(node))
+    if names is None:
+        names = _child_fields(type(node))
+    if not names:
+        return node
+    return _rebuild(node, names)
+
+
+def _flatten_binop(node):
+    op = node.op
+    if op in _CHAIN_OPS and type(node.left) is BinaryOpNode and node.left.op == op:
+        return _flatten_chain(node)
+    left = flatten_chains(node.left)
+    right = flatten_chains(node.right)
+    if left is node.left and right is node.right:
+        return node
+    return BinaryOpNode(op, left, right)
+
+
+def _flatten_chain(node):
+    op = node.op
+    rights = []
+    while type(node) is BinaryOpNode and node.op == op:
+        rights.append(node.right)
+        node = node.left
+    operands = [flatten_chains(node)]
+    operands.extend(flatten_chains(right) for right in reversed(rights))
+    if op == '+':
+        return SumNode(operands)
+    return LogicChainNode(op, operands)
+
+
+def _flatten_unary(node):
+    expr = flatten_chains(node.expr)
+    return node if expr is node.expr else UnaryOpNode(node.op, expr)
+
+
+def _flatten_index(node):
+    collection = flatten_chains(node.collection)
+    index = flatten_chains(node.index)
+    if collection is node.collection and index is node.index:
+        return node
+    return IndexNode(collection, index)
+
+
+def _flatten_tuple_index(node):
+    index = flatten_chains(node.index)
+    tuple_expr = flatten_chains(node.tuple_expr)
+    if index is node.index and tuple_expr is node.tuple_expr:
+        return node
+    return TupleIndexNode(index, tuple_expr)
+
+
+def _flatten_sequence(node):
+    elements = [flatten_chains(elem) for elem in node.elements]
+    if all(new is old for new, old in zip(elements, node.elements)):
+        return node
+    return type(node)(elements)
+
+
+def _unchanged(node):
+    return node
+
+
+_FLATTENERS = {
+    NumberNode: _unchanged,
+    BooleanNode: _unchanged,
+    StringNode: _unchanged,
+    VariableNode: _unchanged,
+    ListNode: _flatten_sequence,
+    TupleNode: _flatten_sequence,
+    BinaryOpNode: _flatten_binop,
+    UnaryOpNode: _flatten_unary,
+    IndexNode: _flatten_index,
+    TupleIndexNode: _flatten_tuple_index,
+}
+
+#------------ Statement Section------------
+
+# Statements are rebuilt from their dataclass fields. These are the names
+# of the fields of each class that can hold nodes.
+_CHILD_FIELDS = {}
+
+
+def _child_fields(kind):
+    names = ()
+    if issubclass(kind, Node):
+        names = tuple(field.name for field in fields(kind) if field.type in (Any, List[Any]))
+    _CHILD_FIELDS[kind] = names
+    return names
+
+
+def _rebuild(node, names):
+    # node with the chains under it flattened, or node itself if there are
+    # none.
+    changed = {}
+    for name in names:
+        value = getattr(node, name)
+        if isinstance(value, list):
+            new = [flatten_chains(elem) for elem in value]
+            if any(a is not b for a, b in zip(new, value)):
+                changed[name] = new
+        else:
+            new = flatten_chains(value)
+            if new is not value:
+                changed[name] = new
+    if not changed:
+        return node
+    return type(node)(*[changed.get(field.name, getattr(node, field.name))
+                        for field in fields(node)])
+
+#------------ Check------------
+
+def check(count=20000, seed=0):
+    # Runs random expressions and programs full of chains compiled both
+    # with and without flattening, and compares what they print.
+    import random
+    from sbml_main import Interpreter, parse_line, run_program, run_tree
+    from sbml_compile import compile_node
+    from sbml_types import infer_types
+    from sbml_ast import ProgramNode, format_value
+
+    rng = random.Random(seed)
+    session = Interpreter()
+    leaves = ['1', '2', '-3', '2.5', '0.1', '-0.0', '10000000000000000000000', 'True', 'False',
+              '"ab"', "'c'", '[]', '[1, 2.5]', '(1, 2)', '(1 div 0)', '1e308']
+    operators = ['+', '+', '+', 'andalso', 'orelse', '-', '<']
+
+    def expression(depth):
+        if depth == 0 or rng.random() < 0.2:
+            return rng.choice(leaves)
+        op = rng.choice(operators)
+        terms = [expression(depth - 1) for _ in range(rng.randrange(2, 6))]
+        return "(" + f" {op} ".join(terms) + ")"
+
+    def evaluate(tree, flat):
+        try:
+            if flat:
+                tree = flatten_chains(tree)
+            return format_value(compile_node(tree, None, infer_types(tree))()) + "\n"
+        except Exception:
+            return "SEMANTIC ERROR\n"
+
+    mismatches = 0
+    for _ in range(count):
+        if rng.random() < 0.8:
+            tree, _ = parse_line(expression(3))
+            if tree is None:
+                continue
+            expected = evaluate(tree, False)
+            found = evaluate(tree, True)
+        else:
+            line = (f"{{ s = {expression(1)}; i = 0; while (i < 3) {{ s = s + {expression(1)} + s; "
+                    f"i = i + 1; }} print(s); print({expression(2)}); }}")
+            tree, _ = parse_line(line)
+            if type(tree) is not ProgramNode:
+                continue
+            expected = run_program(tree, walk=True)
+            found = run_program(tree)
+        if found != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(found, expected)
+    print(f"{count} trees, {mismatches} mismatches")
+
+    # A chain too long for the recursive compiler, and the parsed tree
+    # still printing as nested BinaryOpNodes.
+    long_sum = " + ".join(str(i % 7) + (".5" if i % 1000 == 0 else "") for i in range(20000))
+    ok = session.execute(long_sum) == f"{sum(i % 7 for i in range(20000)) + 10.0}\n"
+    tree, _ = parse_line("1 + 2 + 3")
+    ok = ok and run_tree(tree, "-P").count("BinaryOpNode") == 2
+    return mismatches == 0 and ok
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,291 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Explicit-stack versions of eval(), __str__ and print_ast. They give the same
+# results as the recursive versions but never grow the Python call stack, so
+# machine-generated trees nested hundreds of thousands of levels deep work.
+# Memory is proportional to the depth of the tree.
+
+import sbml_limits
+from sbml_ast import (
+    child_nodes,
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    UnaryOpNode, IndexNode, TupleIndexNode
+)
+from sbml_compile import BINARY_OPS
+from sbml_values import SbmlList, Rope, make_list
+
+_LITERALS = (NumberNode, BooleanNode, StringNode)
+
+# Work items on the evaluator stack. Each one is a (tag, payload) pair.
+_VISIT = 0
+_CONST = 1
+_BUILD_LIST = 2
+_BUILD_TUPLE = 3
+_APPLY = 4
+_CONS_CHAIN = 5
+_AND_LEFT = 6
+_AND_RIGHT = 7
+_OR_LEFT = 8
+_OR_RIGHT = 9
+_UNARY = 10
+_INDEX = 11
+_TUPLE_INDEX = 12
+_UNKNOWN_OP = 13
+
+#------------ Evaluator Section------------
+
+def eval_iterative(node, env=None):
+    values = []
+    todo = [(_VISIT, node)]
+    push = todo.append
+    limits = sbml_limits.active
+
+    while todo:
+        tag, item = todo.pop()
+
+        if tag == _VISIT:
+            if limits is not None:
+                limits.charge(1)
+            kind = type(item)
+            if kind in _LITERALS:
+                values.append(item.value)
+            elif kind is BinaryOpNode:
+                _visit_binop(item, push)
+            elif kind is ListNode:
+                push((_BUILD_LIST, len(item.elements)))
+                for elem in reversed(item.elements):
+                    push((_VISIT, elem))
+            elif kind is TupleNode:
+                push((_BUILD_TUPLE, len(item.elements)))
+                for elem in reversed(item.elements):
+                    push((_VISIT, elem) if hasattr(elem, 'eval') else (_CONST, elem))
+            elif kind is UnaryOpNode:
+                push((_UNARY, item.op))
+                push((_VISIT, item.expr))
+            elif kind is IndexNode:
+                push((_INDEX, None))
+                push((_VISIT, item.index))
+                push((_VISIT, item.collection))
+            elif kind is TupleIndexNode:
+                push((_TUPLE_INDEX, None))
+                push((_VISIT, item.tuple_expr))
+                push((_VISIT, item.index))
+            else:
+                values.append(item.eval(env))
+
+        elif tag == _APPLY:
+            right_val = values.pop()
+            values[-1] = item(values[-1], right_val)
+
+        elif tag == _CONS_CHAIN:
+            result = values.pop()
+            if not isinstance(result, SbmlList):
+                raise TypeError("Right side of :: must be a list.")
+            if limits is not None:
+                limits.check_length(len(result) + item)
+            for _ in range(item):
+                result = result.cons(values.pop())
+            values.append(result)
+
+        elif tag == _CONST:
+            values.append(item)
+
+        elif tag == _BUILD_LIST:
+            start = len(values) - item
+            result = values[start:]
+            del values[start:]
+            values.append(make_list(result))
+
+        elif tag == _BUILD_TUPLE:
+            start = len(values) - item
+            result = tuple(values[start:])
+            del values[start:]
+            values.append(result)
+
+        elif tag == _AND_LEFT:
+            left_val = values[-1]
+            if not isinstance(left_val, bool):
+                raise SyntaxError("Operands or andalso must be booleans")
+            if left_val:
+                values.pop()
+                push((_AND_RIGHT, None))
+                push((_VISIT, item))
+
+        elif tag == _AND_RIGHT:
+            if not isinstance(values[-1], bool):
+                raise SyntaxError("Operands or andalso must be booleans")
+
+        elif tag == _OR_LEFT:
+            left_val = values[-1]
+            if not isinstance(left_val, bool):
+                raise SyntaxError("Operands or orelse must be booleans")
+            if left_val:
+                values.pop()
+                push((_OR_RIGHT, None))
+                push((_VISIT, item))
+
+        elif tag == _OR_RIGHT:
+            if not isinstance(values[-1], bool):
+                raise SyntaxError("Operands or orelse must be booleans")
+            values[-1] = True
+
+        elif tag == _UNARY:
+            value = values[-1]
+            if item == '-':
+                values[-1] = -value
+            elif item == '+':
+                values[-1] = +value
+            elif item == 'not':
+                if not isinstance(value, bool):
+                    raise TypeError("Operand of 'not' must be boolean")
+                values[-1] = not value
+            else:
+                raise ValueError(f"Unknown unary op: {item}")
+
+        elif tag == _INDEX:
+            index_value = values.pop()
+            collection_value = values[-1]
+            if not isinstance(index_value, int):
+                raise TypeError("Index must be an integer.")
+            if not isinstance(collection_value, (SbmlList, str, Rope)):
+                raise TypeError("Can only index lists or strings.")
+            if index_value < 0 or index_value >= len(collection_value):
+                raise IndexError("Index out of bounds")
+            values[-1] = collection_value[index_value]
+
+        elif tag == _TUPLE_INDEX:
+            tuple_val = values.pop()
+            index_val = values[-1]
+            if not isinstance(index_val, int):
+                raise TypeError("Tuple index must be an integer")
+            if not isinstance(tuple_val, tuple):
+                raise TypeError("Operand being indexed must be a tuple")
+            if index_val < 1 or index_val > len(tuple_val):
+                raise IndexError("Tuple index out of bounds")
+            values[-1] = tuple_val[index_val - 1]
+
+        elif tag == _UNKNOWN_OP:
+            values.pop()
+            values.pop()
+            raise ValueError(f"Unknown operator: {item}")
+
+    return values.pop()
+
+
+def _visit_binop(node, push):
+    op = '!=' if node.op in ('<>', '!=') else node.op
+
+    if op == 'andalso':
+        push((_AND_LEFT, node.right))
+        push((_VISIT, node.left))
+        return
+    if op == 'orelse':
+        push((_OR_LEFT, node.right))
+        push((_VISIT, node.left))
+        return
+
+    if op == '::':
+        # a :: b :: ... :: rest evaluates every head left to right, then
+        # rest, then conses from the inside out. Doing it as one step gives
+        # the same result and the same first error without the quadratic
+        # copying of one cons at a time.
+        heads = []
+        while type(node) is BinaryOpNode and node.op == '::':
+            heads.append(node.left)
+            node = node.right
+        push((_CONS_CHAIN, len(heads)))
+        push((_VISIT, node))
+        for head in reversed(heads):
+            push((_VISIT, head))
+        return
+
+    op_fn = BINARY_OPS.get(op)
+    if op_fn is None:
+        push((_UNKNOWN_OP, op))
+    else:
+        push((_APPLY, sbml_limits.wrap_op(op, op_fn)))
+    push((_VISIT, node.right))
+    push((_VISIT, node.left))
+
+#------------ Printer Section------------
+
+def value_str(value):
+    # Same text as str() on an evaluated value, for lists and tuples nested
+    # too deeply for the built-in repr.
+    out = []
+    todo = [(False, value)]
+    while todo:
+        raw, item = todo.pop()
+        if raw:
+            out.append(item)
+            continue
+        kind = type(item)
+        if kind is SbmlList or kind is tuple:
+            parts = [(True, "[" if kind is SbmlList else "(")]
+            for i, elem in enumerate(item):
+                if i:
+                    parts.append((True, ", "))
+                parts.append((False, elem))
+            if kind is tuple and len(item) == 1:
+                parts.append((True, ","))
+            parts.append((True, "]" if kind is SbmlList else ")"))
+            todo.extend(reversed(parts))
+        else:
+            out.append(repr(item))
+    return "".join(out)
+
+
+def _str_parts(node):
+    kind = type(node)
+    if kind is NumberNode or kind is BooleanNode or kind is StringNode:
+        return (str(node),)
+    if kind is BinaryOpNode:
+        return ("BinaryOpNode(", node.left, f" {node.op} ", node.right, ")")
+    if kind is ListNode or kind is TupleNode:
+        parts = [f"{kind.__name__}(["]
+        for i, elem in enumerate(node.elements):
+            if i:
+                parts.append(", ")
+            parts.append(elem if hasattr(elem, 'eval') else str(elem))
+        parts.append("])")
+        return parts
+    if kind is UnaryOpNode:
+        return (f"UnaryOpNode({node.op} ", node.expr, ")")
+    if kind is IndexNode:
+        return ("IndexNode(", node.collection, "[", node.index, "])")
+    if kind is TupleIndexNode:
+        return ("TupleIndexNode(#", node.index, "(", node.tuple_expr, "))")
+    return (str(node),)
+
+
+def node_str(node):
+    out = []
+    todo = [node]
+    while todo:
+        item = todo.pop()
+        if isinstance(item, str):
+            out.append(item)
+        else:
+            todo.extend(reversed(_str_parts(item)))
+    return "".join(out)
+
+
+def ast_lines(node):
+    # Yields the lines print_ast would print for node, without newlines.
+    todo = [(node, 0)]
+    while todo:
+        current, indent = todo.pop()
+        pad = "  " * indent
+        yield pad + f"Node Type: {type(current).__name__}"
+
+        if hasattr(current, 'value'):
+            yield pad + f"  Value: {current.value}"
+        if hasattr(current, 'op'):
+            yield pad + f"  Operator: {current.op}"
+
+        children = list(child_nodes(current))
+        for child in reversed(children):
+            todo.append((child, indent + 1))
+
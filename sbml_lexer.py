@@ -0,0 +1,188 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Hand-written single-pass scanner that produces the same token stream as the
+# PLY lexer in sbml_parser.py: same types, values, lineno and lexpos, and the
+# same SyntaxError at the first bad character. PLY tries its rules in a fixed
+# order (function rules in definition order, then string rules longest regex
+# first) and keeps the first alternative that matches, so "index" scans as IN
+# followed by ID("dex"). The scanner keeps that order but folds the rules into
+# a handful of alternatives that each start with a different class of
+# character, and picks the token type with a dict lookup instead of one
+# function call per rule.
+#
+# Run this file to diff the scanner against PLY on lexer_test, test.txt and
+# fuzzed input.
+
+import re
+
+from ply.lex import LexToken
+
+RESERVED = {
+    'print': 'PRINT',
+    'if': 'IF',
+    'else': 'ELSE',
+    'while': 'WHILE',
+}
+
+# Token type for every operator and keyword spelling. Anything else matched
+# by the word alternative is an ID.
+TOKEN_TYPES = {
+    '**': 'POWER', '::': 'CONS', '<=': 'LE', '>=': 'GE', '==': 'EQ',
+    '<>': 'NE', '!=': 'NE',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE',
+    '<': 'LT', '>': 'GT', '=': 'ASSIGN', '#': 'HASH',
+    '(': 'LPAREN', ')': 'RPAREN', '[': 'LBRACKET', ']': 'RBRACKET',
+    '{': 'LBRACE', '}': 'RBRACE', ',': 'COMMA', ';': 'SEMI',
+    'div': 'DIV', 'mod': 'MOD', 'not': 'NOT',
+    'andalso': 'ANDALSO', 'orelse': 'ORELSE', 'in': 'IN',
+    **RESERVED,
+}
+
+_MASTER = re.compile(
+    r"[ \t]*(?:"
+    r"(?P<OP>\*\*|::|<=|>=|==|<>|!=|[-+*/<>=#()\[\]{},;])"
+    r"|(?P<BOOLEAN>True|False)"
+    r"|(?P<WORD>div|mod|not|andalso|orelse|in|[a-zA-Z][a-zA-Z0-9_]*)"
+    r"|(?P<FLOAT>(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+)"
+    r"|(?P<INT>\d+)"
+    r"|(?P<STRING>\"(?:[^\\\"]|\\.)*\"|'(?:[^\\']|\\.)*')"
+    r"|(?P<NEWLINE>\n+)"
+    r"|(?P<ERROR>[^ \t]))"
+)
+
+
+class FastLexer:
+    # With an ErrorCollector a bad character is recorded and skipped instead
+    # of raising SyntaxError.
+
+    def __init__(self, errors=None):
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lineno = 1
+        self.errors = errors
+        self.token = self._done
+
+    @staticmethod
+    def _done():
+        return None
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self.token = self._scan(data).__next__
+
+    def clone(self):
+        return FastLexer(self.errors)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+    def _scan(self, data):
+        types = TOKEN_TYPES
+        for m in _MASTER.finditer(data):
+            kind = m.lastgroup
+            value = m.group(kind)
+            tok = LexToken()
+            if kind == 'OP' or kind == 'WORD':
+                tok.type = types.get(value, 'ID')
+            elif kind == 'INT':
+                tok.type = 'NUMBER'
+                value = int(value)
+            elif kind == 'FLOAT':
+                tok.type = 'NUMBER'
+                value = float(value)
+            elif kind == 'STRING':
+                tok.type = 'STRING'
+                value = value[1:-1]
+            elif kind == 'BOOLEAN':
+                tok.type = 'BOOLEAN'
+                value = value == "True"
+            elif kind == 'NEWLINE':
+                self.lineno += len(value)
+                continue
+            else:
+                # Same as t_error: skip the character and fail the line.
+                self.lexpos = m.end()
+                if self.errors is None:
+                    raise SyntaxError("SYNTAX ERROR")
+                self.errors.add(data, m.start(kind), 'ILLEGAL', value)
+                continue
+            tok.value = value
+            tok.lineno = self.lineno
+            tok.lexpos = m.start(kind)
+            self.lexpos = m.end()
+            yield tok
+        self.lexpos = len(data)
+        # PLY's token() returns None at the end of input, as often as asked.
+        while True:
+            yield None
+
+#------------ Differential check against PLY------------
+
+def token_stream(lexer, data):
+    # Returns [(type, value, lineno, lexpos), ...] and the error, if any.
+    lexer.input(data)
+    lexer.lineno = 1
+    tokens = []
+    try:
+        while True:
+            tok = lexer.token()
+            if not tok:
+                break
+            tokens.append((tok.type, type(tok.value), tok.value, tok.lineno, tok.lexpos))
+    except SyntaxError as e:
+        return tokens, (type(e), str(e), lexer.lexpos)
+    return tokens, None
+
+
+def fuzz_inputs(count, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    pieces = [
+        "1", "42", "3.", ".5", "1e3", "2.5E-4", "7e", "1.2.3", "..", ".",
+        "True", "False", "Truex", "div", "mod", "not", "andalso", "orelse",
+        "in", "index", "division", "modulo", "note", "print", "if", "else",
+        "while", "x", "arr_1", "_", '"a b"', "'c'", '"unterminated', '"e\\"q"',
+        "+", "-", "*", "**", "/", "::", ":", "<", "<=", "<>", "!=", "!", "==",
+        "=", ">=", ">", "#", "(", ")", "[", "]", "{", "}", ",", ";", "$", "@",
+        " ", "  ", "\t", "\n", "\n\n", "\r",
+    ]
+    for _ in range(count):
+        yield "".join(rng.choice(pieces) for _ in range(rng.randrange(1, 20)))
+
+
+def check(paths=("lexer_test", "test.txt"), fuzz=20000):
+    from sbml_parser import lexer as ply_lexer
+
+    inputs = []
+    for path in paths:
+        with open(path) as file:
+            text = file.read()
+        inputs.append(text)
+        inputs.extend(text.splitlines())
+    inputs.extend(fuzz_inputs(fuzz))
+
+    fast = FastLexer()
+    mismatches = 0
+    for data in inputs:
+        expected = token_stream(ply_lexer, data)
+        actual = token_stream(fast, data)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH for {data!r}\n  ply:  {expected}\n  fast: {actual}")
+    print(f"{len(inputs)} inputs, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,315 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Resource limits for untrusted input: python sbml_main.py -E file --limits SPEC
+#
+# SPEC is "default" or comma-separated key=value pairs, for example
+# "bits=100000,length=1000000,steps=5000000,seconds=2"; keys left out keep
+# their defaults. Each line (or block program) gets its own budget:
+#
+#   bits     largest integer result, in bits
+#   length   longest list or string a +, :: or string join may build
+#   steps    node evaluations
+#   seconds  wall-clock time
+#
+# Going over any of them raises LimitError, a SemanticError, so the line
+# prints SEMANTIC ERROR and the next line starts fresh.
+#
+# Sizes are predicted before the work is done where that is possible: the
+# bit length of a ** b and a * b is bounded from below by the operands, and
+# the length of a joined list or string is the sum of the operand lengths,
+# so 2 ** 10 ** 10 fails without computing anything.
+#
+# Without loops a line evaluates each of its nodes at most once, so only
+# while loops can run up steps. Each pass of a compiled loop is charged all
+# the nodes of its condition and body at once, which is one call per pass
+# rather than one per node, and never less than the nodes really
+# evaluated. The explicit-stack evaluator for very deep expressions charges
+# one step per node. The clock is read every CLOCK_STEPS steps or so. None
+# of this costs anything unless use_limits() was called: the checks are put
+# in when a tree is compiled with limits on.
+#
+# The limits themselves are shared, but the budget left for the running
+# line is kept per thread, so sessions on different threads (see
+# thread_interpreter in sbml_main.py) never reset or spend each other's.
+
+import threading
+from time import perf_counter
+
+from sbml_ast import SemanticError, child_nodes
+from sbml_values import SbmlList, STRINGS
+
+DEFAULT_BITS = 100000
+DEFAULT_LENGTH = 10000000
+DEFAULT_STEPS = 10000000
+DEFAULT_SECONDS = 10.0
+
+# Steps between reads of the clock.
+CLOCK_STEPS = 1024
+
+
+class LimitError(SemanticError):
+    pass
+
+
+class Budget(threading.local):
+    # What is left for the line running on this thread. A thread that has
+    # not started a line yet gets the full step budget and no deadline.
+
+    def __init__(self, steps):
+        self.left = steps
+        self.clock_at = steps - CLOCK_STEPS
+        self.deadline = None
+
+
+class Limits:
+
+    def __init__(self, bits=DEFAULT_BITS, length=DEFAULT_LENGTH, steps=DEFAULT_STEPS,
+                 seconds=DEFAULT_SECONDS):
+        self.bits = bits
+        self.length = length
+        self.steps = steps
+        self.seconds = seconds
+        self.budget = Budget(steps)
+
+    def __reduce__(self):
+        # -j and the server hand limits to worker processes; a thread-local
+        # budget cannot be pickled, and each worker starts its own anyway.
+        return (Limits, (self.bits, self.length, self.steps, self.seconds))
+
+    @classmethod
+    def parse(cls, spec):
+        # Limits from a --limits SPEC. Raises ValueError for a bad one.
+        values = {}
+        if spec == "default":
+            return cls()
+        for part in spec.split(","):
+            key, _, value = part.partition("=")
+            key = key.strip()
+            if key not in ('bits', 'length', 'steps', 'seconds'):
+                raise ValueError(f"has an unknown limit '{part}'")
+            try:
+                values[key] = float(value) if key == 'seconds' else int(value)
+            except ValueError:
+                raise ValueError(f"has a bad value in '{part}'") from None
+        return cls(**values)
+
+    def start(self):
+        budget = self.budget
+        budget.left = self.steps
+        budget.clock_at = self.steps - CLOCK_STEPS
+        budget.deadline = perf_counter() + self.seconds
+
+    def charge(self, steps):
+        budget = self.budget
+        left = budget.left - steps
+        budget.left = left
+        if left <= budget.clock_at:
+            self._check_budget()
+
+    def _check_budget(self):
+        budget = self.budget
+        if budget.left < 0:
+            raise LimitError("Too many node evaluations")
+        budget.clock_at = budget.left - CLOCK_STEPS
+        if budget.deadline is not None and perf_counter() > budget.deadline:
+            raise LimitError("Time limit exceeded")
+
+    def check_length(self, length):
+        if length > self.length:
+            raise LimitError("List or string too long")
+
+    def check_bits(self, bits):
+        if bits > self.bits:
+            raise LimitError("Integer too large")
+
+    def charged(self, compiled, steps):
+        # compiled, charging steps per call.
+        charge = self.charge
+
+        def run():
+            charge(steps)
+            return compiled()
+        return run
+
+
+def tree_size(node):
+    # Number of nodes in the tree under node.
+    count = 0
+    todo = [node]
+    while todo:
+        count += 1
+        todo.extend(child_nodes(todo.pop()))
+    return count
+
+#------------ Operator Section------------
+
+def _is_int(value):
+    return isinstance(value, int)
+
+
+def _before_add(limits, left_val, right_val):
+    if isinstance(left_val, STRINGS) and isinstance(right_val, STRINGS):
+        limits.check_length(len(left_val) + len(right_val))
+    elif isinstance(left_val, SbmlList) and isinstance(right_val, SbmlList):
+        limits.check_length(len(left_val) + len(right_val))
+
+
+def _before_mul(limits, left_val, right_val):
+    # |a * b| has at least bits(a) + bits(b) - 1 bits.
+    if _is_int(left_val) and _is_int(right_val) and left_val and right_val:
+        limits.check_bits(left_val.bit_length() + right_val.bit_length() - 1)
+
+
+def _before_pow(limits, left_val, right_val):
+    # |a| ** b has at least (bits(a) - 1) * b + 1 bits when |a| > 1 and b > 0.
+    if _is_int(left_val) and _is_int(right_val) and right_val > 0:
+        base_bits = abs(left_val).bit_length()
+        if base_bits > 1:
+            limits.check_bits((base_bits - 1) * right_val + 1)
+
+
+def _before_cons(limits, left_val, right_val):
+    if isinstance(right_val, SbmlList):
+        limits.check_length(len(right_val) + 1)
+
+
+_BEFORE = {
+    '+': _before_add,
+    '-': None,
+    '*': _before_mul,
+    '**': _before_pow,
+    '::': _before_cons,
+}
+
+
+def check_operands(op, left_val, right_val, limits):
+    # Raises LimitError if op on these values is sure to go over limits.
+    before = _BEFORE.get(op)
+    if before is not None:
+        before(limits, left_val, right_val)
+
+
+def wrap_op(op, op_fn, limits=None):
+    # op_fn with the limits checked, or op_fn itself for an operator whose
+    # results are never larger than its operands.
+    if limits is None:
+        limits = active
+    if limits is None or op not in _BEFORE:
+        return op_fn
+    before = _BEFORE[op]
+    check_bits = limits.check_bits
+
+    def limited(left_val, right_val):
+        if before is not None:
+            before(limits, left_val, right_val)
+        result = op_fn(left_val, right_val)
+        if type(result) is int:
+            check_bits(result.bit_length())
+        return result
+    return limited
+
+#------------ Mode Section------------
+
+# The Limits in force, or None.
+active = None
+
+
+def use_limits(limits):
+    # Turns limits on for trees compiled from now on, or off with None.
+    global active
+    active = limits
+
+
+def start():
+    # Gives the next line a fresh budget. Does nothing with limits off.
+    if active is not None:
+        active.start()
+
+#------------ Check------------
+
+def check():
+    # Runs inputs that go over each limit and checks each one fails fast,
+    # also through the parse cache with --fold on, then checks ordinary
+    # lines print the same with limits on as off. Run as a script this file
+    # is __main__, so the limits go through the sbml_limits module the
+    # evaluator reads.
+    import sbml_limits
+    import sbml_optimize
+    from sbml_cache import ParseCache
+    from sbml_main import Interpreter
+
+    cases = [
+        ("2 ** 10 ** 10", "SEMANTIC ERROR\n"),
+        ("(3 ** 100000) * (3 ** 100000)", "SEMANTIC ERROR\n"),
+        ("{ l = [1]; while (True) { l = l + l; } }", "SEMANTIC ERROR\n"),
+        ("{ s = \"ab\"; while (True) { s = s + s; } }", "SEMANTIC ERROR\n"),
+        ("{ i = 0; while (True) { i = i + 1; } }", "SEMANTIC ERROR\n"),
+        ("{ x = 2; i = 0; while (i < 100) { x = x * x; i = i + 1; } print(1); }", "SEMANTIC ERROR\n"),
+        ("{ l = []; while (True) { l = 1 :: l; } }", "SEMANTIC ERROR\n"),
+        ("2 ** 100", "1267650600228229401496703205376\n"),
+        ("{ i = 0; while (i < 1000) { i = i + 1; } print(i); }", "1000\n"),
+        ("[1, 2] + [3]", "[1, 2, 3]\n"),
+    ]
+    sbml_limits.use_limits(sbml_limits.Limits(bits=4096, length=100000, steps=1000000, seconds=2.0))
+    failures = 0
+    try:
+        sbml_optimize.use_folding(True)
+        for label, session in (("", Interpreter()), ("cached", Interpreter(ParseCache()))):
+            for line, expected in cases:
+                started = perf_counter()
+                found = session.evaluate(line)
+                elapsed = perf_counter() - started
+                ok = found == expected and elapsed < 3.0
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {elapsed * 1000:8.1f} ms  {label:6} {line[:60]}")
+        with open("test.txt") as file:
+            lines = [line.strip() for line in file if line.strip()]
+        limited = list(Interpreter().run(lines))
+    finally:
+        sbml_limits.use_limits(None)
+        sbml_optimize.use_folding(False)
+    unlimited = list(Interpreter().run(lines))
+    differ = sum(a != b for a, b in zip(limited, unlimited))
+    print(f"test.txt: {len(lines)} lines, {differ} differ with limits on")
+    return failures == 0 and differ == 0 and check_threads()
+
+
+def check_threads(timeout=10.0):
+    # A line that runs out of steps on one thread must still fail while
+    # another thread keeps starting short lines of its own.
+    import sbml_limits
+    from sbml_main import thread_interpreter
+
+    sbml_limits.use_limits(sbml_limits.Limits(steps=1000000, seconds=timeout))
+    done = threading.Event()
+    found = []
+
+    def spin():
+        found.append(thread_interpreter().evaluate("{ i = 0; while (True) { i = i + 1; } }"))
+        done.set()
+
+    def restart():
+        session = thread_interpreter()
+        while not done.is_set():
+            session.evaluate("1")
+
+    try:
+        threads = [threading.Thread(target=spin, daemon=True),
+                   threading.Thread(target=restart, daemon=True)]
+        started = perf_counter()
+        for thread in threads:
+            thread.start()
+        done.wait(timeout)
+        elapsed = perf_counter() - started
+    finally:
+        done.set()
+        sbml_limits.use_limits(None)
+    ok = found == ["SEMANTIC ERROR\n"] and elapsed < timeout / 2
+    print(f"{'ok  ' if ok else 'FAIL'} {elapsed * 1000:8.1f} ms  steps run out beside another thread")
+    return ok
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
@@ -2,66 +2,555 @@
 #Student ID: 114806268
 
 
+import os
 import sys
-from sbml_parser import parser, lexer
+import threading
+from collections import deque
+from functools import partial
+from itertools import chain, islice
+import sbml_limits
+import sbml_optimize
+import sbml_parser
+import sbml_values
+from sbml_ast import format_value, Environment, ProgramNode, UNSET
+from sbml_lexer import FastLexer
+from sbml_compile import compile_node
+from sbml_cache import ParseCache, normalize
+from sbml_flatten import flatten_chains
+from sbml_types import failing, infer_types
+from sbml_iterative import eval_iterative
 
-if len(sys.argv) != 3:
-    print("Error not long enough")
-    sys.exit(1)
+lexer = FastLexer()
 
-mode = sys.argv[1]
-filename = sys.argv[2]
+# Number of result lines gathered before they are handed to the writer.
+WRITE_BATCH = 1024
+# Number of input lines handed to a worker process at a time with -j.
+CHUNK_LINES = 2048
 
-try:
-    with open(filename, 'r') as file:
-        lines = file.readlines()
-except FileNotFoundError:
-    print(f"File '{filename}' not found.")
-    sys.exit(1)
 
-lines = [line.strip() for line in lines if line.strip()]
+def print_ast(node, indent=0, file=None):
+    from sbml_emit import ast_text
 
+    if file is None:
+        file = sys.stdout
+    file.write(ast_text(node, indent))
 
-def print_ast(node, indent=0):
-    pad = "  " * indent
-    print(pad + f"Node Type: {type(node).__name__}")
 
-    if hasattr(node, 'value'):
-        print(pad + f"  Value: {node.value}")
-    if hasattr(node, 'op'):
-        print(pad + f"  Operator: {node.op}")
+def syntax_error_text(error):
+    diagnostic = getattr(error, 'diagnostic', None)
+    if diagnostic is None:
+        return "SYNTAX ERROR\n"
+    return diagnostic + "\nSYNTAX ERROR\n"
 
-    if hasattr(node, '__dict__'):
-        for key, val in node.__dict__.items():
-            if isinstance(val, list):
-                for elem in val:
-                    if hasattr(elem, '__dict__'):
-                        print_ast(elem, indent + 1)
-            elif hasattr(val, '__dict__'):
-                print_ast(val, indent + 1)
 
+def parse_line(line, lexer=lexer, parser=None):
+    # Returns (tree, None) on success or (None, error text) on a syntax error.
+    if parser is None:
+        parser = sbml_parser.get_parser()
+    try:
+        result = parser.parse(line, lexer=lexer)
+    except Exception as e:
+        return None, syntax_error_text(e)
+
+    if result is None:
+        return None, "SYNTAX ERROR\n"
+    return result, None
+
+
+def error_output(error, mode):
+    # A syntax error's text as mode prints it.
+    if mode == "-J":
+        from sbml_emit import error_json
+        return error_json(error)
+    return error
 
 
-for line in lines:
+def compile_tree(result):
+    # Trees too deep for the recursive compiler run on the explicit-stack
+    # evaluator instead. Programs are compiled by run_program, against the
+    # Environment of each run. An expression with a type error that always
+    # runs is not run at all. Constants are folded first with --fold, but
+    # not under --limits: folding evaluates outside the limits.
+    if type(result) is ProgramNode:
+        return None
     try:
-        result = parser.parse(line, lexer=lexer)
+        fold = sbml_optimize.folding and sbml_limits.active is None
+        tree = sbml_optimize.fold_constants(result) if fold else result
+        tree = flatten_chains(tree)
+        types = infer_types(tree)
+        if types.error is not None:
+            return failing(types.error)
+        return compile_node(tree, None, types)
+    except RecursionError:
+        return partial(eval_iterative, result)
+
+
+def run_program(tree, variables=None, walk=False):
+    # Runs a block program and returns everything it printed. variables maps
+    # names to values; the program starts from it and writes its assignments
+    # back to it. walk runs it with evaluate() instead of compiling it.
+    env = Environment(len(tree.names))
+    if variables:
+        env.slots = [variables.get(name, UNSET) for name in tree.names]
+    try:
+        compiled = None
+        if not walk:
+            try:
+                flat = flatten_chains(tree)
+                compiled = compile_node(flat, env, infer_types(flat, variables))
+            except RecursionError:
+                pass
+        if compiled is None:
+            if sbml_limits.active is not None:
+                # evaluate() does not count steps.
+                raise sbml_limits.LimitError("Program too deeply nested to run with limits")
+            compiled = partial(tree.evaluate, env)
+        sbml_limits.start()
+        compiled()
     except Exception:
-        print("SYNTAX ERROR")
-        continue
+        env.out.append("SEMANTIC ERROR\n")
+    finally:
+        if variables is not None:
+            for name, value in zip(tree.names, env.slots):
+                if value is not UNSET:
+                    variables[name] = value
+    return "".join(env.out)
 
-    if result is None:
-        print("SYNTAX ERROR")
-        continue
 
+def run_tree(result, mode, compiled=None, variables=None):
     if mode == "-P":
-        print_ast(result)
-    elif mode == "-E":
+        from sbml_emit import ast_text
+        return ast_text(result)
+    if mode == "-J":
+        from sbml_emit import ast_json
+        return ast_json(result) + "\n"
+    if mode == "-E" and type(result) is ProgramNode:
+        return run_program(result, variables)
+    if mode == "-E":
         try:
-            value = result.eval()
-            if isinstance(value, str):
-                print(f"'{value}'")
-            else:
-                print(value)
+            if compiled is None:
+                compiled = compile_tree(result)
+            sbml_limits.start()
+            try:
+                value = compiled()
+            except RecursionError:
+                value = eval_iterative(result)
+            return format_value(value) + "\n"
         except Exception:
-            print("SEMANTIC ERROR")
+            return "SEMANTIC ERROR\n"
+    return ""
+
+
+def evaluate_line(line, mode="-E", lexer=lexer, parser=None, cache=None, variables=None):
+    if cache is not None:
+        return _evaluate_cached(line, mode, lexer, parser, cache, variables)
+
+    result, error = parse_line(line, lexer, parser)
+    if result is None:
+        return error_output(error, mode)
+    return run_tree(result, mode, variables=variables)
+
+
+def _evaluate_cached(line, mode, lexer, parser, cache, variables):
+    key = normalize(line)
+    entry = cache.get(key)
+    if entry is None:
+        result, error = parse_line(line, lexer, parser)
+        entry = cache.put(key, result, error)
+    if entry.tree is None:
+        return error_output(entry.error, mode)
+
+    text = cache.cached_output(entry, mode)
+    if text is not None:
+        return text
+
+    if mode == "-E" and entry.compiled is None:
+        entry.compiled = compile_tree(entry.tree)
+    text = run_tree(entry.tree, mode, entry.compiled, variables)
+    cache.remember_output(entry, mode, text)
+    return text
+
+
+def evaluate_stream(lines, mode="-E", cache=None):
+    return Interpreter(cache).run(lines, mode)
+
+#------------ Interpreter Section------------
+
+class Interpreter:
+    # One session: its own lexer, parser, variables and optional cache.
+    # The parse tables are shared and read-only, so building one is cheap.
+    # A session must only be used by one thread at a time; give every thread
+    # its own, for example with thread_interpreter().
+    #
+    # With an ErrorCollector the session is quiet: a bad line prints only
+    # SYNTAX ERROR and its errors go to the collector.
+
+    def __init__(self, cache=None, errors=None):
+        self.lexer = FastLexer(errors)
+        self.parser = sbml_parser.make_parser(errors)
+        self.env = {}
+        self.cache = cache
+        self.errors = errors
+
+    def parse(self, line):
+        return parse_line(line, self.lexer, self.parser)
+
+    def evaluate(self, line, mode="-E"):
+        return evaluate_line(line, mode, self.lexer, self.parser, self.cache, self.env)
+
+    def execute(self, program, mode="-E"):
+        # Runs a whole block program, which may span many lines.
+        return evaluate_line(program, mode, self.lexer, self.parser, None, self.env)
+
+    def run(self, lines, mode="-E"):
+        if self.errors is not None:
+            yield from self._run_numbered(lines, mode)
+            return
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield self.evaluate(line, mode)
+
+    def _run_numbered(self, lines, mode):
+        # Tells the collector which input line each error is on.
+        errors = self.errors
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if line:
+                errors.line = number
+                yield self.evaluate(line, mode)
+
+
+_thread_sessions = threading.local()
+
+def thread_interpreter():
+    # The calling thread's own Interpreter, created on first use.
+    session = getattr(_thread_sessions, 'interpreter', None)
+    if session is None:
+        session = _thread_sessions.interpreter = Interpreter()
+    return session
+
+
+#------------ Compiled File Section------------
+
+def split_program(lines):
+    # Input whose first non-blank character is '{' is one block program.
+    # Returns (program text, None) for that, or (None, lines) otherwise.
+    lines = iter(lines)
+    first = next((line for line in lines if line.strip()), "")
+    if first.lstrip().startswith("{"):
+        return first + "".join(lines), None
+    return None, chain([first], lines)
+
+
+def compile_lines(lines, path):
+    # Parses the input once and writes the trees and syntax errors to path.
+    # Returns the number of records written.
+    from sbml_serialize import write_ast_file
+
+    session = Interpreter()
+    program, lines = split_program(lines)
+    if program is not None:
+        records = [session.parse(program)]
+    else:
+        records = (session.parse(line.strip()) for line in lines if line.strip())
+    return write_ast_file(path, records)
+
+
+def evaluate_compiled(ast_file, mode="-E"):
+    # Same output as running the source the file was compiled from.
+    variables = {}
+    for tree, error in ast_file:
+        yield error_output(error, mode) if tree is None else run_tree(tree, mode, variables=variables)
+
+
+#------------ Parallel Section------------
+
+_worker = None
+
+def _init_worker(cache_options=None, arrays=False, limits=None, folding=False):
+    global _worker
+    if arrays:
+        sbml_values.use_numpy()
+    sbml_limits.use_limits(limits)
+    sbml_optimize.use_folding(folding)
+    cache = ParseCache(**cache_options) if cache_options is not None else None
+    _worker = Interpreter(cache)
+
+def _evaluate_chunk(chunk, mode):
+    return "".join(_worker.run(chunk, mode))
+
+def evaluate_parallel(lines, mode="-E", jobs=2, cache_options=None, arrays=False):
+    # Block lines share the variables of one session, in input order, so
+    # they run here in one Interpreter; the workers only get expression
+    # lines, which cannot see variables. Results come back in input order.
+    from multiprocessing import Pool
+
+    lines = iter(lines)
+    pending = deque()
+    session = Interpreter(ParseCache(**cache_options) if cache_options is not None else None)
+    initargs = (cache_options, arrays, sbml_limits.active, sbml_optimize.folding)
+    with Pool(jobs, initializer=_init_worker, initargs=initargs) as pool:
+        while True:
+            while len(pending) < 2 * jobs:
+                chunk = list(islice(lines, CHUNK_LINES))
+                if not chunk:
+                    break
+                run = []
+                for line in chunk:
+                    if not line.lstrip().startswith("{"):
+                        run.append(line)
+                        continue
+                    if run:
+                        pending.append(pool.apply_async(_evaluate_chunk, (run, mode)))
+                        run = []
+                    pending.append(session.evaluate(line.strip(), mode))
+                if run:
+                    pending.append(pool.apply_async(_evaluate_chunk, (run, mode)))
+            if not pending:
+                break
+            result = pending.popleft()
+            yield result if type(result) is str else result.get()
+
+
+def write_stream(results, out):
+    batch = []
+    for text in results:
+        batch.append(text)
+        if len(batch) >= WRITE_BATCH:
+            out.write("".join(batch))
+            batch.clear()
+    if batch:
+        out.write("".join(batch))
+    out.flush()
+
+
+def main(argv):
+    argv = list(argv)
+    jobs = 1
+    if "-j" in argv:
+        at = argv.index("-j")
+        try:
+            jobs = int(argv[at + 1])
+        except (IndexError, ValueError):
+            print("Error -j needs a number of jobs")
+            return 1
+        del argv[at:at + 2]
+
+    # --profile FILE writes a JSON timing report to FILE. Profiled runs are
+    # single-process and uncached so every line is timed the same way, and
+    # -j and --cache are refused with it below.
+    profiler = None
+    if "--profile" in argv:
+        at = argv.index("--profile")
+        if at + 1 >= len(argv):
+            print("Error --profile needs a report file")
+            return 1
+        report = argv[at + 1]
+        from sbml_profile import Profiler
+        profiler = Profiler()
+        del argv[at:at + 2]
+
+    # --errors FILE makes syntax errors quiet and writes them to FILE as JSON
+    # lines. It runs single-process and uncached, so it is refused with -j,
+    # --cache and --profile below.
+    errors = None
+    if "--errors" in argv:
+        at = argv.index("--errors")
+        if at + 1 >= len(argv):
+            print("Error --errors needs an output file")
+            return 1
+        errors_path = argv[at + 1]
+        errors = sbml_parser.ErrorCollector()
+        del argv[at:at + 2]
+
+    # --limits SPEC bounds the integers, lists, strings, steps and time of
+    # every line; see sbml_limits.py. A line over a limit prints SEMANTIC
+    # ERROR. Profiling walks trees with evaluate(), which is not limited.
+    if "--limits" in argv:
+        at = argv.index("--limits")
+        if at + 1 >= len(argv):
+            print("Error --limits needs default or key=value pairs")
+            return 1
+        try:
+            sbml_limits.use_limits(sbml_limits.Limits.parse(argv[at + 1]))
+        except ValueError as e:
+            print(f"Error --limits {e}")
+            return 1
+        del argv[at:at + 2]
+        if profiler is not None:
+            print("Error --limits cannot be used with --profile")
+            return 1
+
+    # --watch reruns the file after every change, reusing the output of the
+    # lines that did not change. Its runner keeps its own session and line
+    # cache, so -j, --cache, --errors and --profile are refused with it below.
+    watching = "--watch" in argv
+    if watching:
+        argv.remove("--watch")
+
+    cache_options = None
+    cache_flags = [flag for flag in ("--cache", "--cache-results", "--cache-stats") if flag in argv]
+    show_stats = "--cache-stats" in argv
+    if "--cache" in argv or "--cache-results" in argv or show_stats:
+        cache_options = {'cache_results': "--cache-results" in argv}
+    arrays = "--numpy" in argv
+    if arrays and not sbml_values.use_numpy():
+        print("NumPy is not installed, using Python lists", file=sys.stderr)
+        arrays = False
+    # --fold evaluates constant subtrees once, when a line is compiled.
+    sbml_optimize.use_folding("--fold" in argv)
+    argv = [arg for arg in argv
+            if arg not in ("--cache", "--cache-results", "--cache-stats", "--numpy", "--fold")]
+
+    # Flags that only change how lines are spread over processes or cached.
+    spread = (["-j"] if jobs > 1 else []) + cache_flags
+    if errors is not None:
+        clash = spread + (["--profile"] if profiler is not None else [])
+        if clash:
+            print(f"Error --errors cannot be used with {', '.join(clash)}")
+            return 1
+    if profiler is not None and spread:
+        print(f"Error --profile cannot be used with {', '.join(spread)}")
+        return 1
+    if watching:
+        clash = spread + [flag for flag, given in (("--errors", errors is not None),
+                                                   ("--profile", profiler is not None)) if given]
+        if clash:
+            print(f"Error --watch cannot be used with {', '.join(clash)}")
+            return 1
+
+    if argv[1:] == ["check"]:
+        # python sbml_main.py check
+        return 0 if check() else 1
+
+    if len(argv) >= 2 and argv[1] == "compile":
+        # python sbml_main.py compile <input> <output.sbmlc>
+        if len(argv) != 4:
+            print("Error compile needs an input and an output file")
+            return 1
+        try:
+            file = sys.stdin if argv[2] == "-" else open(argv[2], 'r')
+        except FileNotFoundError:
+            print(f"File '{argv[2]}' not found.")
+            return 1
+        with file:
+            compile_lines(file, argv[3])
+        return 0
+
+    if len(argv) != 3:
+        print("Error not long enough")
+        return 1
+
+    mode = argv[1]
+    filename = argv[2]
+
+    def run(lines):
+        if profiler is not None:
+            run_profiled(lines)
+            return
+        if errors is not None:
+            run_quiet(lines)
+            return
+        program, lines = split_program(lines)
+        if program is not None:
+            write_stream([Interpreter().execute(program, mode)], sys.stdout)
+            return
+
+        if jobs > 1:
+            results = evaluate_parallel(lines, mode, jobs, cache_options, arrays)
+            write_stream(results, sys.stdout)
+            return
+        cache = ParseCache(**cache_options) if cache_options is not None else None
+        write_stream(evaluate_stream(lines, mode, cache), sys.stdout)
+        if cache is not None and show_stats:
+            print(cache.stats(), file=sys.stderr)
+
+    def run_quiet(lines):
+        program, lines = split_program(lines)
+        session = Interpreter(errors=errors)
+        try:
+            if program is not None:
+                write_stream([session.execute(program, mode)], sys.stdout)
+            else:
+                write_stream(session.run(lines, mode), sys.stdout)
+        finally:
+            with open(errors_path, 'w') as file:
+                errors.write(file)
+
+    def run_profiled(lines):
+        from sbml_profile import TimedOutput
+
+        program, lines = split_program(lines)
+        if program is not None:
+            lines = [program]
+        out = TimedOutput(sys.stdout, profiler)
+        try:
+            write_stream(profiler.run(Interpreter(), lines, mode), out)
+        finally:
+            profiler.write_report(report)
+
+    # Feature modules are imported only by the branches that use them, so a
+    # plain run does not pay for loading them.
+    if watching:
+        from sbml_serialize import is_ast_file
+        from sbml_watch import watch
+
+        if not os.path.exists(filename):
+            print(f"File '{filename}' not found.")
+            return 1
+        if is_ast_file(filename):
+            print("Error --watch cannot be used with a compiled file")
+            return 1
+        watch(filename, mode)
+        return 0
+
+    if filename == "-":
+        run(sys.stdin)
+        return 0
+
+    from sbml_serialize import AstFile, is_ast_file
+
+    try:
+        compiled = is_ast_file(filename)
+        file = open(filename, 'r')
+    except FileNotFoundError:
+        print(f"File '{filename}' not found.")
+        return 1
+
+    if compiled:
+        file.close()
+        # A compiled file is already parsed and is run in one process, so
+        # these have nothing to do.
+        unused = [flag for flag, given in (("-j", jobs > 1),
+                                           ("--cache", cache_options is not None),
+                                           ("--profile", profiler is not None),
+                                           ("--errors", errors is not None)) if given]
+        if unused:
+            print(f"Error {', '.join(unused)} cannot be used with a compiled file")
+            return 1
+        with AstFile(filename) as ast_file:
+            write_stream(evaluate_compiled(ast_file, mode), sys.stdout)
+        return 0
+
+    with file:
+        run(file)
+    return 0
+
+#------------ Check------------
+
+def check():
+    # -j must print what a serial run prints. Block lines share variables
+    # across the chunks the workers get, so a name bound before a chunk
+    # boundary must still be there after it.
+    lines = ["0", "{ x = 1; }"] + [f"1 + {i}" for i in range(3 * CHUNK_LINES // 2)]
+    lines += ["{ print(x); }", "{ x = x + 1; print(x); }", "x"]
+    expected = "".join(evaluate_stream(lines))
+    found = "".join(evaluate_parallel(lines, jobs=2))
+    ok = found == expected and expected.endswith("1\n2\nSEMANTIC ERROR\n")
+    print(f"{'ok  ' if ok else 'FAIL'} -j 2 matches serial, {len(lines)} lines")
+    return ok
+
 
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
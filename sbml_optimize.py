@@ -0,0 +1,197 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Constant folding over the SBML AST. Subtrees built only from literals are
+# evaluated once and replaced by a single literal node. A subtree whose
+# evaluation raises is left unfolded so the error still happens at run time.
+# The input tree is never modified; folded parents are new nodes.
+#
+# Folding only evaluates what a run would. Operands are folded in the order
+# they are evaluated, and once one stays unfolded (it raised or is not
+# constant) the ones after it are left as they are: the run may never reach
+# them. The right side of andalso and orelse is only folded when the left
+# side is True. Results past FOLD_LIMITS are left to run time too, so
+# folding a line never costs much more than parsing it.
+
+from sbml_values import SbmlList, STRINGS
+from sbml_limits import Limits, LimitError, check_operands
+from sbml_ast import (
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    UnaryOpNode, IndexNode, TupleIndexNode
+)
+
+FOLD_LIMITS = Limits(bits=4096, length=65536)
+
+LITERAL_NODES = (NumberNode, BooleanNode, StringNode)
+
+
+def is_literal(node):
+    if isinstance(node, LITERAL_NODES):
+        return True
+    if isinstance(node, (ListNode, TupleNode)):
+        return all(is_literal(elem) for elem in node.elements)
+    return False
+
+
+def literal_node(value):
+    # Returns the literal node for value, or None if it has no literal form.
+    if isinstance(value, bool):
+        return BooleanNode(value)
+    if isinstance(value, (int, float)):
+        return NumberNode(value)
+    if isinstance(value, STRINGS):
+        return StringNode(str(value))
+    if isinstance(value, (SbmlList, tuple)):
+        elements = []
+        for elem in value:
+            elem_node = literal_node(elem)
+            if elem_node is None:
+                return None
+            elements.append(elem_node)
+        if isinstance(value, SbmlList):
+            return ListNode(elements)
+        return TupleNode(elements)
+    return None
+
+
+def fold_constants(node):
+    folder = _FOLDERS.get(type(node))
+    if folder is None:
+        return node
+    return folder(node)
+
+
+def _try_fold(node):
+    try:
+        value = node.eval()
+        if type(value) is int:
+            FOLD_LIMITS.check_bits(value.bit_length())
+        elif isinstance(value, (SbmlList, tuple) + STRINGS):
+            FOLD_LIMITS.check_length(len(value))
+    except Exception:
+        return node
+    folded = literal_node(value)
+    return node if folded is None else folded
+
+
+def _fold_in_order(operands):
+    # (folded operands, whether all of them folded to literals). Stops at
+    # the first operand that does not fold; the rest are kept unfolded.
+    folded = []
+    for at, operand in enumerate(operands):
+        new = fold_constants(operand)
+        folded.append(new)
+        if not is_literal(new):
+            return folded + list(operands[at + 1:]), False
+    return folded, True
+
+
+def _fold_sequence(node):
+    elements, _ = _fold_in_order(node.elements)
+    return type(node)(elements)
+
+
+def _fold_binop(node):
+    left = fold_constants(node.left)
+
+    if node.op in ('andalso', 'orelse'):
+        # false andalso e and false orelse e never evaluate e, so they fold
+        # even when e does not. Any other left side but True stops before e.
+        if isinstance(left, BooleanNode) and not left.value:
+            return BooleanNode(False)
+        if not isinstance(left, BooleanNode):
+            return BinaryOpNode(node.op, left, node.right)
+    elif not is_literal(left):
+        return BinaryOpNode(node.op, left, node.right)
+
+    right = fold_constants(node.right)
+    folded = BinaryOpNode(node.op, left, right)
+    if not is_literal(right):
+        return folded
+    try:
+        check_operands(node.op, left.eval(), right.eval(), FOLD_LIMITS)
+    except LimitError:
+        return folded
+    return _try_fold(folded)
+
+
+def _fold_unary(node):
+    expr = fold_constants(node.expr)
+    folded = UnaryOpNode(node.op, expr)
+    if is_literal(expr):
+        return _try_fold(folded)
+    return folded
+
+
+def _fold_index(node):
+    (collection, index), constant = _fold_in_order([node.collection, node.index])
+    folded = IndexNode(collection, index)
+    return _try_fold(folded) if constant else folded
+
+
+def _fold_tuple_index(node):
+    (index, tuple_expr), constant = _fold_in_order([node.index, node.tuple_expr])
+    folded = TupleIndexNode(index, tuple_expr)
+    return _try_fold(folded) if constant else folded
+
+
+_FOLDERS = {
+    ListNode: _fold_sequence,
+    TupleNode: _fold_sequence,
+    BinaryOpNode: _fold_binop,
+    UnaryOpNode: _fold_unary,
+    IndexNode: _fold_index,
+    TupleIndexNode: _fold_tuple_index,
+}
+
+#------------ Mode Section------------
+
+# Whether compile_tree folds constants before compiling (--fold).
+folding = False
+
+
+def use_folding(enabled=True):
+    global folding
+    folding = enabled
+
+#------------ Check------------
+
+def check():
+    # Lines whose unreached or oversized parts used to be folded anyway,
+    # each of which must fold quickly and print what the unfolded run does.
+    from time import perf_counter
+    from sbml_main import parse_line, run_tree
+    from sbml_compile import compile_node
+    from sbml_ast import format_value
+
+    lines = [
+        '3 :: 1 != 0 < 1 >= False / 1[5 ** 3 ** 17 <> 0[0 / False[True]]] ** "abc"'
+        '[""[5][5 <= 0] / ("abc") <> (3)]',
+        "(1 div 0) + (10 ** 10 ** 8)",
+        "[1 div 0, 10 ** 10 ** 8]",
+        "#1((1 div 0, 2 ** 10 ** 9))",
+        "1 andalso 10 ** 10 ** 8 > 1",
+        "2 ** 5000",
+        "True andalso 2 ** 5 > 3",
+        "[1, 2 ** 3, \"a\" + \"b\"]",
+    ]
+    failures = 0
+    for line in lines:
+        tree, _ = parse_line(line)
+        started = perf_counter()
+        folded = fold_constants(tree)
+        elapsed = perf_counter() - started
+        try:
+            found = format_value(compile_node(folded)()) + "\n"
+        except Exception:
+            found = "SEMANTIC ERROR\n"
+        ok = elapsed < 0.5 and found == run_tree(tree, "-E")
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {elapsed * 1000:8.1f} ms  {line[:60]}")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
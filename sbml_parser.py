@@ -3,12 +3,16 @@
 
 import ply.lex as lex
 import ply.yacc as yacc
+import os
 import re
+import sys
 
 from sbml_ast import (
     NumberNode, BooleanNode, StringNode,
     ListNode, TupleNode, BinaryOpNode,
-    UnaryOpNode, IndexNode, TupleIndexNode
+    UnaryOpNode, IndexNode, TupleIndexNode,
+    VariableNode, ProgramNode, BlockNode, PrintNode,
+    AssignNode, IndexAssignNode, IfNode, WhileNode
 )
 
 tokens = ('NUMBER', 'BOOLEAN','STRING',
@@ -167,10 +171,12 @@ def p_expression_group(p):
 
 def p_error(p):
     if p is None:
-        print("Syntax Error at EQF")
+        diagnostic = "Syntax Error at EQF"
     else:
-        print(f"SYntax Error at token {p.type}, value = {p.value!r}")
-    raise SyntaxError("SYNtax ERROR")
+        diagnostic = f"SYntax Error at token {p.type}, value = {p.value!r}"
+    error = SyntaxError("SYNtax ERROR")
+    error.diagnostic = diagnostic
+    raise error
 
 def p_expression_not(p):
     'expression : NOT expression'
@@ -201,7 +207,8 @@ def p_l_items_single(p):
     p[0] = [p[1]]
 def p_l_items_more(p):
     'l_items : l_items COMMA expression'
-    p[0] = p[1] + [p[3]]
+    p[1].append(p[3])
+    p[0] = p[1]
 
 #------Tuple Grammar rules------
 def p_expression_tuple_single(p):
@@ -210,15 +217,19 @@ def p_expression_tuple_single(p):
 
 def p_expression_tuple_multi(p):
     'expression : LPAREN t_items RPAREN'
+    p[2].reverse()
     p[0] = TupleNode(p[2])
 
 def p_t_items_one(p):
     't_items : expression'
     p[0] = [p[1]]
 
+# t_items is right recursive, so items are appended in reverse and every
+# rule that uses t_items reverses the finished list once.
 def p_t_items_more(p):
     't_items : expression COMMA t_items'
-    p[0] = [p[1]] + p[3]
+    p[3].append(p[1])
+    p[0] = p[3]
 
 #----- Indexing Grammar Rules-----
 def p_expression_list_index(p):
@@ -229,6 +240,7 @@ def p_expression_list_index(p):
 def p_expression_tuple_index_multi(p):
     'expression : HASH NUMBER LPAREN t_items RPAREN'
     index_node = NumberNode(p[2])
+    p[4].reverse()
     tuple_node = TupleNode(p[4])
     p[0] = TupleIndexNode(index_node, tuple_node)
 
@@ -238,8 +250,253 @@ def p_expression_tuple_index_single(p):
     tuple_node = TupleNode([p[4]])
     p[0] = TupleIndexNode(index_node, tuple_node)
 
-lexer = lex.lex()
-parser = yacc.yacc()
+#----- Variable Grammar Rules-----
+def slot_of(p, name):
+    # Every name gets one slot per parse, numbered in order of first use.
+    symbols = p.parser.symbols
+    slot = symbols.get(name)
+    if slot is None:
+        slot = symbols[name] = len(symbols)
+    return slot
+
+def p_expression_variable(p):
+    'expression : ID'
+    p[0] = VariableNode(p[1], slot_of(p, p[1]))
+
+#----- Statement Grammar Rules-----
+def p_input_expression(p):
+    'input : expression'
+    p[0] = p[1]
+
+def p_input_program(p):
+    'input : block'
+    p[0] = ProgramNode(p[1], list(p.parser.symbols))
+
+def p_block(p):
+    'block : LBRACE statements RBRACE'
+    p[0] = BlockNode(p[2])
+
+def p_block_empty(p):
+    'block : LBRACE RBRACE'
+    p[0] = BlockNode([])
+
+def p_statements_one(p):
+    'statements : statement'
+    p[0] = [] if p[1] is None else [p[1]]
+
+def p_statements_more(p):
+    'statements : statements statement'
+    if p[2] is not None:
+        p[1].append(p[2])
+    p[0] = p[1]
+
+def p_statement_block(p):
+    'statement : block'
+    p[0] = p[1]
+
+def p_statement_empty(p):
+    'statement : SEMI'
+    p[0] = None
+
+def p_statement_print(p):
+    'statement : PRINT LPAREN expression RPAREN SEMI'
+    p[0] = PrintNode(p[3])
+
+def p_statement_assign(p):
+    'statement : ID ASSIGN expression SEMI'
+    p[0] = AssignNode(p[1], slot_of(p, p[1]), p[3])
+
+def p_statement_index_assign(p):
+    'statement : expression LBRACKET expression RBRACKET ASSIGN expression SEMI'
+    p[0] = IndexAssignNode(p[1], p[3], p[6])
+
+def p_statement_if(p):
+    'statement : IF LPAREN expression RPAREN block'
+    p[0] = IfNode(p[3], p[5])
+
+def p_statement_if_else(p):
+    'statement : IF LPAREN expression RPAREN block ELSE block'
+    p[0] = IfNode(p[3], p[5], p[7])
+
+def p_statement_while(p):
+    'statement : WHILE LPAREN expression RPAREN block'
+    p[0] = WhileNode(p[3], p[5])
+
+def p_statement_error(p):
+    'statement : error SEMI'
+    # Only reached in quiet mode, where a bad statement is skipped up to
+    # the next ';' so the rest of the program is still checked.
+    p[0] = None
+
+start = 'input'
+
+#------------ Table Loading Section------------
+
+# The lexer and parser are built on first use, not at import. The parser
+# comes from the prebuilt tables in parsetab.py when they were made by this
+# version of PLY from this grammar, so startup never re-analyzes the grammar
+# and never writes parsetab.py or parser.out. Run this file to rebuild them
+# after changing the grammar.
+
+def grammar_signature():
+    # Same string yacc.yacc() stores as _lr_signature: the start symbol, the
+    # precedence table, the sorted token names and the rule docstrings in
+    # source order.
+    module = sys.modules[__name__]
+    rules = []
+    for name, item in vars(module).items():
+        if name.startswith('p_') and name != 'p_error' and item.__doc__:
+            rules.append((item.__code__.co_firstlineno, name, item.__doc__))
+    rules.sort()
+    parts = [start, ''.join(''.join(level) for level in precedence), ' '.join(sorted(tokens))]
+    parts.extend(doc for _, _, doc in rules)
+    return ''.join(parts)
+
+
+def read_tables():
+    # Returns the tables in parsetab.py, or None if they are missing or stale.
+    try:
+        import parsetab
+    except ImportError:
+        return None
+    if getattr(parsetab, '_tabversion', None) != yacc.__tabversion__:
+        return None
+    if getattr(parsetab, '_lr_signature', None) != grammar_signature():
+        return None
+    table = yacc.LRTable()
+    table.read_table(parsetab)
+    table.bind_callables(vars(sys.modules[__name__]))
+    return table
+
+
+def generate_tables():
+    parser = yacc.yacc(module=sys.modules[__name__], debug=False,
+                       write_tables=False, errorlog=yacc.NullLogger())
+    table = yacc.LRTable()
+    table.lr_action = parser.action
+    table.lr_goto = parser.goto
+    table.lr_productions = parser.productions
+    return table
+
+
+_table = None
+
+def get_table():
+    global _table
+    if _table is None:
+        table = read_tables()
+        if table is None:
+            print("sbml_parser: parsetab.py is out of date, building tables in memory", file=sys.stderr)
+            table = generate_tables()
+        _table = table
+    return _table
+
+
+class ErrorCollector:
+    # Syntax errors found in quiet mode, as (line, column, token type, token
+    # value) tuples. line is the input line number of the text being parsed,
+    # set by the caller; columns count from 1. A bad character has type
+    # ILLEGAL and the end of input has type $end.
+
+    def __init__(self):
+        self.errors = []
+        self.line = 1
+        self.failed = False
+
+    def add(self, data, lexpos, kind, value):
+        line = self.line + data.count("\n", 0, lexpos)
+        column = lexpos - data.rfind("\n", 0, lexpos)
+        self.errors.append((line, column, kind, value))
+        self.failed = True
+
+    def write(self, file):
+        # One JSON object per error.
+        import json
+        for line, column, kind, value in self.errors:
+            file.write(json.dumps({'line': line, 'column': column, 'token': kind,
+                                   'value': value}) + "\n")
+
+
+class SbmlParser(yacc.LRParser):
+    # Starts every parse with an empty table of variable slots.
+    #
+    # With an ErrorCollector the parser is quiet: a syntax error is recorded
+    # instead of raised, PLY's error recovery resynchronizes and carries on,
+    # and parse() returns None for the input.
+
+    def __init__(self, lrtab, errorf, errors=None):
+        super().__init__(lrtab, errorf)
+        self.errors = errors
+        if errors is not None:
+            self.errorfunc = self.quiet_error
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        self.symbols = {}
+        if self.errors is None:
+            return super().parse(input, lexer, debug, tracking, tokenfunc)
+        self.data = input
+        self.single = not input.lstrip().startswith("{")
+        errors = self.errors
+        errors.failed = False
+        if tokenfunc is None and self.single:
+            # A line holds one expression, so nothing after its first error
+            # is worth parsing: the token stream ends there, and recovery
+            # unwinds straight to the end of input.
+            def tokenfunc():
+                if not errors.failed:
+                    tok = lexer.token()
+                    if not errors.failed:
+                        return tok
+                return None
+        result = super().parse(input, lexer, debug, tracking, tokenfunc)
+        return None if errors.failed else result
+
+    def quiet_error(self, p):
+        if p is None:
+            if self.errors.failed and self.single:
+                # The end of a line cut short by an earlier error.
+                return
+            self.errors.add(self.data, len(self.data), '$end', None)
+        else:
+            self.errors.add(self.data, p.lexpos, p.type, p.value)
+
+
+def make_parser(errors=None):
+    # A new parser over the shared tables. A parser keeps its parse state on
+    # itself, so each thread needs its own, but the tables are only read and
+    # are shared by all of them.
+    return SbmlParser(get_table(), p_error, errors)
+
+
+def build_tables():
+    # Regenerates parsetab.py and parser.out next to this file.
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    return yacc.yacc(module=sys.modules[__name__], debug=True,
+                     write_tables=True, outputdir=outputdir)
+
+
+def get_lexer():
+    global lexer
+    if 'lexer' not in globals():
+        lexer = lex.lex(module=sys.modules[__name__])
+    return lexer
+
+
+def get_parser():
+    global parser
+    if 'parser' not in globals():
+        parser = make_parser()
+    return parser
+
+
+def __getattr__(name):
+    # Keeps "from sbml_parser import lexer, parser" working.
+    if name == 'lexer':
+        return get_lexer()
+    if name == 'parser':
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 #if __name__ == "__main__":
 #    data = open("lexer_test").read()
@@ -251,4 +508,7 @@ parser = yacc.yacc()
 #            if not tok: break
 #            print(tok.type, repr(tok.value))
 #    except SyntaxError:
-#        print("SYNTAX ERROR")
\ No newline at end of file
+#        print("SYNTAX ERROR")
+
+if __name__ == "__main__":
+    build_tables()
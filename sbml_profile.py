@@ -0,0 +1,240 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Opt-in profiling for sbml_main.py: python sbml_main.py -E file --profile report.json
+#
+# Records wall time per phase (lex, parse, eval, print), a count and
+# cumulative time for every node class and every operator, and the slowest
+# input lines, and writes them as JSON when the run ends.
+#
+# Nothing here runs unless profiling is on. The node counters are wrappers
+# that Profiler.install() puts around the eval and evaluate methods of the
+# node classes and uninstall() takes away again, so normal runs call the
+# original methods with no extra work. While profiling, lines are evaluated
+# by walking the tree with eval() rather than through compiled closures, so
+# that every node passes through a wrapper.
+
+import heapq
+import json
+from time import perf_counter
+
+import sbml_ast
+from sbml_ast import format_value, Node, ProgramNode
+from sbml_iterative import eval_iterative
+from sbml_emit import ast_json, ast_text
+
+PHASES = ('lex', 'parse', 'eval', 'print')
+
+
+class _ReplayLexer:
+    # Hands the parser tokens that were scanned beforehand, then the
+    # scanner's error if it stopped at one, so parse time excludes lexing.
+
+    def __init__(self, tokens, error):
+        self.tokens = tokens
+        self.error = error
+
+    def input(self, data):
+        self.token = self._replay().__next__
+
+    def _replay(self):
+        yield from self.tokens
+        if self.error is not None:
+            raise self.error
+        while True:
+            yield None
+
+
+def _tokenize(lexer, line):
+    lexer.input(line)
+    tokens = []
+    try:
+        while True:
+            tok = lexer.token()
+            if tok is None:
+                return tokens, None
+            tokens.append(tok)
+    except SyntaxError as e:
+        return tokens, e
+
+
+def _node_classes():
+    return [cls for cls in vars(sbml_ast).values()
+            if isinstance(cls, type) and issubclass(cls, Node) and cls is not Node]
+
+
+class TimedOutput:
+    # Wraps an output stream and counts the time spent writing as print time.
+
+    def __init__(self, out, profiler):
+        self.out = out
+        self.profiler = profiler
+
+    def write(self, text):
+        start = perf_counter()
+        self.out.write(text)
+        self.profiler.phases['print'] += perf_counter() - start
+
+    def flush(self):
+        start = perf_counter()
+        self.out.flush()
+        self.profiler.phases['print'] += perf_counter() - start
+
+
+class Profiler:
+
+    def __init__(self, slowest=10):
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        # class name -> [count, seconds], and class name -> op -> [count, seconds]
+        self.nodes = {}
+        self.operators = {}
+        self.lines = 0
+        self.keep = slowest
+        # Min-heap of (seconds, line number, text) for the slowest lines.
+        self.slowest = []
+        self.saved = []
+        self.started = perf_counter()
+
+    #------------ Node Counters------------
+
+    def install(self):
+        for cls in _node_classes():
+            for name in ('eval', 'evaluate'):
+                original = cls.__dict__.get(name)
+                if original is not None:
+                    self.saved.append((cls, name, original))
+                    setattr(cls, name, self._wrap(cls, original))
+
+    def uninstall(self):
+        for cls, name, original in self.saved:
+            setattr(cls, name, original)
+        self.saved = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def _wrap(self, cls, original):
+        # Times are inclusive: a node's time covers its children too.
+        totals = self.nodes.setdefault(cls.__name__, [0, 0.0])
+        if 'op' not in cls.__dataclass_fields__:
+            def timed(node, *args):
+                start = perf_counter()
+                try:
+                    return original(node, *args)
+                finally:
+                    totals[0] += 1
+                    totals[1] += perf_counter() - start
+            return timed
+
+        operators = self.operators.setdefault(cls.__name__, {})
+
+        def timed_op(node, *args):
+            start = perf_counter()
+            try:
+                return original(node, *args)
+            finally:
+                elapsed = perf_counter() - start
+                totals[0] += 1
+                totals[1] += elapsed
+                entry = operators.get(node.op)
+                if entry is None:
+                    entry = operators[node.op] = [0, 0.0]
+                entry[0] += 1
+                entry[1] += elapsed
+        return timed_op
+
+    #------------ Running------------
+
+    def evaluate(self, session, line, mode="-E", number=None):
+        # Same text as session.evaluate(line, mode), with every phase timed.
+        # number is the input line number shown in the report.
+        from sbml_main import error_output, parse_line, run_program
+
+        phases = self.phases
+        start = perf_counter()
+        tokens, error = _tokenize(session.lexer, line)
+        lexed = perf_counter()
+        tree, text = parse_line(line, _ReplayLexer(tokens, error), session.parser)
+        parsed = perf_counter()
+        phases['lex'] += lexed - start
+        phases['parse'] += parsed - lexed
+        if tree is None:
+            self._line_done(line, number, parsed - start)
+            return error_output(text, mode)
+
+        if mode in ("-P", "-J"):
+            text = ast_text(tree) if mode == "-P" else ast_json(tree) + "\n"
+            done = perf_counter()
+            phases['print'] += done - parsed
+        elif mode == "-E" and type(tree) is ProgramNode:
+            text = run_program(tree, session.env, walk=True)
+            done = perf_counter()
+            phases['eval'] += done - parsed
+        elif mode == "-E":
+            failed = False
+            try:
+                try:
+                    value = tree.eval()
+                except RecursionError:
+                    # The wrappers double the stack depth; such lines are
+                    # finished uncounted, as run_tree would.
+                    value = eval_iterative(tree)
+            except Exception:
+                failed = True
+            evaluated = perf_counter()
+            phases['eval'] += evaluated - parsed
+            text = "SEMANTIC ERROR\n"
+            if not failed:
+                try:
+                    text = format_value(value) + "\n"
+                except Exception:
+                    pass
+            done = perf_counter()
+            phases['print'] += done - evaluated
+        else:
+            text = ""
+            done = parsed
+        self._line_done(line, number, done - start)
+        return text
+
+    def run(self, session, lines, mode="-E"):
+        with self:
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if line:
+                    yield self.evaluate(session, line, mode, number)
+
+    def _line_done(self, line, number, seconds):
+        self.lines += 1
+        entry = (seconds, number or self.lines, line[:200])
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    #------------ Report------------
+
+    def report(self):
+        def table(totals):
+            ordered = sorted(totals.items(), key=lambda item: -item[1][1])
+            return {name: {'count': count, 'seconds': seconds}
+                    for name, (count, seconds) in ordered if count}
+
+        return {
+            'lines': self.lines,
+            'total_seconds': perf_counter() - self.started,
+            'phases': self.phases,
+            'nodes': table(self.nodes),
+            'operators': {name: table(ops) for name, ops in self.operators.items() if ops},
+            'slowest_lines': [{'line': number, 'seconds': seconds, 'text': text}
+                              for seconds, number, text in sorted(self.slowest, reverse=True)],
+        }
+
+    def write_report(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+            file.write("\n")
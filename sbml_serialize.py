@@ -0,0 +1,436 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Binary AST files. "python sbml_main.py compile in.txt out.sbmlc" parses every
+# line once and stores the trees (or syntax errors) here; running -E or -P on
+# the .sbmlc file then skips the lexer and parser entirely.
+#
+# Layout, all little-endian:
+#   MAGIC
+#   record 0, record 1, ...
+#   index: count + 1 offsets (u64), record i is bytes [index[i], index[i+1])
+#   footer: index offset (u64), count (u64)
+#
+# A record is one kind byte (tree or syntax error) followed by either the
+# error text or the tree in postorder: every node's children come before the
+# node itself, so decoding is one loop over a value stack, with no recursion
+# however deep the tree. AstFile maps the file and decodes a record only
+# when it is asked for.
+
+import mmap
+import struct
+from array import array
+
+from sbml_ast import (
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    UnaryOpNode, IndexNode, TupleIndexNode,
+    VariableNode, ProgramNode, BlockNode, PrintNode,
+    AssignNode, IndexAssignNode, IfNode, WhileNode
+)
+
+MAGIC = b"SBMLAST\x01"
+
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_FOOTER = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+
+# Record kinds.
+_TREE = 0
+_ERROR = 1
+
+# Node tags.
+_INT = 0
+_BIGINT = 1
+_FLOAT = 2
+_TRUE = 3
+_FALSE = 4
+_STRING = 5
+_LIST = 6
+_TUPLE = 7
+_BINOP = 8
+_UNARY = 9
+_INDEX = 10
+_TUPLE_INDEX = 11
+_VARIABLE = 12
+_PROGRAM = 13
+_BLOCK = 14
+_PRINT = 15
+_ASSIGN = 16
+_INDEX_ASSIGN = 17
+_IF = 18
+_IF_ELSE = 19
+_WHILE = 20
+
+OPS = (
+    '+', '-', '*', '/', 'div', 'mod', '**', 'andalso', 'orelse',
+    '<', '<=', '==', '<>', '!=', '>=', '>', '::', 'in', 'not',
+)
+_OP_CODES = {op: code for code, op in enumerate(OPS)}
+
+#------------ Encoder Section------------
+
+def _write_text(out, text):
+    data = text.encode('utf-8', 'surrogatepass')
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _children(node):
+    kind = type(node)
+    if kind is ListNode or kind is TupleNode:
+        return node.elements
+    if kind is BinaryOpNode:
+        return (node.left, node.right)
+    if kind is UnaryOpNode:
+        return (node.expr,)
+    if kind is IndexNode:
+        return (node.collection, node.index)
+    if kind is TupleIndexNode:
+        return (node.index, node.tuple_expr)
+    if kind is ProgramNode:
+        return (node.block,)
+    if kind is BlockNode:
+        return node.statements
+    if kind is PrintNode or kind is AssignNode:
+        return (node.expr,)
+    if kind is IndexAssignNode:
+        return (node.collection, node.index, node.expr)
+    if kind is IfNode:
+        if node.else_block is None:
+            return (node.cond, node.then_block)
+        return (node.cond, node.then_block, node.else_block)
+    if kind is WhileNode:
+        return (node.cond, node.body)
+    return ()
+
+
+def _write_node(out, node):
+    # The node's own tag and fields; its children are already written.
+    kind = type(node)
+    if kind is NumberNode:
+        value = node.value
+        if type(value) is float:
+            out += _U8.pack(_FLOAT)
+            out += _F64.pack(value)
+        elif -2 ** 63 <= value < 2 ** 63:
+            out += _U8.pack(_INT)
+            out += _I64.pack(value)
+        else:
+            data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            out += _U8.pack(_BIGINT)
+            out += _U32.pack(len(data))
+            out += data
+    elif kind is BooleanNode:
+        out += _U8.pack(_TRUE if node.value else _FALSE)
+    elif kind is StringNode:
+        out += _U8.pack(_STRING)
+        _write_text(out, node.value)
+    elif kind is ListNode or kind is TupleNode:
+        out += _U8.pack(_LIST if kind is ListNode else _TUPLE)
+        out += _U32.pack(len(node.elements))
+    elif kind is BinaryOpNode:
+        out += _U8.pack(_BINOP)
+        out += _U8.pack(_OP_CODES[node.op])
+    elif kind is UnaryOpNode:
+        out += _U8.pack(_UNARY)
+        out += _U8.pack(_OP_CODES[node.op])
+    elif kind is IndexNode:
+        out += _U8.pack(_INDEX)
+    elif kind is TupleIndexNode:
+        out += _U8.pack(_TUPLE_INDEX)
+    elif kind is VariableNode:
+        out += _U8.pack(_VARIABLE)
+        out += _U32.pack(node.slot)
+        _write_text(out, node.name)
+    elif kind is ProgramNode:
+        out += _U8.pack(_PROGRAM)
+        out += _U32.pack(len(node.names))
+        for name in node.names:
+            _write_text(out, name)
+    elif kind is BlockNode:
+        out += _U8.pack(_BLOCK)
+        out += _U32.pack(len(node.statements))
+    elif kind is PrintNode:
+        out += _U8.pack(_PRINT)
+    elif kind is AssignNode:
+        out += _U8.pack(_ASSIGN)
+        out += _U32.pack(node.slot)
+        _write_text(out, node.name)
+    elif kind is IndexAssignNode:
+        out += _U8.pack(_INDEX_ASSIGN)
+    elif kind is IfNode:
+        out += _U8.pack(_IF if node.else_block is None else _IF_ELSE)
+    elif kind is WhileNode:
+        out += _U8.pack(_WHILE)
+    else:
+        raise TypeError(f"Cannot serialize {kind.__name__}")
+
+
+def encode_tree(node, out=None):
+    # Appends node in postorder to the bytearray out and returns it.
+    if out is None:
+        out = bytearray()
+    todo = [(node, False)]
+    while todo:
+        current, expanded = todo.pop()
+        children = _children(current)
+        if expanded or not children:
+            _write_node(out, current)
+            continue
+        todo.append((current, True))
+        for child in reversed(children):
+            todo.append((child, False))
+    return out
+
+
+def write_ast_file(path, records):
+    # records yields (tree, None) for parsed lines and (None, error text)
+    # for lines with a syntax error, in input order.
+    offsets = array('Q')
+    position = len(MAGIC)
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        for tree, error in records:
+            offsets.append(position)
+            if tree is None:
+                out = bytearray(_U8.pack(_ERROR))
+                _write_text(out, error)
+            else:
+                out = encode_tree(tree, bytearray(_U8.pack(_TREE)))
+            file.write(out)
+            position += len(out)
+        offsets.append(position)
+        file.write(offsets.tobytes() if offsets.itemsize == 8 else
+                   b"".join(_OFFSET.pack(offset) for offset in offsets))
+        file.write(_FOOTER.pack(position, len(offsets) - 1))
+    return len(offsets) - 1
+
+#------------ Decoder Section------------
+
+def _read_text(data, pos):
+    size, = _U32.unpack_from(data, pos)
+    pos += 4
+    return str(data[pos:pos + size], 'utf-8', 'surrogatepass'), pos + size
+
+
+def decode_tree(data, pos, end):
+    values = []
+    push = values.append
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        if tag == _INT:
+            push(NumberNode(_I64.unpack_from(data, pos)[0]))
+            pos += 8
+        elif tag == _FLOAT:
+            push(NumberNode(_F64.unpack_from(data, pos)[0]))
+            pos += 8
+        elif tag == _BINOP:
+            right = values.pop()
+            values[-1] = BinaryOpNode(OPS[data[pos]], values[-1], right)
+            pos += 1
+        elif tag == _LIST or tag == _TUPLE:
+            count, = _U32.unpack_from(data, pos)
+            pos += 4
+            start = len(values) - count
+            elements = values[start:]
+            del values[start:]
+            push(ListNode(elements) if tag == _LIST else TupleNode(elements))
+        elif tag == _TRUE or tag == _FALSE:
+            push(BooleanNode(tag == _TRUE))
+        elif tag == _STRING:
+            text, pos = _read_text(data, pos)
+            push(StringNode(text))
+        elif tag == _BIGINT:
+            size, = _U32.unpack_from(data, pos)
+            pos += 4
+            push(NumberNode(int.from_bytes(data[pos:pos + size], 'little', signed=True)))
+            pos += size
+        elif tag == _UNARY:
+            values[-1] = UnaryOpNode(OPS[data[pos]], values[-1])
+            pos += 1
+        elif tag == _INDEX:
+            index = values.pop()
+            values[-1] = IndexNode(values[-1], index)
+        elif tag == _TUPLE_INDEX:
+            tuple_expr = values.pop()
+            values[-1] = TupleIndexNode(values[-1], tuple_expr)
+        elif tag == _VARIABLE:
+            slot, = _U32.unpack_from(data, pos)
+            name, pos = _read_text(data, pos + 4)
+            push(VariableNode(name, slot))
+        elif tag == _PROGRAM:
+            count, = _U32.unpack_from(data, pos)
+            pos += 4
+            names = []
+            for _ in range(count):
+                name, pos = _read_text(data, pos)
+                names.append(name)
+            values[-1] = ProgramNode(values[-1], names)
+        elif tag == _BLOCK:
+            count, = _U32.unpack_from(data, pos)
+            pos += 4
+            start = len(values) - count
+            statements = values[start:]
+            del values[start:]
+            push(BlockNode(statements))
+        elif tag == _PRINT:
+            values[-1] = PrintNode(values[-1])
+        elif tag == _ASSIGN:
+            slot, = _U32.unpack_from(data, pos)
+            name, pos = _read_text(data, pos + 4)
+            values[-1] = AssignNode(name, slot, values[-1])
+        elif tag == _INDEX_ASSIGN:
+            expr = values.pop()
+            index = values.pop()
+            values[-1] = IndexAssignNode(values[-1], index, expr)
+        elif tag == _IF:
+            then_block = values.pop()
+            values[-1] = IfNode(values[-1], then_block)
+        elif tag == _IF_ELSE:
+            else_block = values.pop()
+            then_block = values.pop()
+            values[-1] = IfNode(values[-1], then_block, else_block)
+        elif tag == _WHILE:
+            body = values.pop()
+            values[-1] = WhileNode(values[-1], body)
+        else:
+            raise ValueError(f"Bad node tag {tag} in AST file")
+    if len(values) != 1:
+        raise ValueError("Corrupt tree record in AST file")
+    return values[0]
+
+
+def is_ast_file(path):
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class AstFile:
+    # Read-only view of a compiled file. Records are decoded on access, so
+    # looking at record i touches only the index entry and record i.
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"'{path}' is not an SBML AST file")
+        data = self.data
+        if len(data) < len(MAGIC) + _FOOTER.size or data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not an SBML AST file")
+        self.index, self.count = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        # Returns (tree, None) or (None, error text).
+        if i < 0:
+            i += self.count
+        if i < 0 or i >= self.count:
+            raise IndexError("record index out of range")
+        start, end = struct.unpack_from("<QQ", self.data, self.index + 8 * i)
+        if self.data[start] == _ERROR:
+            return None, _read_text(self.data, start + 1)[0]
+        return decode_tree(self.data, start + 1, end), None
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+#------------ Round-Trip Check------------
+
+def _text(tree):
+    # __str__, or the same text built without recursion for deep trees.
+    try:
+        return str(tree)
+    except RecursionError:
+        from sbml_iterative import node_str
+        return node_str(tree)
+
+
+def _outcome(tree):
+    # The printed output of a program, or the value or exception type of
+    # an expression.
+    if type(tree) is ProgramNode:
+        from sbml_main import run_program
+        return run_program(tree)
+    try:
+        return ('ok', repr(tree.eval()))
+    except Exception as e:
+        return ('error', type(e))
+
+
+def check(paths=("test.txt", "lexer_test"), fuzz=20000):
+    # Compiles lines from paths plus fuzzed expressions, loads them back
+    # through AstFile and compares each with a fresh parse: same __str__,
+    # same eval() result or exception type, same syntax error text.
+    import os
+    import random
+    import tempfile
+    from sbml_lexer import fuzz_inputs
+    from sbml_main import Interpreter
+
+    session = Interpreter()
+    lines = []
+    for path in paths:
+        with open(path) as file:
+            text = file.read()
+        lines.extend(line.strip() for line in text.splitlines() if line.strip())
+        lines.append(text)
+    rng = random.Random(0)
+    lines.extend(fuzz_inputs(fuzz))
+    numbers = [str(rng.randrange(-10, 10)) for _ in range(50)] + ["2 ** 70", "1.5e300", "-0.0"]
+    lines.extend(" :: ".join(rng.sample(numbers, 5)) + " :: []" for _ in range(200))
+    lines.append(" :: ".join(["1"] * 5000) + " :: []")
+    lines.extend([
+        "{ x = 3; y = [1, 2, x]; y[0] = x * 2; print(y); }",
+        "{ i = 0; while (i < 5) { if (i mod 2 == 0) { print(i); } else { ; } i = i + 1; } }",
+        "{ s = \"ab\"; if (s in [\"ab\"]) { print(#1(s, 2.5)); } print(undefined); }",
+        "{ { } ; }",
+    ])
+
+    parsed = [session.parse(line) for line in lines]
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "check.sbmlc")
+        write_ast_file(path, parsed)
+        with AstFile(path) as loaded:
+            order = list(range(len(loaded)))
+            rng.shuffle(order)
+            for i in order:
+                tree, error = parsed[i]
+                loaded_tree, loaded_error = loaded[i]
+                same = error == loaded_error
+                if same and tree is not None:
+                    same = (_text(tree) == _text(loaded_tree) and
+                            _outcome(tree) == _outcome(loaded_tree))
+                if not same:
+                    mismatches += 1
+                    if mismatches <= 10:
+                        print(f"MISMATCH for {lines[i]!r}\n  parsed: {tree} {error!r}\n"
+                              f"  loaded: {loaded_tree} {loaded_error!r}")
+    print(f"{len(lines)} records, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,297 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Local evaluation server, so callers do not pay for a new Python process
+# and table load on every request.
+#
+# Usage: python sbml_server.py serve [--port N | --unix PATH] [--workers N] [--mode -E|-P]
+#                                    [--limits SPEC]
+#        python sbml_server.py client FILE [--port N | --unix PATH]
+#        python sbml_server.py bench [--port N | --unix PATH] [--connections C]
+#                                    [--requests N] [--pipeline P]
+#
+# Protocol: every line a client sends is one request, an expression or a
+# one-line block program. Every request gets one response in the same
+# order: a line with the number of output lines, then the output lines,
+# exactly as sbml_main.py would print them (a blank request has 0 lines).
+# Requests are independent; block programs do not share variables.
+#
+# A client may send many requests without waiting for the answers. Lines
+# that arrive together are evaluated as one batch on the worker pool. Each
+# connection has at most MAX_PENDING batches in flight; beyond that the
+# server stops reading from it until the oldest answers have been sent, and
+# it waits for the client to read its answers before sending more.
+#
+# --limits SPEC (see sbml_limits.py) bounds every request, so one hostile
+# line gets SEMANTIC ERROR instead of holding a worker.
+
+import asyncio
+import os
+import signal
+import sys
+from collections import deque
+from time import perf_counter
+
+DEFAULT_PORT = 7878
+# Most lines evaluated in one batch.
+BATCH_LINES = 256
+# Batches in flight per connection before the server stops reading.
+MAX_PENDING = 64
+# Bytes read from a socket at a time.
+READ_SIZE = 65536
+# Longest request line accepted. A longer one closes the connection.
+MAX_LINE = 16 * 1024 * 1024
+
+#------------ Worker Section------------
+
+_session = None
+
+def _init_worker(limits=None):
+    global _session
+    import sbml_limits
+    from sbml_main import Interpreter
+    sbml_limits.use_limits(limits)
+    _session = Interpreter()
+
+
+def evaluate_batch(lines, mode="-E"):
+    # Output of each line, evaluated on its own.
+    from sbml_main import evaluate_line
+
+    if _session is None:
+        _init_worker()
+    lexer, parser = _session.lexer, _session.parser
+    results = []
+    for line in lines:
+        line = line.strip()
+        results.append(evaluate_line(line, mode, lexer, parser) if line else "")
+    return results
+
+
+def frame(texts):
+    # Response bytes for a batch of outputs.
+    return "".join(f"{text.count(chr(10))}\n{text}" for text in texts).encode()
+
+#------------ Server Section------------
+
+class SbmlServer:
+
+    def __init__(self, mode="-E", workers=None, limits=None):
+        self.mode = mode
+        self.workers = os.cpu_count() if workers is None else workers
+        self.limits = limits
+        self.pool = None
+
+    def start_pool(self):
+        # workers=0 evaluates on the event loop thread, which has the lowest
+        # latency for a single client but blocks while it evaluates.
+        if self.workers:
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.limits,))
+        else:
+            _init_worker(self.limits)
+
+    def evaluate(self, lines):
+        loop = asyncio.get_running_loop()
+        if self.pool is None:
+            future = loop.create_future()
+            future.set_result(evaluate_batch(lines, self.mode))
+            return future
+        return loop.run_in_executor(self.pool, evaluate_batch, lines, self.mode)
+
+    async def handle(self, reader, writer):
+        pending = asyncio.Queue(MAX_PENDING)
+        sender = asyncio.create_task(self._send(pending, writer))
+        try:
+            await self._receive(reader, pending)
+        finally:
+            await pending.put(None)
+            await sender
+
+    async def _receive(self, reader, pending):
+        partial = b""
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                break
+            data = partial + data
+            lines = data.split(b"\n")
+            partial = lines.pop()
+            if len(partial) > MAX_LINE:
+                return
+            for start in range(0, len(lines), BATCH_LINES):
+                batch = [line.decode('utf-8', 'replace') for line in lines[start:start + BATCH_LINES]]
+                # Waits here while the connection has MAX_PENDING batches.
+                await pending.put(self.evaluate(batch))
+        if partial:
+            await pending.put(self.evaluate([partial.decode('utf-8', 'replace')]))
+
+    async def _send(self, pending, writer):
+        # Once the client is gone, keeps emptying the queue so the reader
+        # never waits on it.
+        connected = True
+        while True:
+            future = await pending.get()
+            if future is None:
+                break
+            if not connected:
+                continue
+            try:
+                writer.write(frame(await future))
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+        writer.close()
+
+    async def serve(self, port=DEFAULT_PORT, unix=None, ready=None):
+        # Runs until cancelled or sent SIGTERM, then shuts the pool down so
+        # no worker process outlives the server.
+        self.start_pool()
+        try:
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGTERM, asyncio.current_task().cancel)
+            except (NotImplementedError, RuntimeError):
+                pass
+            if unix is not None:
+                server = await asyncio.start_unix_server(self.handle, unix)
+            else:
+                server = await asyncio.start_server(self.handle, "127.0.0.1", port)
+            async with server:
+                if ready is not None:
+                    ready.set()
+                await server.serve_forever()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+
+#------------ Client Section------------
+
+async def connect(port=DEFAULT_PORT, unix=None):
+    if unix is not None:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+async def read_response(reader):
+    count = int(await reader.readline())
+    lines = [await reader.readline() for _ in range(count)]
+    return b"".join(lines).decode('utf-8', 'replace')
+
+
+async def evaluate_remote(lines, port=DEFAULT_PORT, unix=None, pipeline=1024):
+    # Sends lines over one connection with up to pipeline requests in
+    # flight. Returns the outputs and the latency of each request.
+    reader, writer = await connect(port, unix)
+    window = asyncio.Semaphore(pipeline)
+    sent = deque()
+
+    async def send():
+        for line in lines:
+            await window.acquire()
+            sent.append(perf_counter())
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+
+    async def receive():
+        outputs, latencies = [], []
+        for _ in lines:
+            outputs.append(await read_response(reader))
+            latencies.append(perf_counter() - sent.popleft())
+            window.release()
+        return outputs, latencies
+
+    try:
+        _, (outputs, latencies) = await asyncio.gather(send(), receive())
+    finally:
+        writer.close()
+    return outputs, latencies
+
+
+async def bench_client(lines, connections=4, pipeline=64, port=DEFAULT_PORT, unix=None):
+    # Sends lines once on each of connections connections at the same time
+    # and prints throughput and latency.
+    start = perf_counter()
+    results = await asyncio.gather(*(evaluate_remote(lines, port, unix, pipeline)
+                                     for _ in range(connections)))
+    elapsed = perf_counter() - start
+    latencies = sorted(latency for _, found in results for latency in found)
+    total = len(latencies)
+    print(f"{connections} connections x {len(lines)} requests, pipeline {pipeline}")
+    print(f"  throughput  {total / elapsed:12.0f} requests/s")
+    for label, q in (("p50", 0.5), ("p99", 0.99), ("max", 1.0)):
+        latency = latencies[min(total - 1, int(q * total))]
+        print(f"  latency {label} {latency * 1000:12.3f} ms")
+    return results
+
+#------------ Command Line------------
+
+def _options(args, defaults):
+    options = dict(defaults)
+    args = list(args)
+    rest = []
+    while args:
+        arg = args.pop(0)
+        if arg in options:
+            if not args:
+                raise ValueError(f"{arg} needs a value")
+            options[arg] = args.pop(0)
+        else:
+            rest.append(arg)
+    return options, rest
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] not in ("serve", "client", "bench"):
+        print("Usage: python sbml_server.py serve|client|bench [options]")
+        return 1
+    defaults = {'--port': str(DEFAULT_PORT), '--unix': None, '--workers': None,
+                '--mode': "-E", '--connections': "4", '--requests': "10000",
+                '--pipeline': "64", '--limits': None}
+    try:
+        options, rest = _options(argv[2:], defaults)
+    except ValueError as e:
+        print(f"Error {e}")
+        return 1
+    port, unix = int(options['--port']), options['--unix']
+
+    if argv[1] == "serve":
+        workers = options['--workers']
+        limits = None
+        if options['--limits'] is not None:
+            from sbml_limits import Limits
+            try:
+                limits = Limits.parse(options['--limits'])
+            except ValueError as e:
+                print(f"Error {e}")
+                return 1
+        server = SbmlServer(options['--mode'], None if workers is None else int(workers), limits)
+        try:
+            asyncio.run(server.serve(port, unix))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        return 0
+
+    if argv[1] == "client":
+        # Prints what sbml_main.py -E prints for a file of expression lines.
+        if len(rest) != 1:
+            print("Error client needs a file")
+            return 1
+        with open(rest[0]) as file:
+            lines = [line.strip() for line in file]
+        outputs, _ = asyncio.run(evaluate_remote(lines, port, unix))
+        sys.stdout.write("".join(outputs))
+        return 0
+
+    with open("test.txt") as file:
+        sample = [line.strip() for line in file if line.strip()]
+    count = int(options['--requests'])
+    lines = (sample * (count // len(sample) + 1))[:count]
+    asyncio.run(bench_client(lines, int(options['--connections']),
+                             int(options['--pipeline']), port, unix))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
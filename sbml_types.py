@@ -0,0 +1,471 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Static type inference over the SBML AST. infer_types() labels every node it
+# can with the SBML type its value is sure to have: int, real, bool, string,
+# list or tuple. A node whose type depends on run-time values (a list
+# element, a power, a variable assigned values of different types) gets
+# None. Labels are kept in a dict keyed by id(node), since nodes are slotted
+# and have no room for them.
+#
+# The types follow the evaluator's checks exactly. bool passes every number
+# and integer check there, as it does in Python, so it does here too.
+#
+# Two things use the labels. An expression with a type error on a path that
+# always runs is sure to give SEMANTIC ERROR, and compile_tree() then skips
+# running it. The compiler picks check-free operators for nodes whose
+# operand types are proven (see unchecked_op).
+
+import operator
+
+from sbml_values import SbmlList, Rope, join_strings
+from sbml_ast import (
+    SemanticError,
+    NumberNode, BooleanNode, StringNode,
+    ListNode, TupleNode, BinaryOpNode,
+    SumNode, LogicChainNode, UnaryOpNode, IndexNode, TupleIndexNode,
+    VariableNode, ProgramNode, BlockNode, PrintNode,
+    AssignNode, IndexAssignNode, IfNode, WhileNode
+)
+
+INT = 'int'
+REAL = 'real'
+BOOL = 'bool'
+STRING = 'string'
+LIST = 'list'
+TUPLE = 'tuple'
+
+# Types that pass the evaluator's number and integer checks.
+NUMBERS = (INT, REAL, BOOL)
+INTEGERS = (INT, BOOL)
+
+# Type of a variable no assignment has given a value yet.
+_UNASSIGNED = 'unassigned'
+
+
+def type_of(value):
+    # The SBML type of a run-time value, or None.
+    kind = type(value)
+    if kind is bool:
+        return BOOL
+    if kind is int:
+        return INT
+    if kind is float:
+        return REAL
+    if kind is str or kind is Rope:
+        return STRING
+    if isinstance(value, SbmlList):
+        return LIST
+    if kind is tuple:
+        return TUPLE
+    return None
+
+
+class TypeInfo:
+    # Result of one inference run. types maps id(node) to its type. error is
+    # the message of the first type error sure to be raised, found only
+    # while checking a bare expression.
+
+    def __init__(self):
+        self.types = {}
+        self.error = None
+        self.names = None
+        self.changed = False
+
+    def get(self, node):
+        return self.types.get(id(node))
+
+    def fail(self, sure, message):
+        if sure and self.error is None:
+            self.error = message
+        return None
+
+
+def infer_types(tree, variables=None):
+    # Labels tree. For a block program, variables maps names to the values
+    # the run starts from, as run_program takes them.
+    info = TypeInfo()
+    if type(tree) is ProgramNode:
+        _infer_program(tree, info, variables or {})
+    else:
+        infer_node(tree, info, True)
+    return info
+
+
+def infer_node(node, info, sure):
+    # sure says the node is evaluated whenever the expression is.
+    infer = _INFERRERS.get(type(node))
+    found = None if infer is None else infer(node, info, sure)
+    info.types[id(node)] = found
+    return found
+
+#------------ Expression Section------------
+
+def _infer_literal(node, info, sure):
+    value = node.value
+    if type(value) is bool:
+        return BOOL
+    if type(value) is int:
+        return INT
+    if type(value) is float:
+        return REAL
+    return STRING
+
+
+def _infer_sequence(node, info, sure):
+    for elem in node.elements:
+        if hasattr(elem, 'eval'):
+            infer_node(elem, info, sure)
+    return LIST if type(node) is ListNode else TUPLE
+
+
+def _infer_binop(node, info, sure):
+    op = '!=' if node.op == '<>' else node.op
+    left = infer_node(node.left, info, sure)
+
+    if op in ('andalso', 'orelse'):
+        # The right side only runs when the left side is True.
+        infer_node(node.right, info, False)
+        if left is not None and left != BOOL:
+            return info.fail(sure, f"Operands or {op} must be booleans")
+        return BOOL
+
+    right = infer_node(node.right, info, sure)
+    known = left is not None and right is not None
+
+    if op == '+':
+        return _add_type(left, right, info, sure)
+
+    if op in ('-', '*', '/', '**', 'div', 'mod'):
+        kinds = INTEGERS if op in ('div', 'mod') else NUMBERS
+        if (left is not None and left not in kinds) or (right is not None and right not in kinds):
+            return info.fail(sure, f"Operands of '{op}' must be numbers.")
+        if op == '/':
+            return REAL
+        # A power's type depends on the sign of its exponent.
+        if not known or op == '**':
+            return None
+        return REAL if REAL in (left, right) else INT
+
+    if op in ('<', '<=', '==', '!=', '>=', '>'):
+        for kinds in (NUMBERS, (STRING,)):
+            if left in kinds or right in kinds:
+                other = right if left in kinds else left
+                if other is not None and other not in kinds:
+                    return info.fail(sure, "Invalid Types for comparison.")
+                return BOOL
+        if known:
+            return info.fail(sure, "Invalid Types for comparison.")
+        return BOOL
+
+    if op == '::':
+        if right is not None and right != LIST:
+            return info.fail(sure, "Right side of :: must be a list.")
+        return LIST
+
+    if op == 'in':
+        if right is not None and right not in (LIST, STRING):
+            return info.fail(sure, "Right side of in must be a list or str")
+        # Only a string can be looked for in a string.
+        if right == STRING and left is not None and left != STRING:
+            return info.fail(sure, "Left side of in a string must be a string")
+        return BOOL
+
+    return info.fail(sure, f"Unknown operator: {op}")
+
+
+def _add_type(left, right, info, sure):
+    known = left is not None and right is not None
+    for kinds in (NUMBERS, (STRING,), (LIST,)):
+        if left in kinds or right in kinds:
+            other = right if left in kinds else left
+            if other is not None and other not in kinds:
+                return info.fail(sure, "Operands of + must both be numbers")
+            if not known:
+                return None
+            if kinds is NUMBERS:
+                return REAL if REAL in (left, right) else INT
+            return kinds[0]
+    if known:
+        return info.fail(sure, "Operands of + must both be numbers")
+    return None
+
+
+def _infer_sum(node, info, sure):
+    # The type each nested + node would get, from the innermost out.
+    found = infer_node(node.operands[0], info, sure)
+    for operand in node.operands[1:]:
+        found = _add_type(found, infer_node(operand, info, sure), info, sure)
+    return found
+
+
+def _infer_logic_chain(node, info, sure):
+    # Only the innermost nested node can fail; the ones around it see a
+    # bool or None on their left.
+    first = infer_node(node.operands[0], info, sure)
+    for operand in node.operands[1:]:
+        infer_node(operand, info, False)
+    if first is not None and first != BOOL:
+        info.fail(sure, f"Operands or {node.op} must be booleans")
+    return BOOL
+
+
+def _infer_unary(node, info, sure):
+    found = infer_node(node.expr, info, sure)
+    if node.op == 'not':
+        if found is not None and found != BOOL:
+            return info.fail(sure, "Operand of 'not' must be boolean")
+        return BOOL
+    if node.op in ('-', '+'):
+        if found is None:
+            return None
+        if found not in NUMBERS:
+            return info.fail(sure, f"Bad operand type for unary {node.op}")
+        return REAL if found == REAL else INT
+    return info.fail(sure, f"Unknown unary op: {node.op}")
+
+
+def _infer_index(node, info, sure):
+    collection = infer_node(node.collection, info, sure)
+    index = infer_node(node.index, info, sure)
+    if index is not None and index not in INTEGERS:
+        return info.fail(sure, "Index must be an integer.")
+    if collection is not None and collection not in (LIST, STRING):
+        return info.fail(sure, "Can only index lists or strings.")
+    return STRING if collection == STRING else None
+
+
+def _infer_tuple_index(node, info, sure):
+    index = infer_node(node.index, info, sure)
+    tuple_type = infer_node(node.tuple_expr, info, sure)
+    if index is not None and index not in INTEGERS:
+        return info.fail(sure, "Tuple index must be an integer")
+    if tuple_type is not None and tuple_type != TUPLE:
+        return info.fail(sure, "Operand being indexed must be a tuple")
+    return None
+
+#------------ Statement Section------------
+
+# A variable's type is the one type every value it can hold has: its
+# starting value and everything assigned to it anywhere in the program.
+# Reading a variable that was never assigned raises before the value is
+# used, so such reads do not count. Statements are walked until no
+# variable's type changes; a type only ever moves from unassigned to a type
+# to None, so that takes at most three walks after the first.
+
+def _infer_program(node, info, variables):
+    info.names = {}
+    for name in node.names:
+        info.names[name] = type_of(variables[name]) if name in variables else _UNASSIGNED
+    info.changed = True
+    while info.changed:
+        info.changed = False
+        infer_node(node.block, info, False)
+
+
+def _infer_variable(node, info, sure):
+    if info.names is None:
+        return None
+    found = info.names.get(node.name)
+    return None if found is _UNASSIGNED else found
+
+
+def _infer_block(node, info, sure):
+    for statement in node.statements:
+        infer_node(statement, info, False)
+    return None
+
+
+def _infer_print(node, info, sure):
+    infer_node(node.expr, info, False)
+    return None
+
+
+def _infer_assign(node, info, sure):
+    found = infer_node(node.expr, info, False)
+    if info.names is not None:
+        name = node.name
+        old = info.names.get(name, _UNASSIGNED)
+        new = found if old is _UNASSIGNED or old == found else None
+        if new != old:
+            info.names[name] = new
+            info.changed = True
+    return None
+
+
+def _infer_index_assign(node, info, sure):
+    infer_node(node.collection, info, False)
+    infer_node(node.index, info, False)
+    infer_node(node.expr, info, False)
+    return None
+
+
+def _infer_if(node, info, sure):
+    infer_node(node.cond, info, False)
+    infer_node(node.then_block, info, False)
+    if node.else_block is not None:
+        infer_node(node.else_block, info, False)
+    return None
+
+
+def _infer_while(node, info, sure):
+    infer_node(node.cond, info, False)
+    infer_node(node.body, info, False)
+    return None
+
+
+_INFERRERS = {
+    NumberNode: _infer_literal,
+    BooleanNode: _infer_literal,
+    StringNode: _infer_literal,
+    ListNode: _infer_sequence,
+    TupleNode: _infer_sequence,
+    BinaryOpNode: _infer_binop,
+    SumNode: _infer_sum,
+    LogicChainNode: _infer_logic_chain,
+    UnaryOpNode: _infer_unary,
+    IndexNode: _infer_index,
+    TupleIndexNode: _infer_tuple_index,
+    VariableNode: _infer_variable,
+    BlockNode: _infer_block,
+    PrintNode: _infer_print,
+    AssignNode: _infer_assign,
+    IndexAssignNode: _infer_index_assign,
+    IfNode: _infer_if,
+    WhileNode: _infer_while,
+}
+
+#------------ Fast Path Section------------
+
+def _concat(left_val, right_val):
+    return left_val.concat(right_val)
+
+def _cons(left_val, right_val):
+    return right_val.cons(left_val)
+
+_NUMBER_OPS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': operator.truediv, '**': operator.pow,
+    'div': operator.floordiv, 'mod': operator.mod,
+}
+
+_COMPARISONS = {
+    '<': operator.lt, '<=': operator.le, '==': operator.eq,
+    '!=': operator.ne, '>=': operator.ge, '>': operator.gt,
+}
+
+
+def unchecked_op(op, left, right):
+    # A function doing op with none of the evaluator's type checks, when
+    # types left and right are sure to pass them, else None. Division by
+    # zero still raises ZeroDivisionError, as in the checked operators.
+    if op in ('div', 'mod'):
+        if left in INTEGERS and right in INTEGERS:
+            return _NUMBER_OPS[op]
+        return None
+    if op in _NUMBER_OPS and left in NUMBERS and right in NUMBERS:
+        return _NUMBER_OPS[op]
+    if op in _COMPARISONS:
+        if (left in NUMBERS and right in NUMBERS) or (left == STRING and right == STRING):
+            return _COMPARISONS[op]
+        return None
+    if op == '+' and left == right == STRING:
+        return join_strings
+    if op == '+' and left == right == LIST:
+        return _concat
+    if op == '::' and right == LIST:
+        return _cons
+    return None
+
+
+def failing(message):
+    # Stands in for an expression sure to raise.
+    def run():
+        raise SemanticError(message)
+    return run
+
+#------------ Model Check------------
+
+def check(count=50000, seed=0):
+    # Runs random expressions and small programs with the evaluator and with
+    # compiled closures that use the labels, and compares their output.
+    import random
+    from sbml_main import Interpreter, parse_line, run_program
+    from sbml_ast import format_value
+    from sbml_compile import compile_node
+
+    rng = random.Random(seed)
+    session = Interpreter()
+    leaves = ['1', '0', '2', '-3', '1.5', '0.0', 'True', 'False', '"ab"', "'b'", '""',
+              '[]', '[1, 2.0]', '["a", 3]', '(1, "b", 2.5)', '(True, 1)']
+    names = ['x', 'y', 's', 'l']
+    binary = ['+', '-', '*', '/', '**', 'div', 'mod', '<', '<=', '==', '<>', '>=', '>',
+              '::', 'in', 'andalso', 'orelse']
+
+    def expression(depth, leaves):
+        roll = rng.random()
+        if depth == 0 or roll < 0.3:
+            return rng.choice(leaves)
+        if roll < 0.45:
+            return f"{rng.choice(['-', 'not ', '+'])}({expression(depth - 1, leaves)})"
+        if roll < 0.55:
+            return f"({expression(depth - 1, leaves)})[{expression(depth - 1, leaves)}]"
+        if roll < 0.6:
+            return f"#{rng.choice(['1', '2', 'True', '3'])}({expression(depth - 1, leaves)})"
+        return (f"({expression(depth - 1, leaves)} {rng.choice(binary)} "
+                f"{expression(depth - 1, leaves)})")
+
+    def outcome(run):
+        try:
+            return format_value(run()) + "\n"
+        except Exception:
+            return "SEMANTIC ERROR\n"
+
+    def compiled(tree, info):
+        if info.error is not None:
+            return "SEMANTIC ERROR\n"
+        return outcome(compile_node(tree, None, info))
+
+    mismatches = proven = 0
+    for _ in range(count):
+        if rng.random() < 0.7:
+            line = expression(4, leaves)
+            tree, _ = parse_line(line, session.lexer, session.parser)
+            if tree is None:
+                continue
+            info = infer_types(tree)
+            proven += info.error is not None
+            expected, found = outcome(tree.eval), compiled(tree, info)
+        else:
+            statements = []
+            for _ in range(rng.randrange(1, 6)):
+                name = rng.choice(names)
+                roll = rng.random()
+                if roll < 0.6:
+                    statements.append(f"{name} = {expression(2, leaves + names)};")
+                elif roll < 0.8:
+                    statements.append(f"print({expression(2, leaves + names)});")
+                elif roll < 0.9:
+                    statements.append(f"if ({expression(1, leaves + names)}) "
+                                      f"{{ {name} = {expression(1, leaves + names)}; }}")
+                else:
+                    statements.append(f"k = 0; while (k < 3) {{ {name} = "
+                                      f"{expression(1, leaves + names)}; k = k + 1; }}")
+            line = "{ " + " ".join(statements) + " }"
+            tree, _ = parse_line(line, session.lexer, session.parser)
+            if tree is None:
+                continue
+            start = {'x': rng.choice([1, 2.5, "z"]), 'l': SbmlList([1, 2])}
+            expected = run_program(tree, dict(start), walk=True)
+            found = run_program(tree, dict(start))
+        if expected != found:
+            mismatches += 1
+            if mismatches <= 5:
+                print(line, repr(expected), repr(found))
+    print(f"{count} lines, {proven} proven errors, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check() else 1)
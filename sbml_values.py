@@ -0,0 +1,681 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Runtime value types. SbmlList is the value of every SBML list. It prints
+# and compares exactly like a Python list, but cons, append and
+# concatenation share storage instead of copying the whole list.
+#
+# A storage is two Python lists that grow outwards: front holds the
+# elements left of position 0 in reverse order and back holds the elements
+# from position 0 on. A list is a window [lo, hi) of positions. Elements are
+# only ever added past the ends of a storage, never in the middle, so
+# consing onto a list whose window touches the left end is one append to
+# front, and every other list sharing the storage still sees its own
+# window unchanged. Indexed assignment is the one in-place change, so a
+# list copies its window into a storage of its own before the first write
+# once the storage has been shared.
+#
+# Repeated in tests against one long list use a MemberIndex, a hashed copy
+# of the list's window kept on its storage. Since a window's elements only
+# change by an indexed write, which drops the index, the index stays valid
+# for as long as the storage keeps it.
+
+import operator
+from bisect import bisect_right
+from itertools import accumulate
+
+#------------ List Section------------
+
+# Shorter lists are always scanned.
+INDEX_MIN = 64
+
+
+class ListStorage:
+    __slots__ = ('front', 'back', 'shared', 'index')
+
+    def __init__(self, front, back, shared=False):
+        self.front = front
+        self.back = back
+        self.shared = shared
+        self.index = None
+
+
+class MemberIndex:
+    # The elements of window [lo, hi) of a storage as a set. A set finds an
+    # element like list.index does, by identity and then ==, and numbers and
+    # strings that compare equal hash equal, so 1 in [1.0] and True in [1]
+    # give the answers of a scan. Unhashable elements (lists, and tuples
+    # holding lists) can only equal unhashable values, and are kept apart in
+    # rest. hashed stays None until the window is probed a second time, so a
+    # list tested once costs one scan and nothing more.
+    __slots__ = ('lo', 'hi', 'hashed', 'rest')
+
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+        self.hashed = None
+        self.rest = None
+
+    def build(self, items):
+        try:
+            hashed, rest = set(items), []
+        except TypeError:
+            hashed, rest = set(), []
+            for item in items:
+                try:
+                    hashed.add(item)
+                except TypeError:
+                    rest.append(item)
+        self.rest = rest
+        self.hashed = hashed
+
+    def __contains__(self, value):
+        try:
+            if value in self.hashed:
+                return True
+        except TypeError:
+            pass
+        return bool(self.rest) and value in self.rest
+
+
+class SbmlList:
+    __slots__ = ('store', 'lo', 'hi')
+
+    def __init__(self, items=()):
+        back = list(items)
+        self.store = ListStorage([], back)
+        self.lo = 0
+        self.hi = len(back)
+
+    @classmethod
+    def view(cls, store, lo, hi):
+        new = cls.__new__(cls)
+        new.store = store
+        new.lo = lo
+        new.hi = hi
+        return new
+
+    @classmethod
+    def from_list(cls, items):
+        # Takes over items, which the caller must not change afterwards.
+        return cls.view(ListStorage([], items), 0, len(items))
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def _spans(self):
+        # (front start, front stop, back start, back stop) of this window.
+        lo, hi = self.lo, self.hi
+        if hi <= 0:
+            return -hi, -lo, 0, 0
+        if lo >= 0:
+            return 0, 0, lo, hi
+        return 0, -lo, 0, hi
+
+    def tolist(self):
+        front_start, front_stop, back_start, back_stop = self._spans()
+        store = self.store
+        items = store.front[front_start:front_stop]
+        items.reverse()
+        if back_stop > back_start:
+            items.extend(store.back[back_start:back_stop])
+        return items
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SbmlList(self.tolist()[index])
+        size = self.hi - self.lo
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("list index out of range")
+        position = self.lo + index
+        if position < 0:
+            return self.store.front[-position - 1]
+        return self.store.back[position]
+
+    def __setitem__(self, index, value):
+        size = self.hi - self.lo
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("list assignment index out of range")
+        if self.store.shared:
+            self.store = ListStorage([], self.tolist())
+            self.lo = 0
+            self.hi = size
+        position = self.lo + index
+        if position < 0:
+            self.store.front[-position - 1] = value
+        else:
+            self.store.back[position] = value
+        self.store.index = None
+
+    def __contains__(self, value):
+        size = self.hi - self.lo
+        if size < INDEX_MIN:
+            return self._scan(value)
+        store = self.store
+        index = store.index
+        if index is None or index.lo != self.lo or index.hi != self.hi:
+            store.index = MemberIndex(self.lo, self.hi)
+            return self._scan(value)
+        if index.hashed is None:
+            index.build(self.tolist())
+        return value in index
+
+    def _scan(self, value):
+        # list.index compares like the in operator: identity, then ==.
+        front_start, front_stop, back_start, back_stop = self._spans()
+        store = self.store
+        if front_stop > front_start:
+            try:
+                store.front.index(value, front_start, front_stop)
+                return True
+            except ValueError:
+                pass
+        if back_stop > back_start:
+            try:
+                store.back.index(value, back_start, back_stop)
+                return True
+            except ValueError:
+                pass
+        return False
+
+    def cons(self, value):
+        # value :: self
+        store = self.store
+        if self.lo == -len(store.front):
+            store.front.append(value)
+            store.shared = True
+            return SbmlList.view(store, self.lo - 1, self.hi)
+        items = self.tolist()
+        items.insert(0, value)
+        return SbmlList.from_list(items)
+
+    def concat(self, other):
+        # self + other. Grows whichever storage can take the shorter side.
+        if type(other) is not SbmlList:
+            return make_list(self.tolist() + other.tolist())
+        left_size = self.hi - self.lo
+        right_size = other.hi - other.lo
+        left, right = self.store, other.store
+        at_right_end = self.hi == len(left.back)
+        at_left_end = other.lo == -len(right.front)
+
+        if at_right_end and (right_size <= left_size or not at_left_end):
+            left.back.extend(other.tolist())
+            left.shared = True
+            return SbmlList.view(left, self.lo, self.hi + right_size)
+        if at_left_end:
+            items = self.tolist()
+            items.reverse()
+            right.front.extend(items)
+            right.shared = True
+            return SbmlList.view(right, other.lo - left_size, other.hi)
+        items = self.tolist()
+        items.extend(other.tolist())
+        return SbmlList.from_list(items)
+
+    def __eq__(self, other):
+        if isinstance(other, SbmlList):
+            return len(self) == len(other) and self.tolist() == other.tolist()
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    __str__ = __repr__
+
+
+def concat_chain(lists):
+    # lists[0] + lists[1] + ... for SBML lists, copying each element once.
+    # Like concat, grows the storage of the first list at its right end or
+    # of the last list at its left end, whichever can take the rest.
+    first, last = lists[0], lists[-1]
+    first_open = type(first) is SbmlList and first.hi == len(first.store.back)
+    last_open = type(last) is SbmlList and last.lo == -len(last.store.front)
+
+    if first_open and (len(last) <= len(first) or not last_open):
+        store = first.store
+        for other in lists[1:]:
+            store.back.extend(other.tolist())
+        store.shared = True
+        return SbmlList.view(store, first.lo, len(store.back))
+    if last_open:
+        store = last.store
+        for other in reversed(lists[:-1]):
+            items = other.tolist()
+            items.reverse()
+            store.front.extend(items)
+        store.shared = True
+        return SbmlList.view(store, -len(store.front), last.hi)
+    items = first.tolist()
+    for other in lists[1:]:
+        items.extend(other.tolist())
+    return make_list(items)
+
+#------------ String Section------------
+
+# Rope is the value of a long string built with +. "a" + "b" + ... is
+# left-associative, so joining N pieces into Python strings copies O(N^2)
+# characters. A rope instead keeps the pieces in a list with the running
+# length after each one, so + appends one piece and indexing finds its piece
+# by binary search. The text is only joined when the whole string is needed
+# (printing, comparison, in), and then kept.
+#
+# A rope is the first count pieces of a storage. Like list storages, pieces
+# are only ever added at the end, so appending to the rope that owns the end
+# of its storage shares it, and every other rope on it still sees its own
+# pieces.
+
+# Shorter results of + stay plain Python strings.
+ROPE_MIN = 256
+
+
+class StringStorage:
+    __slots__ = ('pieces', 'ends')
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.ends = list(accumulate(map(len, pieces)))
+
+
+class Rope:
+    __slots__ = ('store', 'count', 'length', 'flat')
+
+    def __init__(self, pieces):
+        self.store = StringStorage(pieces)
+        self.count = len(pieces)
+        self.length = self.store.ends[-1] if pieces else 0
+        self.flat = None
+
+    def append(self, text):
+        # self + text, for a plain Python string text.
+        store = self.store
+        if self.count != len(store.pieces):
+            return Rope(store.pieces[:self.count] + [text])
+        store.pieces.append(text)
+        store.ends.append(self.length + len(text))
+        new = Rope.__new__(Rope)
+        new.store = store
+        new.count = self.count + 1
+        new.length = self.length + len(text)
+        new.flat = None
+        return new
+
+    def __str__(self):
+        if self.flat is None:
+            self.flat = "".join(self.store.pieces[:self.count])
+        return self.flat
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return str(self)[index]
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("string index out of range")
+        if self.flat is not None:
+            return self.flat[index]
+        ends = self.store.ends
+        piece = bisect_right(ends, index, 0, self.count)
+        start = ends[piece - 1] if piece else 0
+        return self.store.pieces[piece][index - start]
+
+    def __contains__(self, value):
+        if type(value) is Rope:
+            value = str(value)
+        return value in str(self)
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def _compare(self, other, compare):
+        if type(other) is Rope:
+            other = str(other)
+        elif not isinstance(other, str):
+            return NotImplemented
+        return compare(str(self), other)
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+
+# Types of SBML string values.
+STRINGS = (str, Rope)
+
+
+def join_strings(left, right):
+    # left + right for two SBML strings.
+    if type(left) is Rope:
+        return left.append(str(right))
+    right = str(right)
+    if len(left) + len(right) < ROPE_MIN:
+        return left + right
+    return Rope([left, right])
+
+
+def join_string_chain(parts):
+    # parts[0] + parts[1] + ... for SBML strings. A rope gets the rest
+    # appended, as join_strings would do one at a time; anything else is
+    # joined in one go.
+    first = parts[0]
+    if type(first) is Rope:
+        for part in parts[1:]:
+            first = first.append(str(part))
+        return first
+    text = "".join([str(part) for part in parts])
+    if len(text) < ROPE_MIN:
+        return text
+    return Rope([text])
+
+#------------ NumPy Section------------
+
+# Optional backend that keeps long lists of only ints or only floats in a
+# NumPy int64 or float64 array, so concatenation, membership and indexing
+# run in bulk. NumPy is only imported when the backend is turned on.
+numpy = None
+_use_arrays = False
+
+# Shorter lists stay Python lists; below this NumPy's per-call overhead
+# costs more than the bulk work saves.
+ARRAY_MIN = 64
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+# Integers up to this size convert to float64 exactly.
+_FLOAT_EXACT = 2 ** 53
+
+
+def use_numpy(enabled=True):
+    # Turns the NumPy backend on or off. Returns False if NumPy is missing.
+    global numpy, _use_arrays
+    if enabled and numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            enabled = False
+    _use_arrays = enabled
+    return enabled
+
+
+def to_array(items):
+    # A NumPy array holding items exactly, or None if the backend is off,
+    # the list is short, or it holds anything but all ints or all floats.
+    if not _use_arrays or len(items) < ARRAY_MIN:
+        return None
+    kinds = set(map(type, items))
+    if kinds == {int}:
+        if min(items) < _INT64_MIN or max(items) > _INT64_MAX:
+            return None
+        return numpy.array(items, dtype=numpy.int64)
+    if kinds == {float}:
+        array = numpy.array(items, dtype=numpy.float64)
+        # NaN never equals itself, so arrays leave it to Python lists.
+        if numpy.isnan(array).any():
+            return None
+        return array
+    return None
+
+
+def make_list(items):
+    # The SBML list for items, taking items over.
+    array = to_array(items)
+    if array is not None:
+        return ArrayList.view(ArrayStorage(array), 0, len(items))
+    return SbmlList.from_list(items)
+
+
+class ArrayStorage:
+    __slots__ = ('array', 'shared', 'index')
+
+    def __init__(self, array, shared=False):
+        self.array = array
+        self.shared = shared
+        self.index = None
+
+
+class ArrayList(SbmlList):
+    # An SbmlList whose elements live in one array. Elements go in and come
+    # out as Python ints and floats, so printing, comparison and the
+    # int/float distinction are those of the Python list. A write the array
+    # cannot hold turns the list back into a plain SbmlList.
+    __slots__ = ()
+
+    def tolist(self):
+        return self.store.array.tolist()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SbmlList.from_list(self.tolist()[index])
+        # NumPy reads a bool index as a mask; a Python list reads it as 0 or 1.
+        return self.store.array.item(int(index))
+
+    def __setitem__(self, index, value):
+        store = self.store
+        is_int = store.array.dtype.kind == 'i'
+        if is_int:
+            fits = type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+        else:
+            fits = type(value) is float and value == value
+        if not fits:
+            items = self.tolist()
+            self.__class__ = SbmlList
+            self.store = ListStorage([], items)
+            self[index] = value
+            return
+        index = int(index)
+        if index < 0:
+            index += len(store.array)
+        if index < 0 or index >= len(store.array):
+            raise IndexError("list assignment index out of range")
+        if store.shared:
+            store = self.store = ArrayStorage(store.array.copy())
+        store.array[index] = value
+        store.index = None
+
+    def _scan(self, value):
+        # Same answers as Python's in: a number only matches an equal
+        # number, compared exactly.
+        array = self.store.array
+        is_int = array.dtype.kind == 'i'
+        kind = type(value)
+        if kind is bool:
+            value = int(value)
+            kind = int
+        if kind is float and is_int:
+            if not value.is_integer():
+                return False
+            value = int(value)
+            kind = int
+        if kind is int:
+            if is_int and not _INT64_MIN <= value <= _INT64_MAX:
+                return False
+            if not is_int and abs(value) > _FLOAT_EXACT:
+                return value in self.tolist()
+        elif kind is not float:
+            return False
+        return bool((array == value).any())
+
+    def cons(self, value):
+        # The result is a plain list so a run of conses stays cheap.
+        items = self.tolist()
+        items.insert(0, value)
+        return SbmlList.from_list(items)
+
+    def concat(self, other):
+        array = self.store.array
+        if type(other) is ArrayList and other.store.array.dtype == array.dtype:
+            joined = numpy.concatenate((array, other.store.array))
+            return ArrayList.view(ArrayStorage(joined), 0, len(joined))
+        return make_list(self.tolist() + other.tolist())
+
+#------------ Model Check------------
+
+def _random_value(rng):
+    kind = rng.randrange(4)
+    if kind == 0:
+        return rng.randrange(10)
+    if kind == 1:
+        return rng.randrange(10) / 2
+    if kind == 2:
+        return rng.choice((True, False, 2 ** 70, 2.0 ** 70, float('inf'), float('nan')))
+    return rng.choice(("a", (1,), SbmlList([1])))
+
+
+def check(steps=200000, seed=0):
+    # Runs random cons, concatenation, writes, reads and membership tests on
+    # SbmlLists that share storage, next to plain Python lists doing the same.
+    # With the NumPy backend on, fresh lists of only ints or only floats
+    # become ArrayLists.
+    import random
+
+    rng = random.Random(seed)
+    lists = [(SbmlList(), [])]
+    mismatches = 0
+    for _ in range(steps):
+        sbml, model = rng.choice(lists)
+        action = rng.randrange(7)
+        if action == 0:
+            value = rng.randrange(10)
+            lists.append((sbml.cons(value), [value] + model))
+        elif action == 1:
+            other, other_model = rng.choice(lists)
+            if len(model) + len(other_model) < 1000:
+                lists.append((sbml.concat(other), model + other_model))
+            others = [rng.choice(lists) for _ in range(rng.randrange(1, 4))]
+            if len(model) + sum(len(other_model) for _, other_model in others) < 1000:
+                joined_model = list(model)
+                parts = [sbml]
+                for other, other_model in others:
+                    parts.append(other)
+                    joined_model.extend(other_model)
+                lists.append((concat_chain(parts), joined_model))
+        elif action == 2 and model:
+            index = rng.randrange(len(model))
+            value = _random_value(rng) if rng.random() < 0.1 else rng.randrange(10)
+            sbml[index] = value
+            model[index] = value
+        elif action == 3 and model:
+            index = rng.randrange(-len(model), len(model))
+            mismatches += repr(sbml[index]) != repr(model[index])
+        elif action == 4:
+            value = _random_value(rng)
+            mismatches += (value in sbml) != (value in model)
+        elif action == 5:
+            if rng.random() < 0.5:
+                items = [rng.randrange(-5, 5) for _ in range(rng.randrange(100))]
+            else:
+                items = [rng.randrange(-5, 5) / 2 for _ in range(rng.randrange(100))]
+            lists.append((make_list(items.copy()), items))
+        else:
+            mismatches += sbml != model or repr(sbml) != repr(model)
+        if len(lists) > 50:
+            del lists[rng.randrange(len(lists))]
+    for sbml, model in lists:
+        mismatches += repr(sbml.tolist()) != repr(model)
+    print(f"{steps} steps, {mismatches} mismatches")
+    return mismatches == 0
+
+
+def check_strings(steps=100000, seed=0):
+    # Builds strings with join_strings next to plain Python strings and
+    # compares indexing, comparison, in, printing and hashing.
+    import random
+
+    global ROPE_MIN
+    saved = ROPE_MIN
+    ROPE_MIN = 4
+    rng = random.Random(seed)
+    pieces = ["", "a", "b", "ab", "x'y", 'q"r', "hello", "\\n"]
+    values = [("", "")]
+    mismatches = 0
+    try:
+        for _ in range(steps):
+            value, model = rng.choice(values)
+            action = rng.randrange(5)
+            if action == 0:
+                other, other_model = rng.choice(values + [(piece, piece) for piece in pieces])
+                if len(model) + len(other_model) < 2000:
+                    if rng.random() < 0.5:
+                        values.append((join_strings(value, other), model + other_model))
+                    else:
+                        values.append((join_strings(other, value), other_model + model))
+                    others = [rng.choice(values) for _ in range(rng.randrange(1, 4))]
+                    if len(model) + sum(len(other_model) for _, other_model in others) < 2000:
+                        values.append((join_string_chain([value] + [other for other, _ in others]),
+                                       model + "".join(other_model for _, other_model in others)))
+            elif action == 1 and model:
+                index = rng.randrange(-len(model), len(model))
+                mismatches += value[index] != model[index]
+            elif action == 2:
+                other, other_model = rng.choice(values)
+                mismatches += ((value < other) != (model < other_model) or
+                               (value == other) != (model == other_model) or
+                               (other >= value) != (other_model >= model))
+            elif action == 3:
+                piece = rng.choice(pieces)
+                mismatches += (piece in value) != (piece in model)
+            else:
+                mismatches += (repr(value) != repr(model) or str(value) != model or
+                               len(value) != len(model) or hash(value) != hash(model))
+            if len(values) > 50:
+                del values[rng.randrange(len(values))]
+    finally:
+        ROPE_MIN = saved
+    print(f"{steps} string steps, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import sys
+    ok = check_strings()
+    ok = check() and ok
+    # Again with every list indexed, to test MemberIndex against scans.
+    INDEX_MIN = 1
+    print("with membership indexes")
+    ok = check() and ok
+    INDEX_MIN = 64
+    if use_numpy():
+        ARRAY_MIN = 4
+        print("with the NumPy backend")
+        ok = check() and ok
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,277 @@
+#Eric Nunez
+#Student ID: 114806268
+
+# Incremental re-runs for edited files: python sbml_main.py -E file --watch
+#
+# IncrementalRunner keeps the tree and output of every line of the last run.
+# On an update it finds the lines that changed (everything between the
+# longest common prefix and suffix of the old and new file), parses and runs
+# only those, and reuses the rest. Lines are also cached by their text, so a
+# line moved or pasted elsewhere is not parsed again.
+#
+# Expression lines do not share state, so a line's output depends only on
+# its text. Block lines that use variables do: a block line sees what
+# earlier block lines assigned. Those lines are split into groups that
+# share no variable names, and a group is rerun from the start whenever one
+# of its lines changes. Values only move between variables through a line
+# that names them both, so no other group can see the change.
+
+import os
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+from time import perf_counter, sleep
+from typing import Any, Optional
+
+from sbml_ast import ProgramNode
+
+# Seconds between checks of the watched file.
+WATCH_INTERVAL = 0.2
+# Lines compared at a time when looking for the changed range.
+COMPARE_BLOCK = 1024
+
+
+@dataclass(slots=True)
+class LineEntry:
+    text: str
+    tree: Any
+    error: Optional[str]
+    # Output of a line that does not depend on other lines, else None.
+    output: Optional[str]
+    stateful: bool
+
+
+def common_prefix(a, b):
+    # Number of leading items a and b share. Compares whole blocks first,
+    # which runs in C, then single items inside the first differing block.
+    size = min(len(a), len(b))
+    i = 0
+    while i < size and a[i:i + COMPARE_BLOCK] == b[i:i + COMPARE_BLOCK]:
+        i += COMPARE_BLOCK
+    i = min(i, size)
+    while i < size and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def common_suffix(a, b, limit):
+    # Number of trailing items a and b share, at most limit.
+    size = min(len(a), len(b), limit)
+    end_a, end_b = len(a), len(b)
+    i = 0
+    while i < size:
+        step = min(COMPARE_BLOCK, size - i)
+        if a[end_a - i - step:end_a - i] != b[end_b - i - step:end_b - i]:
+            break
+        i += step
+    while i < size and a[end_a - i - 1] == b[end_b - i - 1]:
+        i += 1
+    return i
+
+
+class IncrementalRunner:
+
+    def __init__(self, mode="-E"):
+        from sbml_main import Interpreter
+
+        self.mode = mode
+        self.session = Interpreter()
+        self.lines = []
+        self.entries = []
+        self.outputs = []
+        # Sorted positions of the lines with stateful entries.
+        self.stateful = []
+        self.by_text = {}
+        # Line texts of each group of block lines -> their outputs.
+        self.groups = {}
+        # (text, output) of the last run in whole-file program mode.
+        self.program = None
+        self.parsed = 0
+
+    def _entry(self, line):
+        text = line.strip()
+        if not text:
+            return None
+        entry = self.by_text.get(text)
+        if entry is not None:
+            return entry
+        from sbml_main import error_output, run_tree
+
+        tree, error = self.session.parse(text)
+        self.parsed += 1
+        stateful = self.mode == "-E" and type(tree) is ProgramNode and bool(tree.names)
+        if error is not None:
+            output = error_output(error, self.mode)
+        elif stateful:
+            output = None
+        else:
+            output = run_tree(tree, self.mode)
+        entry = self.by_text[text] = LineEntry(text, tree, error, output, stateful)
+        return entry
+
+    def update(self, lines):
+        # Takes the new file as a list of lines and returns its full output,
+        # the same text sbml_main.py would print for it.
+        from sbml_main import split_program
+
+        self.parsed = 0
+        program, _ = split_program(lines)
+        if program is not None:
+            return self._update_program(program)
+        self.program = None
+
+        old = self.lines
+        start = common_prefix(old, lines)
+        tail = common_suffix(old, lines, min(len(old), len(lines)) - start)
+        old_end = len(old) - tail
+        new_end = len(lines) - tail
+
+        added = [self._entry(line) for line in lines[start:new_end]]
+        positions = self.stateful
+        lo = bisect_left(positions, start)
+        hi = bisect_left(positions, old_end)
+        shift = new_end - old_end
+        moved = [start + k for k, entry in enumerate(added) if entry is not None and entry.stateful]
+        stateful = hi > lo or bool(moved)
+        if shift:
+            moved.extend(position + shift for position in positions[hi:])
+        else:
+            moved.extend(positions[hi:])
+        positions[lo:] = moved
+        self.entries[start:old_end] = added
+        self.outputs[start:old_end] = [
+            "" if entry is None else entry.output or "" for entry in added
+        ]
+        self.lines = lines
+        if stateful:
+            self._rerun_groups()
+        return "".join(self.outputs)
+
+    def _update_program(self, program):
+        if self.program is None or self.program[0] != program:
+            from sbml_main import Interpreter
+
+            self.parsed = 1
+            self.program = (program, Interpreter().execute(program, self.mode))
+        self.lines, self.entries, self.outputs, self.groups = [], [], [], {}
+        self.stateful = []
+        return self.program[1]
+
+    def _rerun_groups(self):
+        # Groups the block lines that use variables by shared names and
+        # reruns every group whose lines are not exactly those of a group
+        # from the last run.
+        from sbml_main import run_tree
+
+        entries = self.entries
+        positions = self.stateful
+        parent = list(range(len(positions)))
+
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        first = {}
+        for k, i in enumerate(positions):
+            for name in entries[i].tree.names:
+                j = first.setdefault(name, k)
+                if j != k:
+                    parent[find(k)] = find(j)
+
+        members = {}
+        for k, i in enumerate(positions):
+            members.setdefault(find(k), []).append(i)
+
+        groups = {}
+        for group in members.values():
+            key = tuple(entries[i].text for i in group)
+            outputs = self.groups.get(key)
+            if outputs is None:
+                variables = {}
+                outputs = [run_tree(entries[i].tree, "-E", variables=variables) for i in group]
+            groups[key] = outputs
+            for i, text in zip(group, outputs):
+                self.outputs[i] = text
+        self.groups = groups
+
+
+def read_lines(path):
+    # The lines as sbml_main reads them, newlines kept: a block program is
+    # joined back from them as it was written.
+    with open(path) as file:
+        return file.readlines()
+
+
+def watch(path, mode="-E", out=sys.stdout, interval=WATCH_INTERVAL):
+    # Prints the file's output, then prints it again after every change.
+    # How long each run took goes to stderr. Stops on Ctrl-C.
+    runner = IncrementalRunner(mode)
+    seen = None
+    try:
+        while True:
+            try:
+                stat = os.stat(path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stamp = None
+            if stamp is not None and stamp != seen:
+                seen = stamp
+                start = perf_counter()
+                output = runner.update(read_lines(path))
+                out.write(output)
+                out.flush()
+                print(f"sbml_watch: {runner.parsed} lines parsed, "
+                      f"{(perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+            sleep(interval)
+    except KeyboardInterrupt:
+        return
+
+#------------ Check------------
+
+def check(seed=0, edits=300):
+    # Runs files through an IncrementalRunner and through sbml_main's own
+    # path, block programs spread over lines included, and compares the
+    # output. Then edits a line file at random and compares after each edit.
+    import random
+    import tempfile
+    from sbml_main import Interpreter, evaluate_stream, split_program
+
+    def expected(lines, mode):
+        program, rest = split_program(lines)
+        if program is not None:
+            return Interpreter().execute(program, mode)
+        return "".join(evaluate_stream(rest, mode))
+
+    files = [
+        "{\nprint(1\n2);\n}\n",
+        "{\n  x = [1,\n 2];\n  print(x[1]);\n}\n",
+        "{ x = 1;\nwhile (x < 4) {\nprint(x);\nx = x + 1;\n}\n}",
+        "1 + 2\n\n[1,\n2]\n{ y = 3; print(y); }\n'a' + \"b\"\n",
+    ]
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "check.txt")
+        for text in files:
+            with open(path, 'w') as file:
+                file.write(text)
+            with open(path) as file:
+                expected_lines = list(file)
+            for mode in ("-E", "-P"):
+                found = IncrementalRunner(mode).update(read_lines(path))
+                mismatches += found != expected(expected_lines, mode)
+
+    rng = random.Random(seed)
+    choices = ["1 + 2", "x", "{ x = 1; print(x); }", "{ print(x); }", "(1, 2)", "[1 +", "'s'", ""]
+    lines = [rng.choice(choices) + "\n" for _ in range(40)]
+    runner = IncrementalRunner()
+    for _ in range(edits):
+        lines[rng.randrange(len(lines))] = rng.choice(choices) + "\n"
+        mismatches += runner.update(list(lines)) != expected(lines, "-E")
+    print(f"{len(files)} files, {edits} edits, {mismatches} mismatches")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)